@@ -0,0 +1,578 @@
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from lukhed_basic_utils import requestsCommon as rC
+from lukhed_basic_utils import fileCommon as fC
+from lukhed_basic_utils import osCommon as osC
+import threading
+import hashlib
+import tempfile
+import os
+import random
+import time
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+"""
+Shared helpers for the API wrappers in this package (http sessions, caching, rate limiting, transports, etc.).
+"""
+
+
+def create_pooled_session(pool_connections=10, pool_maxsize=10, add_user_agent=False):
+    """
+    Creates a requests.Session with a keep-alive connection pool mounted for http and https. Re-using the same
+    session across calls avoids a new connection (and TLS handshake) for every request to the same host.
+
+    Parameters
+    ----------
+    pool_connections : int, optional
+        Number of per-host connection pools to keep, by default 10
+    pool_maxsize : int, optional
+        Max number of connections kept alive per host, by default 10. Raise this when making concurrent calls
+        to the same host.
+    add_user_agent : bool, optional
+        Whether to set a random User-Agent header on the session, by default False
+
+    Returns
+    -------
+    requests.Session
+        Session with the pooled adapter mounted.
+    """
+    session = rC.create_new_session(add_user_agent=add_user_agent)
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session_connection_stats(session):
+    """
+    Summarizes connection re-use for a session created with create_pooled_session(). Counts come from the
+    underlying urllib3 pools, so hosts whose pool was evicted (more hosts than pool_connections) are not included.
+
+    Parameters
+    ----------
+    session : requests.Session
+
+    Returns
+    -------
+    dict
+        {'requests': int, 'newConnections': int, 'reusedConnections': int, 'hosts': {host: {...}}}
+    """
+    stats = {
+        "requests": 0,
+        "newConnections": 0,
+        "reusedConnections": 0,
+        "hosts": {}
+    }
+
+    seen_adapters = []
+    for adapter in session.adapters.values():
+        if adapter in seen_adapters or not hasattr(adapter, 'poolmanager'):
+            continue
+        seen_adapters.append(adapter)
+
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            new_connections = pool.num_connections
+            requests_made = pool.num_requests
+            reused = max(requests_made - new_connections, 0)
+            stats['hosts'][pool.host] = {
+                "requests": requests_made,
+                "newConnections": new_connections,
+                "reusedConnections": reused
+            }
+            stats['requests'] = stats['requests'] + requests_made
+            stats['newConnections'] = stats['newConnections'] + new_connections
+            stats['reusedConnections'] = stats['reusedConnections'] + reused
+
+    return stats
+
+
+class TtlLruCache:
+    def __init__(self, max_entries=None, max_bytes=None, default_ttl=None):
+        """
+        In memory cache with per key time to live and least recently used eviction. Entries are evicted when the 
+        cache goes over max_entries or max_bytes. Safe to use from multiple threads.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            Max number of entries to keep, by default None (no entry limit)
+        max_bytes : int, optional
+            Max total size of the entries in bytes, by default None (no size limit). When a size is not given in 
+            set(), it is estimated from the json encoded length of the value.
+        default_ttl : float, optional
+            Seconds an entry is valid for when set() is not given a ttl, by default None (never expires)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+
+        self._entries = OrderedDict()       # key -> (value, expires_at, size)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _estimate_size(value):
+        try:
+            return len(json.dumps(value))
+        except (TypeError, ValueError):
+            return 0
+
+    def _remove(self, key):
+        value, expires_at, size = self._entries.pop(key)
+        self._total_bytes = self._total_bytes - size
+
+    def _evict_over_limits(self):
+        while len(self._entries) > 0:
+            over_entries = self.max_entries is not None and len(self._entries) > self.max_entries
+            over_bytes = self.max_bytes is not None and self._total_bytes > self.max_bytes
+            if not over_entries and not over_bytes:
+                break
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions = self.evictions + 1
+
+    def get(self, key, default=None):
+        """
+        Returns the value for key, or default if the key is not cached or has expired.
+        """
+        with self._lock:
+            try:
+                value, expires_at, size = self._entries[key]
+            except KeyError:
+                self.misses = self.misses + 1
+                return default
+
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._remove(key)
+                self.expirations = self.expirations + 1
+                self.misses = self.misses + 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits = self.hits + 1
+            return value
+
+    def set(self, key, value, ttl=None, size=None):
+        """
+        Adds or replaces a cache entry.
+
+        Parameters
+        ----------
+        key : hashable
+        value : any
+        ttl : float, optional
+            Seconds the entry is valid for, by default None and default_ttl is used
+        size : int, optional
+            Size of the value in bytes, by default None and the size is estimated when max_bytes is set
+        """
+        if ttl is None:
+            ttl = self.default_ttl
+        if size is None:
+            size = self._estimate_size(value) if self.max_bytes is not None else 0
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self._total_bytes = self._total_bytes + size
+            self._evict_over_limits()
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return False
+            expires_at = self._entries[key][1]
+            return expires_at is None or time.monotonic() < expires_at
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self):
+        """
+        Returns
+        -------
+        dict
+            Hit, miss, eviction, and expiration counts plus the current number of entries and bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes
+            }
+
+
+class TokenBucketRateLimiter:
+    def __init__(self, rate, burst=1):
+        """
+        Thread safe token bucket. Tokens refill at `rate` per second up to `burst`, and each call to acquire() 
+        takes one token, waiting only when the bucket is empty. Share one instance between wrapper objects (or 
+        use get_shared_rate_limiter()) so they all respect one request budget.
+
+        Parameters
+        ----------
+        rate : float
+            Tokens (requests) added per second
+        burst : int, optional
+            Max tokens the bucket holds, i.e. how many requests can be made back to back after an idle period, 
+            by default 1
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = float(rate)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens):
+        """
+        Takes tokens from the bucket (allowing it to go negative) and returns the seconds to wait before the 
+        reservation is valid. Reserving up front keeps waiting callers in order.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens = self._tokens - tokens
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens=1):
+        """
+        Blocks until the requested tokens are available.
+
+        Returns
+        -------
+        float
+            Seconds waited
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_shared_rate_limiters = {}
+_shared_rate_limiters_lock = threading.Lock()
+
+
+def get_shared_rate_limiter(name, rate, burst=1):
+    """
+    Returns the process wide TokenBucketRateLimiter for name, creating it with rate and burst on first use. 
+    Later calls with the same name return the same limiter (rate and burst of later calls are ignored).
+
+    Parameters
+    ----------
+    name : str
+        Name of the budget, e.g. 'draftkings'
+    rate : float
+        Requests per second
+    burst : int, optional
+        Max back to back requests, by default 1
+
+    Returns
+    -------
+    TokenBucketRateLimiter
+    """
+    with _shared_rate_limiters_lock:
+        if name not in _shared_rate_limiters:
+            _shared_rate_limiters[name] = TokenBucketRateLimiter(rate, burst=burst)
+        return _shared_rate_limiters[name]
+
+
+def calculate_backoff_delay(attempt, base_delay, max_delay=30):
+    """
+    Exponential backoff with jitter. The delay doubles each attempt (capped at max_delay) and a random value 
+    between half and all of it is returned, so clients that failed together do not retry together.
+
+    Parameters
+    ----------
+    attempt : int
+        0 for the first retry, 1 for the second, etc.
+    base_delay : float
+        Delay for the first retry in seconds
+    max_delay : float, optional
+        Cap on the delay in seconds, by default 30
+
+    Returns
+    -------
+    float
+        Seconds to wait before the retry
+    """
+    delay = min(max_delay, base_delay * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def dump_json_atomic(file_path, data):
+    """
+    Writes data to a json file with an atomic rename. The data is written to a temp file in the same directory 
+    then moved over file_path, so other processes reading the file see the old or the new content, never a 
+    partial write. The directory is created if it does not exist.
+
+    Parameters
+    ----------
+    file_path : str
+    data : dict or list
+        Json serializable data
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temp_file = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.json')
+    try:
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_file, file_path)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def load_json_if_exists(file_path):
+    """
+    Loads a json file, returns None if the file does not exist or can not be parsed.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _get_default_json_backend():
+    if orjson is not None:
+        return 'orjson'
+    elif msgspec is not None:
+        return 'msgspec'
+    return 'json'
+
+
+_json_backend = _get_default_json_backend()
+
+
+def get_json_backend():
+    """
+    Returns the json decoder used by loads_json(): 'orjson', 'msgspec', or 'json'.
+    """
+    return _json_backend
+
+
+def set_json_backend(name=None):
+    """
+    Sets the json decoder used by every wrapper. By default the fastest installed backend is used (orjson, then 
+    msgspec, then the standard library), so this is only needed to force a backend.
+
+    Parameters
+    ----------
+    name : str, optional
+        'orjson', 'msgspec', 'json', or None for the fastest installed backend, by default None
+    """
+    global _json_backend
+    if name is None:
+        name = _get_default_json_backend()
+    if name not in ['orjson', 'msgspec', 'json']:
+        raise ValueError(f"Invalid json backend '{name}'. Use 'orjson', 'msgspec', or 'json'.")
+    if (name == 'orjson' and orjson is None) or (name == 'msgspec' and msgspec is None):
+        raise ValueError(f"json backend '{name}' is not installed")
+    _json_backend = name
+
+
+def loads_json(data):
+    """
+    Decodes json with the configured backend. orjson and msgspec are several times faster than the standard 
+    library on large payloads and are used when installed (pip install orjson).
+
+    Parameters
+    ----------
+    data : str or bytes
+        Json text. Pass response.content (bytes) when available, which skips decoding the body to a str.
+
+    Returns
+    -------
+    dict or list
+
+    Raises
+    ------
+    ValueError
+        If data is not valid json (same as json.loads)
+    """
+    if _json_backend == 'orjson':
+        return orjson.loads(data)
+    elif _json_backend == 'msgspec':
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e))
+    return json.loads(data)
+
+
+class TransportResponse:
+    def __init__(self, status_code, headers, text):
+        """
+        Minimal response object returned by the replay transport (the parts of requests.Response the wrappers use).
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    @property
+    def content(self):
+        return self.text.encode('utf-8')
+
+    def json(self):
+        return loads_json(self.text)
+
+
+class LiveTransport:
+    offline = False
+
+    def __init__(self, session, timeout=5):
+        """
+        Default transport, makes real requests with the provided session.
+
+        Parameters
+        ----------
+        session : requests.Session
+        timeout : float, optional
+            Request timeout in seconds, by default 5
+        """
+        self.session = session
+        self.timeout = timeout
+
+    def get(self, url, headers=None):
+        return self.session.get(url, headers=headers, timeout=self.timeout)
+
+
+def _get_fixture_file(fixture_dir, url):
+    return osC.append_to_dir(fixture_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+
+class RecordTransport:
+    offline = False
+
+    def __init__(self, inner_transport, fixture_dir):
+        """
+        Wraps another transport and writes every response to fixture_dir (one json file per url) so it can be 
+        served back later by ReplayTransport.
+
+        Parameters
+        ----------
+        inner_transport : LiveTransport
+            Transport that makes the real request
+        fixture_dir : str
+            Directory to write fixtures to, created if it does not exist
+        """
+        self.inner_transport = inner_transport
+        self.fixture_dir = fixture_dir
+        os.makedirs(self.fixture_dir, exist_ok=True)
+
+    def get(self, url, headers=None):
+        response = self.inner_transport.get(url, headers=headers)
+        if response.status_code != 304:
+            fixture = {
+                "url": url,
+                "statusCode": response.status_code,
+                "headers": {k: v for k, v in response.headers.items() if k in ['ETag', 'Last-Modified', 
+                                                                               'Content-Type']},
+                "text": response.text
+            }
+            fC.dump_json_to_file(_get_fixture_file(self.fixture_dir, url), fixture)
+        return response
+
+
+class ReplayTransport:
+    offline = True
+
+    def __init__(self, fixture_dir):
+        """
+        Serves responses written by RecordTransport with no network access. Urls without a fixture return a 404 
+        response with an empty body.
+
+        Parameters
+        ----------
+        fixture_dir : str
+            Directory with recorded fixtures
+        """
+        self.fixture_dir = fixture_dir
+        self.missing_urls = []
+
+    def get(self, url, headers=None):
+        fixture_file = _get_fixture_file(self.fixture_dir, url)
+        if not osC.check_if_file_exists(fixture_file):
+            self.missing_urls.append(url)
+            return TransportResponse(404, {}, '')
+
+        fixture = fC.load_json_from_file(fixture_file)
+        return TransportResponse(fixture['statusCode'], fixture['headers'], fixture['text'])
+
+
+def create_transport(mode, session, timeout=5, fixture_dir=None):
+    """
+    Creates a transport for the wrappers.
+
+    Parameters
+    ----------
+    mode : str
+        'live' (default network behavior), 'record' (network + write fixtures), or 'replay' (fixtures only, no 
+        network)
+    session : requests.Session
+        Session used for live and record modes
+    timeout : float, optional
+        Request timeout in seconds, by default 5
+    fixture_dir : str, optional
+        Fixture directory, required for record and replay modes
+
+    Returns
+    -------
+    LiveTransport, RecordTransport, or ReplayTransport
+    """
+    mode = mode.lower()
+    if mode == 'live':
+        return LiveTransport(session, timeout=timeout)
+    
+    if fixture_dir is None:
+        raise ValueError(f"fixture_dir is required for transport mode '{mode}'")
+    if mode == 'record':
+        return RecordTransport(LiveTransport(session, timeout=timeout), fixture_dir)
+    elif mode == 'replay':
+        return ReplayTransport(fixture_dir)
+    else:
+        raise ValueError(f"'{mode}' is not a valid transport mode. Use 'live', 'record', or 'replay'.")
@@ -0,0 +1,771 @@
+from lukhed_basic_utils import osCommon as osC
+from lukhed_sports.gameAnalysis import calculate_no_vig_probabilities
+import numpy as np
+import threading
+import asyncio
+import inspect
+import time
+import os
+
+"""
+Tools for tracking and analyzing DraftKings lines (line movement over time, vig removal). Works with the selections 
+and category responses returned by DkSportsbook.
+"""
+
+
+def get_selection_american_odds(selection):
+    """
+    Parses the american odds of a dk selection into an int. DK uses a unicode minus sign in displayOdds.
+
+    Parameters
+    ----------
+    selection : dict()
+        A dk selection
+
+    Returns
+    -------
+    int() or None
+        American odds, None if not available
+    """
+    try:
+        american = selection['displayOdds']['american']
+    except (KeyError, TypeError):
+        return None
+    try:
+        return int(str(american).replace('−', '-').replace('+', ''))
+    except ValueError:
+        return None
+
+
+def get_selection_decimal_odds(selection):
+    """
+    Returns the decimal odds of a dk selection (trueOdds, falling back to displayOdds decimal), None if not
+    available.
+    """
+    odds = selection.get('trueOdds')
+    if odds is None:
+        try:
+            odds = selection['displayOdds']['decimal']
+        except (KeyError, TypeError):
+            return None
+    try:
+        return float(odds)
+    except (ValueError, TypeError):
+        return None
+
+
+def get_no_vig_lines(selections, method='multiplicative'):
+    """
+    Calculates hold, no-vig probabilities, and fair odds for dk selections. Selections are grouped into markets by 
+    'marketId' and calculated in one batch with gameAnalysis.calculate_no_vig_probabilities().
+
+    Parameters
+    ----------
+    selections : list()
+        dk selections (each needs 'id' and 'marketId'), for example the output of 
+        DkSportsbook.get_betting_selections_by_category() or get_gamelines_for_league()
+    method : str(), optional
+        'multiplicative' or 'power', by default 'multiplicative'
+
+    Returns
+    -------
+    list()
+        One dict per selection with keys selectionId, marketId, label, points, odds (decimal), impliedProbability, 
+        overround, hold, noVigProbability, fairDecimalOdds, and fairAmericanOdds. Values that can not be 
+        calculated (missing odds, one selection markets) are None.
+    """
+    selections = [x for x in selections if 'id' in x and 'marketId' in x]
+    if len(selections) == 0:
+        return []
+    
+    decimal_odds = [get_selection_decimal_odds(x) for x in selections]
+    decimal_odds = np.array([np.nan if x is None else x for x in decimal_odds], dtype=np.float64)
+    market_ids = [str(x['marketId']) for x in selections]
+    results = calculate_no_vig_probabilities(decimal_odds, market_ids, method=method)
+
+    columns = ['impliedProbability', 'overround', 'hold', 'noVigProbability', 'fairDecimalOdds']
+    values = {column: results[column].tolist() for column in columns}
+    fair_american = np.round(results['fairAmericanOdds']).tolist()
+    odds = decimal_odds.tolist()
+
+    lines = []
+    for i, selection in enumerate(selections):
+        line = {
+            "selectionId": selection['id'],
+            "marketId": selection['marketId'],
+            "label": selection.get('label'),
+            "points": selection.get('points'),
+            "odds": None if np.isnan(odds[i]) else odds[i]
+        }
+        for column in columns:
+            line[column] = None if np.isnan(values[column][i]) else values[column][i]
+        line['fairAmericanOdds'] = None if np.isnan(fair_american[i]) else int(fair_american[i])
+        lines.append(line)
+
+    return lines
+
+
+def _flatten_book_selections(selections):
+    # gameline outputs are lists of {'event', 'selections'}, everything else is a list of selections
+    flattened = []
+    for item in selections:
+        if 'selections' in item and 'id' not in item:
+            flattened.extend(item['selections'])
+        else:
+            flattened.append(item)
+    return flattened
+
+
+def get_price_differences_across_books(selections_by_book):
+    """
+    Compares the same selections across state sportsbooks in one pass. Selections are matched by selection id.
+
+    Parameters
+    ----------
+    selections_by_book : dict()
+        {sportsbook: selections}, for example the output of DkSportsbook.get_betting_selections_by_category_for_books() 
+        or DkSportsbook.get_gamelines_for_league_by_book()
+
+    Returns
+    -------
+    list()
+        One dict per selection offered by two or more books with keys selectionId, marketId, label, odds 
+        ({book: decimal odds}), points ({book: points}), pointsDiffer (the books do not have the same line), 
+        bestBook, bestOdds, worstOdds, and difference (bestOdds - worstOdds). Sorted by difference, largest first.
+    """
+    by_selection = {}
+    for book, selections in selections_by_book.items():
+        for selection in _flatten_book_selections(selections):
+            odds = get_selection_decimal_odds(selection)
+            if odds is None or 'id' not in selection:
+                continue
+            compared = by_selection.setdefault(selection['id'], {
+                "selectionId": selection['id'],
+                "marketId": selection.get('marketId'),
+                "label": selection.get('label'),
+                "odds": {},
+                "points": {}
+            })
+            compared['odds'][book] = odds
+            compared['points'][book] = selection.get('points')
+
+    differences = []
+    for compared in by_selection.values():
+        if len(compared['odds']) < 2:
+            continue
+        best_book = max(compared['odds'], key=compared['odds'].get)
+        compared['pointsDiffer'] = len(set(compared['points'].values())) > 1
+        compared['bestBook'] = best_book
+        compared['bestOdds'] = compared['odds'][best_book]
+        compared['worstOdds'] = min(compared['odds'].values())
+        compared['difference'] = compared['bestOdds'] - compared['worstOdds']
+        differences.append(compared)
+
+    differences.sort(key=lambda x: x['difference'], reverse=True)
+    return differences
+
+
+class DkSelectionDiffer:
+    def __init__(self):
+        """
+        Keeps the previous snapshot of a selection feed (keyed by selection id) and reports only what changed 
+        between snapshots. The first snapshot reports every selection as added.
+        """
+        self._previous = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_line(selection):
+        return get_selection_decimal_odds(selection), get_selection_american_odds(selection), selection.get('points')
+
+    def diff(self, selections):
+        """
+        Compares selections to the previous snapshot then stores them as the new snapshot.
+
+        Parameters
+        ----------
+        selections : list()
+            dk selections (each needs an 'id')
+
+        Returns
+        -------
+        dict()
+            {'added': [selections], 'removed': [selections from the previous snapshot], 
+             'changed': [{'id', 'selection', 'oldOdds', 'newOdds', 'oldPoints', 'newPoints'}]}. Odds are the 
+             displayOdds dicts.
+        """
+        current = {}
+        for selection in selections:
+            try:
+                current[selection['id']] = selection
+            except KeyError:
+                pass
+
+        added = []
+        changed = []
+        with self._lock:
+            previous = self._previous
+            for selection_id, selection in current.items():
+                old_selection = previous.get(selection_id)
+                if old_selection is None:
+                    added.append(selection)
+                    continue
+
+                old_line = self._get_line(old_selection)
+                new_line = self._get_line(selection)
+                if old_line != new_line:
+                    changed.append({
+                        "id": selection_id,
+                        "selection": selection,
+                        "oldOdds": old_selection.get('displayOdds'),
+                        "newOdds": selection.get('displayOdds'),
+                        "oldPoints": old_line[2],
+                        "newPoints": new_line[2]
+                    })
+
+            removed = [x for selection_id, x in previous.items() if selection_id not in current]
+            self._previous = current
+
+        return {
+            "added": added,
+            "removed": removed,
+            "changed": changed
+        }
+
+    def reset(self):
+        with self._lock:
+            self._previous = {}
+
+    def get_snapshot_size(self):
+        return len(self._previous)
+
+
+class DkLineHistoryRecorder:
+    _columns = {
+        "event": np.int32,
+        "market": np.int32,
+        "selection": np.int32,
+        "timestamp": np.float64,
+        "odds": np.float64,
+        "american": np.int32,
+        "points": np.float32
+    }
+
+    def __init__(self, directory):
+        """
+        Records dk selection snapshots to a compact append-only columnar store. Each column is its own binary file
+        in the directory and ids (event, market, selection) are stored as int codes in a string table. Rows are only
+        written when a selection's odds or points changed since the last snapshot.
+
+        Reads memory map the column files, so querying one event's history does not load the whole store into RAM.
+        Use one directory per day (or per slate) to keep stores small.
+
+        Parameters
+        ----------
+        directory : str()
+            Directory for the store. It is created if it does not exist, and an existing store is appended to.
+        """
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+        self._ids_file = osC.append_to_dir(self.directory, 'ids.txt')
+        self._lock = threading.Lock()
+
+        self._id_codes = {}
+        self._ids = []
+        self._market_events = {}
+        self._last_state = {}       # selection code -> (odds, points)
+        self._row_count = 0
+        self._load_existing_store()
+
+        self._ids_handle = open(self._ids_file, 'a', encoding='utf-8')
+        self._column_handles = {}
+        for column in self._columns:
+            self._column_handles[column] = open(self._get_column_file(column), 'ab')
+
+    def _get_column_file(self, column):
+        return osC.append_to_dir(self.directory, f'{column}.bin')
+
+    def _load_existing_store(self):
+        if osC.check_if_file_exists(self._ids_file):
+            with open(self._ids_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._add_id(line.rstrip('\n'))
+
+        # A crash mid write can leave columns with different lengths, keep only complete rows
+        row_counts = []
+        for column, dtype in self._columns.items():
+            column_file = self._get_column_file(column)
+            size = os.path.getsize(column_file) if osC.check_if_file_exists(column_file) else 0
+            row_counts.append(size // np.dtype(dtype).itemsize)
+        self._row_count = min(row_counts)
+        for column, dtype in self._columns.items():
+            column_file = self._get_column_file(column)
+            if osC.check_if_file_exists(column_file):
+                with open(column_file, 'r+b') as f:
+                    f.truncate(self._row_count * np.dtype(dtype).itemsize)
+
+        if self._row_count > 0:
+            selections = self._read_column('selection')
+            odds = self._read_column('odds')
+            points = self._read_column('points')
+            events = self._read_column('event')
+            markets = self._read_column('market')
+
+            # last row for each selection code
+            reversed_codes = selections[::-1]
+            unique_codes, reversed_index = np.unique(reversed_codes, return_index=True)
+            last_rows = self._row_count - 1 - reversed_index
+            for code, row in zip(unique_codes.tolist(), last_rows.tolist()):
+                self._last_state[code] = (float(odds[row]), float(points[row]))
+                self._market_events[self._ids[markets[row]]] = self._ids[events[row]]
+
+    def _add_id(self, id_string):
+        self._id_codes[id_string] = len(self._ids)
+        self._ids.append(id_string)
+
+    def _get_id_code(self, id_string):
+        id_string = str(id_string)
+        try:
+            return self._id_codes[id_string]
+        except KeyError:
+            self._add_id(id_string)
+            self._ids_handle.write(id_string + '\n')
+            return self._id_codes[id_string]
+
+    def _read_column(self, column, row_count=None):
+        if row_count is None:
+            row_count = self._row_count
+        dtype = self._columns[column]
+        if row_count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._get_column_file(column), dtype=dtype, mode='r', shape=(row_count,))
+
+    def register_markets(self, markets):
+        """
+        Registers the event for each market so selections without an 'eventId' can be recorded.
+
+        Parameters
+        ----------
+        markets : list()
+            dk markets (each has 'id' and 'eventId')
+        """
+        for market in markets:
+            try:
+                self._market_events[market['id']] = market['eventId']
+            except KeyError:
+                pass
+
+    def record_selections(self, selections, timestamp=None):
+        """
+        Records a snapshot of selections. Selections need an 'eventId' key or a market registered with
+        register_markets() (record_category_data() does this for you). Selections that can not be tied to an
+        event are skipped.
+
+        Parameters
+        ----------
+        selections : list()
+            dk selections
+        timestamp : float, optional
+            Epoch seconds for the snapshot, by default None and the current time is used
+
+        Returns
+        -------
+        int()
+            Number of rows written (selections whose odds or points changed)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        rows = {column: [] for column in self._columns}
+        with self._lock:
+            for selection in selections:
+                try:
+                    market_id = selection['marketId']
+                    selection_id = selection['id']
+                except KeyError:
+                    continue
+                event_id = selection.get('eventId', self._market_events.get(market_id))
+                if event_id is None:
+                    continue
+
+                odds = get_selection_decimal_odds(selection)
+                odds = np.nan if odds is None else odds
+                points = selection.get('points')
+                points = np.nan if points is None else float(np.float32(points))
+                selection_code = self._get_id_code(selection_id)
+
+                last_state = self._last_state.get(selection_code)
+                if last_state is not None and self._same_value(last_state[0], odds) and \
+                        self._same_value(last_state[1], points):
+                    continue
+                self._last_state[selection_code] = (odds, points)
+
+                american = get_selection_american_odds(selection)
+                rows['event'].append(self._get_id_code(event_id))
+                rows['market'].append(self._get_id_code(market_id))
+                rows['selection'].append(selection_code)
+                rows['timestamp'].append(timestamp)
+                rows['odds'].append(odds)
+                rows['american'].append(0 if american is None else american)
+                rows['points'].append(points)
+
+            row_count = len(rows['selection'])
+            if row_count > 0:
+                self._ids_handle.flush()
+                for column, dtype in self._columns.items():
+                    self._column_handles[column].write(np.asarray(rows[column], dtype=dtype).tobytes())
+                    self._column_handles[column].flush()
+                self._row_count = self._row_count + row_count
+
+        return row_count
+
+    def record_category_data(self, data, timestamp=None):
+        """
+        Records a snapshot of a dk category response (dict with 'markets' and 'selections').
+
+        Returns
+        -------
+        int()
+            Number of rows written
+        """
+        self.register_markets(data.get('markets', []))
+        return self.record_selections(data.get('selections', []), timestamp=timestamp)
+
+    @staticmethod
+    def _same_value(a, b):
+        return a == b or (np.isnan(a) and np.isnan(b))
+
+    def _get_rows(self, column, id_string):
+        with self._lock:
+            row_count = self._row_count
+            code = self._id_codes.get(str(id_string))
+        if code is None or row_count == 0:
+            return np.empty(0, dtype=np.int64), row_count
+
+        return np.flatnonzero(self._read_column(column, row_count) == code), row_count
+
+    def _build_history(self, rows, row_count):
+        history = []
+        if len(rows) == 0:
+            return history
+
+        columns = {column: np.asarray(self._read_column(column, row_count)[rows]) for column in self._columns}
+        order = np.argsort(columns['timestamp'], kind='stable')
+        for i in order.tolist():
+            odds = float(columns['odds'][i])
+            points = float(columns['points'][i])
+            american = int(columns['american'][i])
+            history.append({
+                "eventId": self._ids[columns['event'][i]],
+                "marketId": self._ids[columns['market'][i]],
+                "selectionId": self._ids[columns['selection'][i]],
+                "timestamp": float(columns['timestamp'][i]),
+                "odds": None if np.isnan(odds) else odds,
+                "american": None if american == 0 else american,
+                "points": None if np.isnan(points) else points
+            })
+
+        return history
+
+    def get_event_history(self, event_id):
+        """
+        Returns every recorded line change for an event, ordered by time.
+
+        Parameters
+        ----------
+        event_id : str()
+            dk event id
+
+        Returns
+        -------
+        list()
+            Dicts with keys eventId, marketId, selectionId, timestamp, odds (decimal), american, and points
+        """
+        rows, row_count = self._get_rows('event', event_id)
+        return self._build_history(rows, row_count)
+
+    def get_selection_history(self, selection_id):
+        """
+        Returns every recorded line change for one selection, ordered by time. Output format matches
+        get_event_history().
+        """
+        rows, row_count = self._get_rows('selection', selection_id)
+        return self._build_history(rows, row_count)
+
+    def get_row_count(self):
+        return self._row_count
+
+    def close(self):
+        with self._lock:
+            self._ids_handle.close()
+            for handle in self._column_handles.values():
+                handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _crossed_level(previous, current, level):
+    if previous is None or current is None:
+        return False
+    return previous < level <= current or previous > level >= current
+
+
+class DkLineWatcher:
+    def __init__(self, api, interval=30):
+        """
+        Watches dk game lines and fires callbacks when rules match. Each tick retrieves the game lines of every 
+        league with a rule once (DkSportsbook.get_gamelines_for_leagues_async()) and evaluates every rule against 
+        that snapshot, so adding rules does not add api calls.
+
+        Rules compare each matching selection to the selection as it was when the rule last fired (or when it was 
+        first seen). After a rule fires for a selection, the current selection becomes the new baseline.
+
+        Parameters
+        ----------
+        api : DkSportsbook
+        interval : float, optional
+            Seconds between ticks, by default 30
+        """
+        self.api = api
+        self.interval = interval
+        self._rules = {}
+        self._baselines = {}        # (rule id, selection id) -> selection
+        self._rule_counter = 0
+        self._lock = threading.Lock()
+        self._stop_event = None
+        self._stop_requested = False
+        self._loop = None
+        self.tick_count = 0
+
+    def add_rule(self, league, condition, callback, market=None, team=None, name=None):
+        """
+        Adds a rule with a custom condition.
+
+        Parameters
+        ----------
+        league : str()
+            A major league supported by DkSportsbook.get_gamelines_for_league(), for example 'nfl'
+        condition : function
+            Called as condition(baseline, current) with dk selection dicts, return True to fire the callback. It 
+            runs while the watcher's lock is held, so it should not call watcher methods.
+        callback : function
+            Called with an alert dict (keys ruleId, name, league, event, selection, baseline, time). Coroutine 
+            functions are awaited on the watcher's event loop.
+        market : str(), optional
+            'spread', 'total', or 'moneyline', by default None (all game lines)
+        team : str(), optional
+            Only selections whose label or participant names contain this team, by default None (every team). 
+            The event name is not used, so a spread rule for one team does not fire for the other side.
+        name : str(), optional
+            Name included in alerts, by default None
+
+        Returns
+        -------
+        int()
+            Rule id, use with remove_rule()
+        """
+        with self._lock:
+            self._rule_counter = self._rule_counter + 1
+            rule_id = self._rule_counter
+            self._rules[rule_id] = {
+                "id": rule_id,
+                "name": name,
+                "league": league.lower(),
+                "market": None if market is None else market.lower(),
+                "team": None if team is None else team.lower(),
+                "condition": condition,
+                "callback": callback
+            }
+        return rule_id
+
+    def add_line_move_rule(self, league, threshold, callback, market='spread', team=None, name=None):
+        """
+        Fires when a selection's points (spread or total) move by threshold or more, for example threshold=1.5 
+        for "spread moved 1.5 points". See add_rule() for the other parameters.
+        """
+        def condition(baseline, current):
+            if baseline.get('points') is None or current.get('points') is None:
+                return False
+            return abs(current['points'] - baseline['points']) >= threshold
+
+        return self.add_rule(league, condition, callback, market=market, team=team, name=name)
+
+    def add_odds_cross_rule(self, league, american_odds, callback, market='moneyline', team=None, name=None):
+        """
+        Fires when a selection's american odds cross a level in either direction, for example american_odds=100 
+        for "odds crossed +100". See add_rule() for the other parameters.
+        """
+        def condition(baseline, current):
+            return _crossed_level(get_selection_american_odds(baseline), get_selection_american_odds(current), 
+                                  american_odds)
+
+        return self.add_rule(league, condition, callback, market=market, team=team, name=name)
+
+    def remove_rule(self, rule_id):
+        with self._lock:
+            self._rules.pop(rule_id, None)
+            self._baselines = {k: v for k, v in self._baselines.items() if k[0] != rule_id}
+
+    def get_rule_count(self):
+        return len(self._rules)
+
+    @staticmethod
+    def _selection_matches_team(selection, team):
+        if team in selection.get('label', '').lower():
+            return True
+        participants = selection.get('participants') or []
+        return any([team in str(x.get('name', '')).lower() for x in participants])
+
+    @staticmethod
+    def _index_snapshot(gamelines_by_league):
+        # (league, market type) -> [(event name, selection)]
+        index = {}
+        for league, gamelines in gamelines_by_league.items():
+            for game in gamelines:
+                for selection in game['selections']:
+                    market = selection.get('marketType', '').lower()
+                    index.setdefault((league, market), []).append((game['event'], selection))
+                    index.setdefault((league, None), []).append((game['event'], selection))
+        return index
+
+    def evaluate_snapshot(self, gamelines_by_league, timestamp=None):
+        """
+        Evaluates every rule against one snapshot without calling callbacks. Used by tick(), also useful to 
+        replay recorded snapshots.
+
+        Parameters
+        ----------
+        gamelines_by_league : dict()
+            Output of DkSportsbook.get_gamelines_for_leagues()
+        timestamp : float, optional
+            Epoch seconds added to the alerts, by default None and the current time is used
+
+        Returns
+        -------
+        list()
+            Alert dicts, each with the rule's 'callback'
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        index = self._index_snapshot(gamelines_by_league)
+        alerts = []
+        # baselines are updated under the same lock remove_rule() holds, so a removed rule's baselines are not 
+        # added back
+        with self._lock:
+            for rule in self._rules.values():
+                for event, selection in index.get((rule['league'], rule['market']), []):
+                    if rule['team'] is not None and not self._selection_matches_team(selection, rule['team']):
+                        continue
+                    
+                    key = (rule['id'], selection['id'])
+                    baseline = self._baselines.get(key)
+                    if baseline is None:
+                        self._baselines[key] = selection
+                        continue
+                    
+                    if rule['condition'](baseline, selection):
+                        self._baselines[key] = selection
+                        alerts.append({
+                            "ruleId": rule['id'],
+                            "name": rule['name'],
+                            "league": rule['league'],
+                            "event": event,
+                            "selection": selection,
+                            "baseline": baseline,
+                            "time": timestamp,
+                            "callback": rule['callback']
+                        })
+
+        return alerts
+
+    async def _fire_callbacks(self, alerts):
+        coroutines = []
+        for alert in alerts:
+            callback = alert.pop('callback')
+            try:
+                if inspect.iscoroutinefunction(callback):
+                    coroutines.append(callback(alert))
+                else:
+                    callback(alert)
+            except Exception as e:
+                print(f"ERROR: Line watcher callback for rule {alert['ruleId']} failed: {e}")
+
+        results = await asyncio.gather(*coroutines, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"ERROR: Line watcher callback failed: {result}")
+
+    async def tick(self):
+        """
+        Retrieves a snapshot of every watched league's game lines, evaluates the rules, and fires the callbacks.
+
+        Returns
+        -------
+        list()
+            Alerts fired this tick
+        """
+        with self._lock:
+            leagues = list(dict.fromkeys([x['league'] for x in self._rules.values()]))
+        if len(leagues) == 0:
+            return []
+        
+        gamelines = await self.api.get_gamelines_for_leagues_async(leagues)
+        alerts = self.evaluate_snapshot(gamelines)
+        await self._fire_callbacks(alerts)
+        self.tick_count = self.tick_count + 1
+        return alerts
+
+    async def run(self, max_ticks=None):
+        """
+        Runs ticks every interval seconds until stop() is called (or max_ticks ticks have run).
+
+        Parameters
+        ----------
+        max_ticks : int, optional
+            Stop after this many ticks, by default None (run until stop())
+        """
+        # the event is created first so stop() never sees the loop without it
+        self._stop_event = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        ticks = 0
+        while not self._stop_requested:
+            try:
+                await self.tick()
+            except Exception as e:
+                print(f"ERROR: Line watcher tick failed: {e}")
+            ticks = ticks + 1
+            if max_ticks is not None and ticks >= max_ticks:
+                break
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+        self._loop = None
+        self._stop_requested = False
+
+    def start(self):
+        """
+        Runs the watcher in a background daemon thread with its own event loop.
+
+        Returns
+        -------
+        threading.Thread
+        """
+        self._stop_requested = False
+        thread = threading.Thread(target=asyncio.run, args=(self.run(),), daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """
+        Stops run() after the current tick. Safe to call from any thread.
+        """
+        self._stop_requested = True
+        loop = self._loop
+        stop_event = self._stop_event
+        if loop is not None and stop_event is not None:
+            loop.call_soon_threadsafe(stop_event.set)
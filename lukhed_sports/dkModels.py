@@ -0,0 +1,371 @@
+from lukhed_sports import apiTools
+from typing import Any, List, Optional
+import sys
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+"""
+Compact representations of DraftKings markets and selections. Category responses hold thousands of selection dicts
+with repeated strings (odds, outcome types, participant names, tags). The classes here use __slots__ and interned
+strings, which uses a fraction of the memory when many snapshots are kept. Use to_dict() (or
+expand_category_data()) when the dk dict format is needed.
+
+decode_category_data() is a typed decode of category responses that only keeps the fields the wrappers read.
+"""
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _get_extra(data, known_keys):
+    # keys the class does not have a slot for are kept, empty values are dropped
+    extra = {k: v for k, v in data.items() if k not in known_keys and v not in [{}, [], None]}
+    return extra if len(extra) > 0 else None
+
+
+class _DkCompactModel:
+    """
+    Read access with dk keys works like a dict (selection['trueOdds'], market.get('eventId')), so functions written 
+    for the dk dicts (dkLineTracking, the DkSportsbook parsers) accept the compact objects.
+    """
+    __slots__ = ()
+
+    def _get_dk_value(self, key):
+        raise KeyError(key)
+
+    def __getitem__(self, key):
+        value = self._get_dk_value(key)
+        if value is None or value == {}:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class DkParticipant(_DkCompactModel):
+    __slots__ = ('id', 'name', 'type')
+
+    def __init__(self, participant_id, name, participant_type):
+        self.id = participant_id
+        self.name = _intern(name)
+        self.type = _intern(participant_type)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('id'), data.get('name'), data.get('type'))
+
+    def _get_dk_value(self, key):
+        if key in ['id', 'name', 'type']:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def to_dict(self):
+        return {"id": self.id, "name": self.name, "type": self.type}
+
+
+class DkMarket(_DkCompactModel):
+    __slots__ = ('id', 'event_id', 'name', 'extra')
+    _known_keys = ('id', 'eventId', 'name')
+
+    def __init__(self, market_id, event_id, name, extra=None):
+        """
+        Compact dk market. Keys other than id, eventId, and name are kept in extra.
+        """
+        self.id = market_id
+        self.event_id = event_id
+        self.name = _intern(name)
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('id'), data.get('eventId'), data.get('name'), _get_extra(data, cls._known_keys))
+
+    def _get_dk_value(self, key):
+        if key == 'id':
+            return self.id
+        elif key == 'eventId':
+            return self.event_id
+        elif key == 'name':
+            return self.name
+        elif self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def to_dict(self):
+        market = {"id": self.id, "eventId": self.event_id, "name": self.name}
+        if self.extra is not None:
+            market.update(self.extra)
+        return market
+
+
+class DkSelection(_DkCompactModel):
+    __slots__ = ('id', 'market_id', 'label', 'american', 'decimal', 'fractional', 'true_odds', 'points',
+                 'outcome_type', 'participants', 'tags', 'main', 'sort_order', 'extra')
+    _known_keys = ('id', 'marketId', 'label', 'displayOdds', 'trueOdds', 'points', 'outcomeType', 'participants',
+                   'tags', 'main', 'sortOrder')
+
+    def __init__(self, selection_id, market_id, label, american=None, decimal=None, fractional=None, true_odds=None,
+                 points=None, outcome_type=None, participants=(), tags=(), main=None, sort_order=None, extra=None):
+        """
+        Compact dk selection. displayOdds are stored as the interned strings dk returns (american, decimal,
+        fractional), participants as a tuple of DkParticipant, and tags as a tuple of interned strings. Keys
+        without a slot are kept in extra.
+        """
+        self.id = selection_id
+        self.market_id = market_id
+        self.label = _intern(label)
+        self.american = _intern(american)
+        self.decimal = _intern(decimal)
+        self.fractional = _intern(fractional)
+        self.true_odds = true_odds
+        self.points = points
+        self.outcome_type = _intern(outcome_type)
+        self.participants = participants
+        self.tags = tags
+        self.main = main
+        self.sort_order = sort_order
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        display_odds = data.get('displayOdds') or {}
+        return cls(
+            data.get('id'),
+            data.get('marketId'),
+            data.get('label'),
+            american=display_odds.get('american'),
+            decimal=display_odds.get('decimal'),
+            fractional=display_odds.get('fractional'),
+            true_odds=data.get('trueOdds'),
+            points=data.get('points'),
+            outcome_type=data.get('outcomeType'),
+            participants=tuple([DkParticipant.from_dict(x) for x in data.get('participants', [])]),
+            tags=tuple([_intern(x) for x in data.get('tags', [])]),
+            main=data.get('main'),
+            sort_order=data.get('sortOrder'),
+            extra=_get_extra(data, cls._known_keys)
+        )
+
+    def _get_display_odds(self):
+        display_odds = {"american": self.american, "decimal": self.decimal, "fractional": self.fractional}
+        return {k: v for k, v in display_odds.items() if v is not None}
+
+    def _get_dk_value(self, key):
+        if key == 'id':
+            return self.id
+        elif key == 'marketId':
+            return self.market_id
+        elif key == 'label':
+            return self.label
+        elif key == 'displayOdds':
+            return self._get_display_odds()
+        elif key == 'trueOdds':
+            return self.true_odds
+        elif key == 'points':
+            return self.points
+        elif key == 'outcomeType':
+            return self.outcome_type
+        elif key == 'participants':
+            return [x.to_dict() for x in self.participants]
+        elif key == 'tags':
+            return list(self.tags)
+        elif key == 'main':
+            return self.main
+        elif key == 'sortOrder':
+            return self.sort_order
+        elif self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def to_dict(self):
+        """
+        Returns the selection in the dk dict format. Keys that were empty or missing in the original are not
+        included.
+        """
+        selection = {}
+        for key in self._known_keys:
+            value = self.get(key)
+            if value not in [None, {}, []]:
+                selection[key] = value
+        if self.extra is not None:
+            selection.update(self.extra)
+        return selection
+
+
+def compact_selections(selections):
+    """
+    Converts dk selection dicts to DkSelection objects.
+
+    Parameters
+    ----------
+    selections : list()
+        dk selections
+
+    Returns
+    -------
+    list()
+        DkSelection for each selection
+    """
+    return [DkSelection.from_dict(x) for x in selections]
+
+
+def compact_category_data(data):
+    """
+    Converts a dk category response (dict with 'markets' and 'selections') to the compact format. Other keys are
+    kept as is.
+
+    Returns
+    -------
+    dict()
+        Copy of data with 'markets' as DkMarket objects and 'selections' as DkSelection objects
+    """
+    compact = dict(data)
+    compact['markets'] = [DkMarket.from_dict(x) for x in data.get('markets', [])]
+    compact['selections'] = compact_selections(data.get('selections', []))
+    return compact
+
+
+def expand_category_data(data):
+    """
+    Inverse of compact_category_data(), returns the category response in the dk dict format.
+    """
+    expanded = dict(data)
+    expanded['markets'] = [x.to_dict() for x in data.get('markets', [])]
+    expanded['selections'] = [x.to_dict() for x in data.get('selections', [])]
+    return expanded
+
+
+############################
+# Typed decode
+############################
+_category_fields = {
+    "events": ['id', 'name', 'startEventDate', 'status', 'participants'],
+    "markets": ['id', 'eventId', 'name', 'marketType', 'subcategoryId'],
+    "selections": ['id', 'marketId', 'label', 'displayOdds', 'trueOdds', 'points', 'outcomeType', 'participants',
+                   'main']
+}
+_display_odds_fields = ['american', 'decimal', 'fractional']
+_participant_fields = ['id', 'name', 'type']
+
+
+if msgspec is not None:
+    # Only the declared fields are decoded, everything else in the payload is skipped by the parser
+    class _DecodedParticipant(msgspec.Struct, omit_defaults=True):
+        id: Any = None
+        name: Any = None
+        type: Any = None
+
+    class _DecodedDisplayOdds(msgspec.Struct, omit_defaults=True):
+        american: Any = None
+        decimal: Any = None
+        fractional: Any = None
+
+    class _DecodedEvent(msgspec.Struct, omit_defaults=True, rename='camel'):
+        id: Any = None
+        name: Any = None
+        start_event_date: Any = None
+        status: Any = None
+        participants: Any = None
+
+    class _DecodedMarket(msgspec.Struct, omit_defaults=True, rename='camel'):
+        id: Any = None
+        event_id: Any = None
+        name: Any = None
+        market_type: Any = None
+        subcategory_id: Any = None
+
+    class _DecodedSelection(msgspec.Struct, omit_defaults=True, rename='camel'):
+        id: Any = None
+        market_id: Any = None
+        label: Any = None
+        display_odds: Optional[_DecodedDisplayOdds] = None
+        true_odds: Any = None
+        points: Any = None
+        outcome_type: Any = None
+        participants: Optional[List[_DecodedParticipant]] = None
+        main: Any = None
+
+    class _DecodedCategory(msgspec.Struct, omit_defaults=True):
+        events: Optional[List[_DecodedEvent]] = None
+        markets: Optional[List[_DecodedMarket]] = None
+        selections: Optional[List[_DecodedSelection]] = None
+
+    _category_decoder = msgspec.json.Decoder(_DecodedCategory)
+
+
+def _project(data, fields):
+    return {k: data[k] for k in fields if k in data and data[k] is not None}
+
+
+def _project_category_data(data):
+    projected = {}
+    for key, fields in _category_fields.items():
+        if key not in data:
+            continue
+        projected[key] = [_project(x, fields) for x in data[key]]
+
+    for selection in projected.get('selections', []):
+        if isinstance(selection.get('displayOdds'), dict):
+            selection['displayOdds'] = _project(selection['displayOdds'], _display_odds_fields)
+        if isinstance(selection.get('participants'), list):
+            selection['participants'] = [_project(x, _participant_fields) for x in selection['participants']]
+
+    return projected
+
+
+def decode_category_data(raw):
+    """
+    Typed decode of a dk category response (league or event category endpoints). Only events, markets, and 
+    selections are kept, with the fields the wrappers read:
+
+    events: id, name, startEventDate, status, participants
+    markets: id, eventId, name, marketType, subcategoryId
+    selections: id, marketId, label, displayOdds (american, decimal, fractional), trueOdds, points, outcomeType, 
+    participants (id, name, type), main
+
+    With msgspec installed, the other fields are skipped while parsing. Otherwise the payload is decoded with 
+    apiTools.loads_json() then reduced to the same fields.
+
+    Parameters
+    ----------
+    raw : str or bytes
+        Response body
+
+    Returns
+    -------
+    dict()
+        {'events': [...], 'markets': [...], 'selections': [...]}, keys not in the response are not included
+
+    Raises
+    ------
+    ValueError
+        If raw is not valid json
+    """
+    if msgspec is not None:
+        try:
+            return msgspec.to_builtins(_category_decoder.decode(raw))
+        except msgspec.ValidationError:
+            # payload is not the expected shape (e.g. an error response), fall through to the generic decode
+            pass
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e))
+
+    data = apiTools.loads_json(raw)
+    if not isinstance(data, dict):
+        return data
+    return _project_category_data(data)
@@ -1,13 +1,25 @@
 from lukhed_basic_utils import osCommon as osC
 from lukhed_basic_utils import timeCommon as tC
-from lukhed_basic_utils import requestsCommon as rC
 from lukhed_basic_utils import fileCommon as fC
 from lukhed_basic_utils import stringCommon as sC
 from lukhed_basic_utils import listWorkCommon as lC
 from lukhed_sports.calibrations.dk import api_versions
+from lukhed_sports import apiTools
+from lukhed_sports import dkLineTracking
+from lukhed_sports import dkModels
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
+import os
+import re
 
 class DkSportsbook():
-    def __init__(self, api_delay=0.5, use_local_cache=True, reset_cache=False, retry_delay=1.5):
+    def __init__(self, api_delay=0.5, use_local_cache=True, reset_cache=False, retry_delay=1.5, pool_connections=4, 
+                 pool_maxsize=10, max_workers=6, league_cache_ttl=120, nav_cache_ttl=86400, cache_max_entries=256, 
+                 cache_max_bytes=None, revalidate_after=86400, api_burst=1, rate_limiter=None, line_recorder=None, 
+                 transport_mode='live', fixture_dir=None, metadata=None, sportsbooks=None, team_aliases=None, 
+                 typed_decode=False):
         """
         A wrapper class for accessing DraftKings Sportsbook API data.
 
@@ -18,18 +30,102 @@ class DkSportsbook():
         Parameters
         ----------
         api_delay : float, optional
-            Delay between API calls in seconds, by default 0.5
+            Average delay between API calls in seconds, by default 0.5. Calls are limited by a token bucket with 
+            rate 1/api_delay, so a call only waits when the budget is used up. None or 0 turns off rate limiting.
         use_local_cache : bool, optional
             Whether to cache reference API responses (sport list, league list, etc.) locally, by default True
             Note: use reset cache if the data is very stale (sports or leagues change over time)
         reset_cache : bool, optional
             Whether to clear existing cache on initialization, by default False
         retry_delay : float, optional
-            Delay between retry attempts for failed API calls in seconds, by default 1.5
+            Base delay for retrying failed API calls in seconds, by default 1.5. The delay doubles (with jitter) 
+            on each retry.
+        pool_connections : int, optional
+            Number of hosts to keep a keep-alive connection pool for, by default 4
+        pool_maxsize : int, optional
+            Max number of keep-alive connections per host, by default 10
+        max_workers : int, optional
+            Max number of concurrent api calls made by the multi-league methods, by default 6. All calls still 
+            share one rate limit.
+        league_cache_ttl : float, optional
+            Seconds league json (events, markets, categories) is kept in the session cache, by default 120
+        nav_cache_ttl : float, optional
+            Seconds sport navigation data (leagues available for a sport) is kept in the session cache, by default 
+            86400
+        cache_max_entries : int, optional
+            Max number of entries in the session cache before least recently used entries are evicted, by default 256
+        cache_max_bytes : int, optional
+            Max approximate size of the session cache in bytes, by default None (no size limit)
+        revalidate_after : float, optional
+            Seconds before locally cached reference data (sport list, league list) is revalidated with dk, by 
+            default 86400. Revalidation is a conditional request, so unchanged data costs a 304 response.
+        api_burst : int, optional
+            Number of calls that can be made back to back before api_delay spacing applies, by default 1
+        rate_limiter : apiTools.TokenBucketRateLimiter, optional
+            Provide a limiter to share one request budget across several DkSportsbook objects and threads, for 
+            example apiTools.get_shared_rate_limiter('draftkings', rate=2, burst=4). When provided, api_delay and 
+            api_burst are ignored. By default None.
+        line_recorder : dkLineTracking.DkLineHistoryRecorder, optional
+            Provide a recorder to snapshot every category response (game lines, props, etc.) retrieved by the 
+            class for line movement history, by default None
+        transport_mode : str, optional
+            'live' (default) makes real requests. 'record' makes real requests and writes each url's response to 
+            fixture_dir. 'replay' serves responses from fixture_dir with no network access, no rate limit waits, 
+            and no retries, which is useful for benchmarking and testing the parsing methods offline (combine 
+            with use_local_cache=False for deterministic runs).
+        fixture_dir : str, optional
+            Directory for recorded responses, required for 'record' and 'replay' modes, by default None
+        metadata : dict(), optional
+            Sport and league reference data from another object's get_metadata(), by default None. Instances 
+            created with it skip the local cache files and the sport/league lookups for the data it contains, 
+            which is useful for short lived workers. Preloaded data is still revalidated per revalidate_after.
+        sportsbooks : list(), optional
+            State sportsbook codes used by the multi book methods (for example get_gamelines_for_league_by_book()), 
+            such as ['dkusmi', 'dkusnj', 'dkusny'], by default None and only the default sportsbook is used. 
+            Sport, league, and category ids are resolved once with the default sportsbook and shared by every 
+            book.
+        team_aliases : dict(), optional
+            Alternate team names for the methods with a team input, {alias: name as displayed on dk}, for example 
+            {'washington': 'commanders'}, by default None. See add_team_aliases_from_conversion() to build them 
+            from leagueData.TeamConversion.
+        typed_decode : bool, optional
+            If True, category responses (game lines, props, etc.) are decoded with dkModels.decode_category_data(), 
+            which only keeps the events, markets, and selections fields the class reads, by default False. Json 
+            is decoded with orjson or msgspec when installed (see apiTools.set_json_backend()).
+        
+        Notes
+        -----
+        Construction does not make api calls or read the local cache. Sport and league data are loaded on first 
+        use (for example, the first access of api.available_sports).
         """
         # Set API Information
         self.api_delay = api_delay
         self.retry_delay = retry_delay
+        self._timeout = 2
+        self.max_workers = max_workers
+        self._max_retry_delay = 30
+        self._retry_status_codes = [429, 500, 502, 503, 504]
+        if rate_limiter is not None:
+            self.rate_limiter = rate_limiter
+        elif api_delay:
+            self.rate_limiter = apiTools.TokenBucketRateLimiter(1 / api_delay, burst=api_burst)
+        else:
+            self.rate_limiter = None
+        self._cache_lock = threading.Lock()
+        self.line_recorder = line_recorder
+        self.typed_decode = typed_decode
+        self._diff_states = {}
+        self._event_indexes = {}
+        self.team_aliases = {}
+        if team_aliases is not None:
+            self.add_team_aliases(team_aliases)
+
+        # Pooled session re-used by every call so connections (and TLS handshakes) are kept alive
+        self._session = apiTools.create_pooled_session(pool_connections=pool_connections, 
+                                                       pool_maxsize=pool_maxsize, 
+                                                       add_user_agent=True)
+        self._transport = apiTools.create_transport(transport_mode, self._session, timeout=self._timeout, 
+                                                    fixture_dir=fixture_dir)
 
         # Set cals
         self._api_versions = None
@@ -37,24 +133,35 @@ class DkSportsbook():
         self._player_url = None
         self.sportsbook = None
         self._load_calibrations()
+        self.sportsbooks = [self.sportsbook] if sportsbooks is None else sportsbooks
         
-        # Available Sports
-        self.available_sports = None
+        # Available Sports (loaded on first use)
         self._available_sports = None
+        self._available_sport_names = None
+        self._sports_entry = None
+        self._metadata_lock = threading.Lock()
         
         # Cache
         self.use_cache = use_local_cache
         self._local_cache_dir = osC.check_create_dir_structure(['lukhed_sports_local_cache'], return_path=True)
         self. _sports_cache_file = osC.append_to_dir(self._local_cache_dir, 'dk_sports_cache.json')
         self._cached_available_leagues_json = {}
+        self._leagues_cache_dir = osC.append_to_dir(self._local_cache_dir, 'dk_available_leagues_cache')
         self._leagues_cache_file = osC.append_to_dir(self._local_cache_dir, 'dk_available_leagues_cache.json')
-        self._cached_league_json = {}
+        self._legacy_leagues_cache = None
+        self.revalidate_after = revalidate_after
         self._cached_category = None
 
+        # Session (RAM) cache for league json and sport nav data
+        self.league_cache_ttl = league_cache_ttl
+        self.nav_cache_ttl = nav_cache_ttl
+        self._json_cache = apiTools.TtlLruCache(max_entries=cache_max_entries, max_bytes=cache_max_bytes)
+
         if self.use_cache and reset_cache:
             self._reset_cache()
 
-        self._set_available_sports()
+        if metadata is not None:
+            self._load_metadata(metadata)
 
     def _load_calibrations(self):
         # Load version cal
@@ -63,51 +170,254 @@ class DkSportsbook():
         self._player_url = self._api_versions['playerUrl']
         self.sportsbook = self._api_versions['defaultSportsbook']
         
+    @property
+    def available_sports(self):
+        """
+        Sports available on dk (lowercase names). Loaded on first access.
+        """
+        self._get_available_sports_data()
+        return self._available_sport_names
+    
+    def _get_available_sports_data(self):
+        if self._available_sports is None:
+            with self._metadata_lock:
+                if self._available_sports is None:
+                    self._set_available_sports()
+        
+        # still None if the sport list could not be retrieved, the next access retries
+        sports = self._available_sports
+        return [] if sports is None else sports
+    
     def _set_available_sports(self):
-        if self.use_cache:
-            if osC.check_if_file_exists(self._sports_cache_file):
-                self._available_sports = fC.load_json_from_file(self._sports_cache_file)
-            else:
-                self._available_sports = {}
+        cache_entry = self._sports_entry
+        if cache_entry is None and self.use_cache and osC.check_if_file_exists(self._sports_cache_file):
+            cache_entry = self._convert_to_cache_entry(fC.load_json_from_file(self._sports_cache_file))
+
+        api_version = self._api_versions['navVersion']
+        url = f"{self._base_url}/sportscontent/navigation/{self.sportsbook}/{api_version}/nav/sports?format=json"
+        new_entry = self._get_validated_nav_entry(url, 'retrieve available sports', cache_entry, data_key='sports')
+        self._set_sports_entry(new_entry)
+        if new_entry is not None and self.use_cache and new_entry is not cache_entry:
+            apiTools.dump_json_atomic(self._sports_cache_file, new_entry)
+
+    def _set_sports_entry(self, entry):
+        self._sports_entry = entry
+        sports = [] if entry is None else entry['data']
+        self._available_sport_names = [x['name'].lower() for x in sports]
+        self._available_sports = None if entry is None else sports
+
+    def _load_metadata(self, metadata):
+        self._sports_entry = metadata.get('sports')
+        for sport_id, cache_entry in metadata.get('leagues', {}).items():
+            self._cached_available_leagues_json[sport_id] = cache_entry
+
+    def get_metadata(self, sports=None):
+        """
+        Returns the sport and league reference data used by the class so it can be preloaded into other 
+        DkSportsbook objects (metadata parameter), for example when starting worker processes. The data is json 
+        serializable.
 
-        if self._available_sports == {}:
-            # Call the api
-            api_version = self._api_versions['navVersion']
-            url = f"{self._base_url}/sportscontent/navigation/{self.sportsbook}/{api_version}/nav/sports?format=json"
-            self._available_sports = self._call_api(url, 'retrieve available sports')['sports']
-            if self.use_cache:
-                fC.dump_json_to_file(self._sports_cache_file, self._available_sports)
+        Parameters
+        ----------
+        sports : list(), optional
+            Sports to load league data for before returning, for example ['football', 'basketball'], by default 
+            None and only league data already loaded is included.
 
-        self.available_sports = [x['name'].lower() for x in self._available_sports]
+        Returns
+        -------
+        dict()
+            {'sports': sport list cache entry, 'leagues': {sport id: league data cache entry}}
+        """
+        self._get_available_sports_data()
+        if sports is not None:
+            sport_ids = [self._get_sport_id(x) for x in sports]
+            self._run_concurrently(self._get_league_data_for_sport, [(x,) for x in sport_ids if x is not None])
+        
+        return {
+            "sports": self._sports_entry,
+            "leagues": dict(self._cached_available_leagues_json)
+        }
             
-    def _call_api(self, endpoint, purpose):
+    @staticmethod
+    def _convert_to_cache_entry(cached_data):
+        """
+        Local reference cache entries are stored as {'validators': {}, 'checked': epoch, 'data': data}. Caches 
+        written by older versions of the class only stored the data, so they are converted and revalidated.
+        """
+        if isinstance(cached_data, dict) and 'validators' in cached_data:
+            return cached_data
+        if cached_data in [{}, [], None]:
+            return None
+        
+        return {
+            "validators": {},
+            "checked": 0,
+            "data": cached_data
+        }
+    
+    def _get_validated_nav_entry(self, url, purpose, cache_entry, data_key=None, force_revalidate=False):
+        """
+        Returns a reference cache entry that is fresh per self.revalidate_after. Stale entries are revalidated 
+        with If-None-Match/If-Modified-Since, so an unchanged payload costs a 304 and no json parsing.
+
+        Parameters
+        ----------
+        url : str()
+        purpose : str()
+        cache_entry : dict() or None
+            Current entry from the local cache, None if not cached
+        data_key : str(), optional
+            If provided, only this key of the response is stored as the entry data, by default None
+        force_revalidate : bool, optional
+            Revalidate even when the entry is fresh, by default False
+
+        Returns
+        -------
+        dict() or None
+            The cache entry. It is the same object as cache_entry when no update was needed. None if the data 
+            could not be retrieved.
+        """
+        now = time.time()
+        if cache_entry is not None and not force_revalidate:
+            if self.revalidate_after is None or now - cache_entry['checked'] < self.revalidate_after:
+                return cache_entry
+
+        validators = cache_entry['validators'] if cache_entry is not None else {}
+        headers = {}
+        if 'etag' in validators:
+            headers['If-None-Match'] = validators['etag']
+        if 'lastModified' in validators:
+            headers['If-Modified-Since'] = validators['lastModified']
+
+        response, data = self._call_api_with_response(url, purpose, headers=headers)
+        if response is not None and response.status_code == 304 and cache_entry is not None:
+            return {
+                "validators": validators,
+                "checked": now,
+                "data": cache_entry['data']
+            }
+        
+        if data == {}:
+            # keep serving stale data over nothing
+            return cache_entry
+        
+        new_validators = {}
+        if response.headers.get('ETag') is not None:
+            new_validators['etag'] = response.headers['ETag']
+        if response.headers.get('Last-Modified') is not None:
+            new_validators['lastModified'] = response.headers['Last-Modified']
+
+        return {
+            "validators": new_validators,
+            "checked": now,
+            "data": data[data_key] if data_key is not None else data
+        }
+    
+    def _wait_for_rate_limit(self):
+        if self.rate_limiter is not None and not self._transport.offline:
+            self.rate_limiter.acquire()
+    
+    def _call_api(self, endpoint, purpose, decoder=None):
+        response, data = self._call_api_with_response(endpoint, purpose, decoder=decoder)
+        return data
+    
+    def _get_category_decoder(self):
+        return dkModels.decode_category_data if self.typed_decode else None
+    
+    def _call_category_api(self, endpoint, purpose):
+        """
+        Used for every call that returns markets and selections (league categories, event categories) so line 
+        snapshots can be recorded when a line_recorder is set.
+        """
+        data = self._call_api(endpoint, purpose, decoder=self._get_category_decoder())
+        if self.line_recorder is not None and data != {}:
+            self.line_recorder.record_category_data(data)
+        return data
+    
+    def _get_retry_delay(self, response, attempt):
+        delay = apiTools.calculate_backoff_delay(attempt, self.retry_delay, max_delay=self._max_retry_delay)
+        if response is not None and response.headers.get('Retry-After') is not None:
+            try:
+                delay = max(delay, min(float(response.headers['Retry-After']), self._max_retry_delay))
+            except ValueError:
+                pass
+        return delay
+    
+    def _call_api_with_response(self, endpoint, purpose, headers=None, decoder=None):
         retry_count = 3
-        if self.api_delay is not None:
-            tC.sleep(self.api_delay)
+        attempt = 0
 
         while retry_count > 0:
+            self._wait_for_rate_limit()
             print(f"called api: {endpoint}\npurpose: {purpose}\n")
-            response = rC.request_json(endpoint, add_user_agent=True, timeout=2)
-            if response == {}:
-                print("Sleeping then retrying api call\n")
-                tC.sleep(self.retry_delay)
+            response, data = self._request_json(endpoint, headers=headers, decoder=decoder)
+            if response is not None and response.status_code == 304:
+                break
+            elif data == {} or (response is not None and response.status_code in self._retry_status_codes):
+                if self._transport.offline:
+                    break
+                elif retry_count > 1:
+                    delay = self._get_retry_delay(response, attempt)
+                    print(f"Sleeping {round(delay, 2)}s then retrying api call\n")
+                    tC.sleep(delay)
             else:
                 break
 
             retry_count = retry_count - 1
+            attempt = attempt + 1
+
+        return response, data
+    
+    def _request_json(self, endpoint, headers=None, decoder=None):
+        """
+        Returns (response, parsed json). Parsed json is {} on any error and for 304 (not modified) responses, 
+        which have no body to parse. The body is decoded with decoder if provided, else apiTools.loads_json().
+        """
+        response = None
+        decoder = apiTools.loads_json if decoder is None else decoder
+        try:
+            response = self._transport.get(endpoint, headers=headers)
+            if response.status_code == 304:
+                return response, {}
+            return response, decoder(response.content)
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            return response, {}
+        
+    def get_connection_stats(self):
+        """
+        Use this method to confirm connection pooling is working. Every DK call goes through one keep-alive session, 
+        so after the first call to a host, connections should mostly be reused.
 
-        return response
+        Returns
+        -------
+        dict()
+            Counts of requests, new connections, and reused connections (total and by host).
+        """
+        return apiTools.get_session_connection_stats(self._session)
+    
+    def close(self):
+        """
+        Closes the pooled http session. The class can not make further api calls after this.
+        """
+        self._session.close()
     
     ############################
     # Class cache management
     ############################
     def _reset_cache(self):
-        fC.dump_json_to_file(self._sports_cache_file, {})
-        fC.dump_json_to_file(self._leagues_cache_file, {})
+        apiTools.dump_json_atomic(self._sports_cache_file, {})
+        if osC.check_if_file_exists(self._leagues_cache_file):
+            apiTools.dump_json_atomic(self._leagues_cache_file, {})
+        for sport_id in self._get_locally_cached_sport_ids():
+            try:
+                os.remove(self._get_league_cache_file(sport_id))
+            except FileNotFoundError:
+                pass
     
     def _check_available_league_cache(self, sport_id):
         """
-        Checks available league cache on local file system.
+        Checks available league cache in the session cache.
 
         Parameters
         ----------
@@ -117,58 +427,112 @@ class DkSportsbook():
         Returns
         -------
         dict()
-            Output from self._get_json_for_league() or blank dict {} if no cache
+            Output from self._get_league_data_for_sport() or None if no cache
+        """
+        return self._json_cache.get(('sport', sport_id))
+    
+    def _get_league_cache_file(self, sport_id):
+        return osC.append_to_dir(self._leagues_cache_dir, f'{sport_id}.json')
+    
+    def _get_locally_cached_sport_ids(self):
+        if not os.path.isdir(self._leagues_cache_dir):
+            return []
+        return [x[:-5] for x in os.listdir(self._leagues_cache_dir) if x.endswith('.json') and 
+                not x.startswith('.tmp_')]
+    
+    def _get_local_league_entry(self, sport_id):
+        """
+        Returns the local cache entry for a sport's league data, None if not cached. Each sport is stored in its 
+        own file (dk_available_leagues_cache/<sport id>.json), which is only read when the sport is first 
+        needed. Caches written by older versions of the class (one file for all sports) are still read.
         """
-        if self._cached_available_leagues_json == {} and self.use_cache:
-            # Try to load available leagues cache from file
-            if osC.check_if_file_exists(self._leagues_cache_file):
-                self._cached_available_leagues_json = fC.load_json_from_file(self._leagues_cache_file)
+        cache_entry = self._cached_available_leagues_json.get(sport_id)
+        if cache_entry is not None or not self.use_cache:
+            return cache_entry
         
-        # See if leagues available for sport are in cache
-        try:
-            available_leagues_json = self._cached_available_leagues_json[sport_id]
-        except KeyError:
-            available_leagues_json = None
+        cache_entry = self._convert_to_cache_entry(apiTools.load_json_if_exists(self._get_league_cache_file(sport_id)))
+        if cache_entry is None:
+            with self._cache_lock:
+                if self._legacy_leagues_cache is None:
+                    self._legacy_leagues_cache = apiTools.load_json_if_exists(self._leagues_cache_file) or {}
+            cache_entry = self._convert_to_cache_entry(self._legacy_leagues_cache.get(sport_id))
         
-        return available_leagues_json
+        if cache_entry is not None:
+            self._cached_available_leagues_json[sport_id] = cache_entry
+        return cache_entry
     
-    def _get_league_data_for_sport(self, s_id):
+    def _get_league_data_for_sport(self, s_id, force_revalidate=False):
         """
         This function tries to utilize saved available leagues for a sport. Useful for users doing multiple 
         queries against the same sport so as to save api calls.
 
-        There are two types of cache for available leagues: local file storage and RAM (local class variable).
+        There are two types of cache for available leagues: local file storage and RAM (session cache).
 
         The RAM cache is on by default, as the leagues associated with a sport should not change during an 
-        active session.
+        active session. Entries expire from RAM after nav_cache_ttl seconds.
 
-        The local file storage option is linked to user instantiation method (use_local_cache). 
+        The local file storage option is linked to user instantiation method (use_local_cache). Each sport has its 
+        own file, replaced atomically when updated, so processes on the same host can share the cache. File 
+        entries older than revalidate_after are revalidated with a conditional request.
 
         Parameters
         ----------
         s_id : str()
-            _description_
+            Sport id from self._get_sport_id()
+        force_revalidate : bool, optional
+            Skip the session cache and revalidate the local file entry with dk, by default False
 
         Returns
         -------
-        _type_
-            _description_
+        dict()
+            League data for the sport, {} if it could not be retrieved
         """
         # check cache for id, get from dk if not in cache
-        available_leagues_cache = self._check_available_league_cache(s_id)
-        if available_leagues_cache is not None:
-            # cache is available
-            available_leagues = available_leagues_cache
-        else:
-            # obtain league json from dk and add to cache
-            api_version = self._api_versions['navVersion']
-            url = f"{self._base_url}/sportscontent/navigation/{self.sportsbook}/{api_version}/nav/sports/{s_id}?format=json"
-            available_leagues = self._call_api(url, 'retrieve league data for id={s_id}')
-            self._cached_available_leagues_json[s_id] = available_leagues
+        if not force_revalidate:
+            available_leagues_cache = self._check_available_league_cache(s_id)
+            if available_leagues_cache is not None:
+                return available_leagues_cache
+        
+        # obtain league json from dk (or the local file cache) and add to cache
+        cache_entry = self._get_local_league_entry(s_id)
+        api_version = self._api_versions['navVersion']
+        url = f"{self._base_url}/sportscontent/navigation/{self.sportsbook}/{api_version}/nav/sports/{s_id}?format=json"
+        new_entry = self._get_validated_nav_entry(url, f'retrieve league data for id={s_id}', cache_entry, 
+                                                  force_revalidate=force_revalidate)
+        if new_entry is None:
+            return {}
+        
+        self._json_cache.set(('sport', s_id), new_entry['data'], ttl=self.nav_cache_ttl)
+        if new_entry is not cache_entry:
+            self._cached_available_leagues_json[s_id] = new_entry
+            if self.use_cache:
+                apiTools.dump_json_atomic(self._get_league_cache_file(s_id), new_entry)
+
+        return new_entry['data']
+    
+    def refresh_reference_cache(self):
+        """
+        Revalidates the locally cached sport list and every cached league list with dk now. Unchanged data costs a 
+        304 response, so this is a cheap alternative to reset_cache=True for keeping the cache fresh.
+        """
+        api_version = self._api_versions['navVersion']
+        url = f"{self._base_url}/sportscontent/navigation/{self.sportsbook}/{api_version}/nav/sports?format=json"
+        cache_entry = self._sports_entry
+        if self.use_cache and osC.check_if_file_exists(self._sports_cache_file):
+            cache_entry = self._convert_to_cache_entry(fC.load_json_from_file(self._sports_cache_file)) or cache_entry
+        
+        new_entry = self._get_validated_nav_entry(url, 'retrieve available sports', cache_entry, data_key='sports', 
+                                                  force_revalidate=True)
+        if new_entry is not None:
+            self._set_sports_entry(new_entry)
             if self.use_cache:
-                fC.dump_json_to_file(self._leagues_cache_file, self._cached_available_leagues_json)
+                apiTools.dump_json_atomic(self._sports_cache_file, new_entry)
 
-        return available_leagues
+        sport_ids = set(self._cached_available_leagues_json.keys())
+        if self.use_cache:
+            sport_ids.update(self._get_locally_cached_sport_ids())
+        for sport_id in sport_ids:
+            self._get_league_data_for_sport(sport_id, force_revalidate=True)
     
     def _check_league_json_cache(self, league_id):
         """
@@ -186,15 +550,10 @@ class DkSportsbook():
         Returns
         -------
         dict()
-            Output from self._get_league_data_for_sport() or blank dict {} if no cache
+            Output from self._get_json_for_league() or None if no cache or the cached json is older than 
+            league_cache_ttl
         """
-
-        try:
-            league_json = self._cached_league_json[league_id]
-        except KeyError:
-            league_json = None
-        
-        return league_json
+        return self._json_cache.get(('league', league_id))
     
     def _get_json_for_league(self, sport, league):
         sport = sport.lower()
@@ -202,6 +561,8 @@ class DkSportsbook():
         'https://sportsbook-nash.draftkings.com/api/sportscontent/dkusmi/v1/leagues/88808'
 
         league_id = self._get_league_id(sport, league)
+        if league_id is None:
+            return {}
 
         # check cache for id, get from dk if not in cache
         league_json_cache = self._check_league_json_cache(league_id)
@@ -213,15 +574,34 @@ class DkSportsbook():
             api_version = self._api_versions['groupVersion']
             url = f"{self._base_url}/sportscontent/{self.sportsbook}/{api_version}/leagues/{league_id}"
             league_json = self._call_api(url, f'retrieve league json for {league}')
-            self._cached_league_json[league_id] = league_json
+            if league_json != {}:
+                self._json_cache.set(('league', league_id), league_json, ttl=self.league_cache_ttl)
 
         return league_json
     
+    def get_cache_stats(self):
+        """
+        Use this method to tune the session cache (league_cache_ttl, nav_cache_ttl, cache_max_entries, 
+        cache_max_bytes).
+
+        Returns
+        -------
+        dict()
+            Session cache hits, misses, evictions, expirations, entries, and bytes.
+        """
+        return self._json_cache.get_stats()
+    
+    def clear_session_cache(self):
+        """
+        Clears the session (RAM) cache so the next calls retrieve fresh league data from dk.
+        """
+        self._json_cache.clear()
+    
     def _check_category_cache(league):
         stop = 1
     
     def _get_sport_from_id(self, sport_id):
-        sport_ids = [x['id'] for x in self._available_sports]
+        sport_ids = [x['id'] for x in self._get_available_sports_data()]
         sport = self.available_sports[sport_ids.index(sport_id)]
         return sport
     
@@ -242,8 +622,8 @@ class DkSportsbook():
     ############################   
     def _get_sport_id(self, sport):
         """
-        This function parses available sports for sport id. Available sports are made available upon class 
-        instantiation and cached across sessions if use_cache = True.
+        This function parses available sports for sport id. Available sports are loaded on first use and 
+        cached across sessions if use_cache = True.
 
         Parameters
         ----------
@@ -258,7 +638,7 @@ class DkSportsbook():
         sport = sport.lower()
         if sport in self.available_sports:
             index = self.available_sports.index(sport)
-            return self._available_sports[index]['id']
+            return self._get_available_sports_data()[index]['id']
         else:
             print(f"ERROR: Could not find {sport} in valid sports. Check api.available_sports for valid input.")
             return None
@@ -286,7 +666,7 @@ class DkSportsbook():
         available_leagues = self._get_league_data_for_sport(sport_id)
         league = league.lower()
 
-        for available_league in available_leagues['leagues']:
+        for available_league in available_leagues.get('leagues', []):
             league_name = available_league['name'].lower()
             if league_name == league:
                 return available_league['id']
@@ -297,7 +677,7 @@ class DkSportsbook():
     def _get_data_from_league_json(self, sport, league, key, return_full=False):
         """
         This function is used to parse a league json file. A league json file is cached within a session and stored in 
-        self._cached_league_json. Each league has a default json file if queried with data such as 'events' and 
+        the session cache. Each league has a default json file if queried with data such as 'events' and 
         'markets'.
 
         sport -> leagues -> each league has json file
@@ -338,9 +718,70 @@ class DkSportsbook():
 
         return data
     
-    def _find_game_by_team_from_events(self, sport, league, team):
+    @staticmethod
+    def _build_event_token_index(events, max_phrase_tokens=4):
+        """
+        Indexes events by every phrase (1 to max_phrase_tokens consecutive words) in each team's name, so a team 
+        lookup is a dict lookup instead of a scan over every event name. Event names are split into teams on 
+        '@' and 'vs'.
+
+        Returns
+        -------
+        dict()
+            {phrase: [events in league json order]}
+        """
+        index = {}
+        for event in events:
+            name = ' '.join(event['name'].lower().split())
+            phrases = [name]
+            for team in re.split(r'\s+(?:@|vs\.?)\s+', name):
+                tokens = team.split()
+                for size in range(1, min(max_phrase_tokens, len(tokens)) + 1):
+                    phrases.extend([' '.join(tokens[i:i + size]) for i in range(0, len(tokens) - size + 1)])
+                phrases.append(' '.join(tokens))
+            
+            for phrase in set(phrases):
+                index.setdefault(phrase, []).append(event)
+        
+        return index
+    
+    def _get_event_token_index(self, sport, league):
+        # rebuilt only when a league fetch returns new event data
         events = self._get_data_from_league_json(sport, league, 'events', return_full=True)
-        found_game = [x for x in events if team.lower() in x['name'].lower()]
+        key = (sport.lower(), league.lower())
+        cached = self._event_indexes.get(key)
+        if cached is not None and cached[0] is events:
+            return events, cached[1]
+        
+        index = self._build_event_token_index(events)
+        self._event_indexes[key] = (events, index)
+        return events, index
+    
+    def _lookup_team_in_event_index(self, team, events, index):
+        team = ' '.join(team.lower().split())
+        team = self.team_aliases.get(team, team)
+        found_game = index.get(team)
+        if found_game is None:
+            # partial words (e.g. 'notre da') are not indexed, fall back to a substring scan
+            found_game = [x for x in events if team in x['name'].lower()]
+        
+        return found_game
+    
+    def _find_games_by_teams_from_events(self, sport, league, teams):
+        """
+        Batch version of self._find_game_by_team_from_events(). The league's event index is built once and every 
+        team is a dict lookup.
+
+        Returns
+        -------
+        dict()
+            {team: list of matching events}, the list is empty when the team was not found
+        """
+        events, index = self._get_event_token_index(sport, league)
+        return {team: self._lookup_team_in_event_index(team, events, index) for team in teams}
+    
+    def _find_game_by_team_from_events(self, sport, league, team):
+        found_game = self._find_games_by_teams_from_events(sport, league, [team])[team]
 
         if len(found_game) < 1:
             print(f"""ERROR: Could not find '{team}' in available {league} events. Try api.get_available_betting_events() 
@@ -349,6 +790,77 @@ class DkSportsbook():
         
         return found_game
     
+    def add_team_aliases(self, aliases):
+        """
+        Adds alternate team names for the methods with a team input.
+
+        Parameters
+        ----------
+        aliases : dict()
+            {alias: name as displayed on dk}
+        """
+        for alias, team in aliases.items():
+            self.team_aliases[' '.join(alias.lower().split())] = ' '.join(team.lower().split())
+    
+    def add_team_aliases_from_conversion(self, team_conversion, alias_provider, dk_provider, alias_team_type='long', 
+                                         dk_team_type='long', season='latest'):
+        """
+        Adds team aliases from a leagueData.TeamConversion object, so team names from another provider can be used 
+        as team input.
+
+        Parameters
+        ----------
+        team_conversion : leagueData.TeamConversion
+        alias_provider : str()
+            Provider whose team names will be accepted as input
+        dk_provider : str()
+            Provider whose team names match the names displayed on dk
+        alias_team_type : str(), optional
+            Team type for the alias provider, by default 'long'
+        dk_team_type : str(), optional
+            Team type for the dk provider, by default 'long'
+        season : str(), optional
+            Season of the team lists, by default 'latest'
+        """
+        alias_teams = team_conversion.get_team_list(alias_provider, alias_team_type, season=season)
+        dk_teams = team_conversion.get_team_list(dk_provider, dk_team_type, season=season)
+        self.add_team_aliases(dict(zip(alias_teams, dk_teams)))
+    
+    def get_events_for_teams(self, sport, league, teams):
+        """
+        Finds the events for many teams in one call.
+
+        Parameters
+        ----------
+        sport : str()
+        league : str()
+        teams : list()
+            Team names as displayed on dk (or aliases added with add_team_aliases()), for example ['lions', 'bears']
+
+        Returns
+        -------
+        dict()
+            {team: list of matching events}. The list is empty if the team was not found.
+        """
+        return self._find_games_by_teams_from_events(sport, league, teams)
+    
+    def _get_event_ids_for_game_filter(self, sport, league, game_filter):
+        """
+        Resolves a game filter (one team name or a list of team names) to a set of event ids. Returns None if no 
+        game was found.
+        """
+        if isinstance(game_filter, str):
+            game_filter = [game_filter]
+        
+        event_ids = set()
+        for team, found_game in self._find_games_by_teams_from_events(sport, league, game_filter).items():
+            if len(found_game) > 0:
+                event_ids.add(found_game[0]['id'])
+            else:
+                print(f"ERROR: Could not find '{team}' in available {league} events.")
+        
+        return event_ids if len(event_ids) > 0 else None
+    
     def _get_category_id_for_named_category(self, sport, league, named_category):
         categories = self._get_data_from_league_json(sport, league, 'categories', return_full=True)
         cat_id = self._get_category_id(categories, named_category)
@@ -359,7 +871,69 @@ class DkSportsbook():
         
         return cat_id
     
-    def _parse_gameline_selections_given_filters(self, event_id, markets, selections, team, filter_market, filter_team):
+    @staticmethod
+    def _index_category_data(data):
+        """
+        Builds a one pass index over a category response (markets and selections returned in a dk call) so 
+        parsers can join selections to their market and event with dict lookups.
+
+        Parameters
+        ----------
+        data : dict()
+            A category response with keys 'markets' and 'selections'
+
+        Returns
+        -------
+        dict()
+            {'markets': {marketId: market}, 'selectionsByEvent': {eventId: [selections in response order]}, 
+             'participantEvents': {participantId: eventId}}
+        """
+        markets = {}
+        for market in data.get('markets', []):
+            markets[market['id']] = market
+
+        selections_by_event = {}
+        participant_events = {}
+        for selection in data.get('selections', []):
+            try:
+                event_id = markets[selection['marketId']]['eventId']
+            except KeyError:
+                continue
+            selections_by_event.setdefault(event_id, []).append(selection)
+            for participant in selection.get('participants', []):
+                participant_events[participant['id']] = event_id
+
+        return {
+            "markets": markets,
+            "selectionsByEvent": selections_by_event,
+            "participantEvents": participant_events
+        }
+    
+    @staticmethod
+    def _filter_selections_by_events(selections, participant_events, event_ids):
+        """
+        Keeps the selections whose first participant plays in one of event_ids. Matching selections are returned 
+        as is (not copied).
+
+        Parameters
+        ----------
+        selections : list()
+        participant_events : dict()
+            'participantEvents' from self._index_category_data()
+        event_ids : set()
+        """
+        filtered = []
+        for selection in selections:
+            try:
+                participant_id = selection['participants'][0]['id']
+            except (KeyError, IndexError):
+                continue
+            if participant_events.get(participant_id) in event_ids:
+                filtered.append(selection)
+        
+        return filtered
+    
+    def _parse_gameline_selections_given_filters(self, event_id, category_index, team, filter_market, filter_team):
         """
         Selections retrieved when searching by game lines are categorized by a market id which may 
         not give enough information by itself (for example, for totals). Market id needs to be traced back to 
@@ -367,76 +941,41 @@ class DkSportsbook():
 
         Parameters
         ----------
-        event_id : _type_
+        event_id : str()
             Provide the event id you are looking for within the selections data
-        markets : _type_
-            The markets available in the dk data (returned in a dk call)
-        selections : _type_
-            selections available in the dk data (returned in a dk call)
-        team : _type_
+        category_index : dict()
+            Output of self._index_category_data() for the dk category response
+        team : str()
             Provide a team name in conjunction with filter_team to filter by team
-        filter_market : _type_
+        filter_market : str()
             Provide a market type to filter by. If None, market is ignored
         filter_team : bool()
             Instruction to filter team or not
         """
+        if filter_market is not None:
+            filter_market = filter_market.lower()
+
+        markets = category_index['markets']
         filtered_data = []
-        applicable_market_ids = [x['id'] for x in markets if x['eventId'] == event_id]
-        applicable_market_types = [x['name'] for x in markets if x['eventId'] == event_id]
-        for selection in selections:
-            if selection['marketId'] in applicable_market_ids:
-                selection['marketType'] = applicable_market_types[applicable_market_ids.index(selection['marketId'])]
-                if filter_market is not None:
-                    if selection['marketType'].lower() == filter_market.lower():
-                        filtered_data.append(selection.copy())
-                else:
-                    filtered_data.append(selection.copy())
+        for selection in category_index['selectionsByEvent'].get(event_id, []):
+            selection['marketType'] = markets[selection['marketId']]['name']
+            if filter_market is None or selection['marketType'].lower() == filter_market:
+                filtered_data.append(selection.copy())
 
         if filter_team:
             filtered_data = [x for x in filtered_data if team.lower() in x['label'].lower()]
 
         return filtered_data
     
-    def _parse_league_prop_selections_given_filters(self, league, category, prop_type_filter=None, game_filter=None):
-        selections = self.get_betting_selections_by_category('basketball', league, category)
-
-        game_filtered_selections = []
-        if game_filter is not None:
-            game = self._find_game_by_team_from_events('basketball', league, game_filter)
-            if game is None:
-                return []
-            
-            event_name = game[0]['name']
-            players = self.get_player_data_by_event('basketball', league, event_name)
-            player_ids = [x['id'] for x in players]
-            for selection in selections:
-                try:
-                    test_id = selection['participants'][0]['id']
-                    if test_id in player_ids:
-                        game_filtered_selections.append(selection.copy())
-                        
-                except KeyError:
-                    pass
-        else:
-            game_filtered_selections = selections
-
-        if prop_type_filter is not None:
-            prop_type_filter = prop_type_filter.lower()
-            final_selections = [x for x in game_filtered_selections if prop_type_filter.lower() in 
-                                x['outcomeType'].lower()]
-        else:
-            final_selections = game_filtered_selections
-            
-        return final_selections
-    
-    def _build_league_url_for_category(self, sport, league, category_string):
+    def _build_league_url_for_category(self, sport, league, category_string, sportsbook=None):
         # stuff for url
         cat_id = self._get_category_id_for_named_category(sport, league, category_string)
         league_id = self._get_league_id(sport, league)
+        sportsbook = self.sportsbook if sportsbook is None else sportsbook
 
         # call the api
         api_version = self._api_versions['groupVersion']
-        url = f"{self._base_url}/sportscontent/{self.sportsbook}/{api_version}/leagues/{league_id}/categories/{cat_id}"
+        url = f"{self._base_url}/sportscontent/{sportsbook}/{api_version}/leagues/{league_id}/categories/{cat_id}"
         
         return url
     
@@ -453,7 +992,7 @@ class DkSportsbook():
     def _get_event_market_data(self, event_id):
         api_version = self._api_versions['groupVersion']
         url = f"{self._base_url}/sportscontent/{self.sportsbook}/{api_version}/events/{event_id}/categories"
-        data = self._call_api(url, f'get markets for {event_id}')
+        data = self._call_category_api(url, f'get markets for {event_id}')
         return data
     
     def get_available_leagues(self, sport):
@@ -493,23 +1032,48 @@ class DkSportsbook():
         markets = self._get_data_from_league_json(sport, league, 'markets')
         return lC.return_unique_values(markets)
 
-    def get_betting_selections_by_category(self, sport, league, category):
+    def _get_category_data(self, sport, league, category):
         category = category.lower()
         league_json = self._get_json_for_league(sport, league)
         available = self.get_available_betting_categories(sport, league)
         if category not in available:
             print(f"""ERROR: '{category}' is not available for '{league}'. Use function 
                   get_available_betting_categories() to get valid input.""")
-            return []
+            return {}
         
         market_index = available.index(category)
         league_id = self._get_league_id(sport, league)
         cat_id = league_json['categories'][market_index]['id']
         api_version = self._api_versions['groupVersion']
         url = f"{self._base_url}/sportscontent/{self.sportsbook}/{api_version}/leagues/{league_id}/categories/{cat_id}"
-        selections = self._call_api(url, f'retrieve selections for {league} {category}')['selections']
+        return self._call_category_api(url, f'retrieve selections for {league} {category}')
+    
+    def get_betting_selections_by_category(self, sport, league, category, compact=False):
+        """
+        Returns every selection in a league betting category.
+
+        Parameters
+        ----------
+        sport : str()
+        league : str()
+        category : str()
+            Use get_available_betting_categories() for valid input
+        compact : bool, optional
+            If True, selections are returned as dkModels.DkSelection objects (slotted, interned strings) which use 
+            much less memory when many snapshots are kept, by default False and the dk dicts are returned.
+
+        Returns
+        -------
+        list()
+            Selections for the category
+        """
+        data = self._get_category_data(sport, league, category)
+        if data == {}:
+            return []
         
-        return selections
+        if compact:
+            return dkModels.compact_selections(data['selections'])
+        return data['selections']
     
     def get_event_data(self, sport, league, event):
         event = event.lower()
@@ -532,6 +1096,90 @@ class DkSportsbook():
         data = self._get_event_market_data(event_id)
         return [x['name'] for x in data['markets']]
     
+    def _get_slate_events(self, sport, league, game_filters):
+        events = self._get_data_from_league_json(sport, league, 'events', return_full=True)
+        if game_filters is None:
+            return events
+        
+        found_games = self._find_games_by_teams_from_events(sport, league, game_filters)
+        event_ids = set([x['id'] for found_game in found_games.values() for x in found_game])
+        return [x for x in events if x['id'] in event_ids]
+    
+    def _merge_event_category_data(self, events, event_data_list):
+        merged = {
+            "events": [{"id": x['id'], "name": x['name']} for x in events],
+            "markets": [],
+            "selections": []
+        }
+        for data in event_data_list:
+            merged['markets'].extend(data.get('markets', []))
+            merged['selections'].extend(data.get('selections', []))
+        
+        index = self._index_category_data(merged)
+        merged['marketsById'] = index['markets']
+        merged['selectionsByEvent'] = index['selectionsByEvent']
+        return merged
+
+    def get_event_category_data_for_slate(self, sport, league, category=None, game_filters=None):
+        """
+        Use this method to pull per event data (the data behind get_available_markets_by_event() or a sub category 
+        like 'td scorers') for every event on a slate at once. Event ids are resolved once from the league json and 
+        the per event requests are made through a bounded worker pool (max_workers) that shares the rate limit.
+
+        Parameters
+        ----------
+        sport : str()
+        league : str()
+        category : str(), optional
+            A category from get_available_betting_categories(), for example 'td scorers', by default None and all 
+            markets available for each event are retrieved.
+        game_filters : list(), optional
+            Team names to limit the slate to, by default None and every event is retrieved.
+
+        Returns
+        -------
+        dict()
+            Merged result with keys 'events' (id and name), 'markets', 'selections', 'marketsById' 
+            ({marketId: market}), and 'selectionsByEvent' ({eventId: [selections]}).
+        """
+        events = self._get_slate_events(sport, league, game_filters)
+
+        if category is not None:
+            cat_id = self._get_category_id_for_named_category(sport, league, category)
+            if cat_id is None:
+                return self._merge_event_category_data(events, [])
+            args_list = [(self._build_sub_category_event_url(x['id'], cat_id), 
+                          f"getting {category} for event: {x['id']}") for x in events]
+            event_data_list = self._run_concurrently(self._call_category_api, args_list)
+        else:
+            event_data_list = self._run_concurrently(self._get_event_market_data, [(x['id'],) for x in events])
+
+        return self._merge_event_category_data(events, event_data_list)
+    
+    def get_available_markets_for_slate(self, sport, league, game_filters=None):
+        """
+        Slate version of get_available_markets_by_event(). Retrieves the markets for every event concurrently.
+
+        Parameters
+        ----------
+        sport : str()
+        league : str()
+        game_filters : list(), optional
+            Team names to limit the slate to, by default None and every event is retrieved.
+
+        Returns
+        -------
+        dict()
+            {event name: [market names]}
+        """
+        slate = self.get_event_category_data_for_slate(sport, league, game_filters=game_filters)
+        markets_by_event = {x['id']: [] for x in slate['events']}
+        for market in slate['markets']:
+            if market.get('eventId') in markets_by_event:
+                markets_by_event[market['eventId']].append(market['name'])
+        
+        return {x['name']: markets_by_event[x['id']] for x in slate['events']}
+    
     def get_betting_selections_by_event_market(self, sport, league, event, event_market):
         event_data = self.get_event_data(sport, league, event)
         if event_data == {}:
@@ -572,6 +1220,52 @@ class DkSportsbook():
 
         return player_data
 
+    def _get_selection_differ(self, diff_key):
+        with self._cache_lock:
+            if diff_key not in self._diff_states:
+                self._diff_states[diff_key] = dkLineTracking.DkSelectionDiffer()
+            return self._diff_states[diff_key]
+        
+    @staticmethod
+    def _get_changes_for_failed_fetch(purpose):
+        # a failed call would otherwise be diffed as an empty board, reporting every selection as removed
+        print(f"ERROR: Could not {purpose}. The previous snapshot is kept and no changes are reported.")
+        return {"added": [], "removed": [], "changed": []}
+    
+    def reset_diff_state(self):
+        """
+        Clears the snapshots kept by the *_changes methods, so the next call reports every selection as added.
+        """
+        with self._cache_lock:
+            self._diff_states = {}
+    
+    def get_betting_selections_by_category_changes(self, sport, league, category):
+        """
+        Stateful version of get_betting_selections_by_category(). The previous result for the same sport, league, 
+        and category is kept in memory, and only selections that were added, removed, or had their odds or points 
+        change since the previous call are returned. The first call returns every selection as added.
+
+        Parameters
+        ----------
+        sport : str()
+        league : str()
+        category : str()
+            A category from get_available_betting_categories()
+
+        Returns
+        -------
+        dict()
+            {'added': [selections], 'removed': [selections], 'changed': [{'id', 'selection', 'oldOdds', 'newOdds', 
+            'oldPoints', 'newPoints'}]}. No changes are reported if the selections could not be retrieved.
+        """
+        data = self._get_category_data(sport, league, category)
+        if 'selections' not in data:
+            return self._get_changes_for_failed_fetch(f'retrieve selections for {league} {category}')
+        
+        selections = data['selections']
+        differ = self._get_selection_differ(('category', sport.lower(), league.lower(), category.lower()))
+        return differ.diff(selections)
+    
     def get_player_data_by_id(self, player_id):
         api_version = self._api_versions['playerVersion']
         url = f"{self._player_url}/{api_version}/players/{player_id}"
@@ -640,17 +1334,21 @@ class DkSportsbook():
             return []
         
         url = self._build_league_url_for_category(sport, league, 'game lines')
-        data = self._call_api(url, f'get game lines for {league}')
+        data = self._call_category_api(url, f'get game lines for {league}')
 
+        return self._parse_gamelines_for_league(sport, league, data, filter_market)
+    
+    def _parse_gamelines_for_league(self, sport, league, data, filter_market):
         event_data = self._get_data_from_league_json(sport, league, 'events', return_full=True)
         event_names = [x['name'] for x in event_data]
         event_ids = [x['id'] for x in event_data]
 
+        category_index = self._index_category_data(data)
         gamelines = []
         for index, event_id in enumerate(event_ids):
             event_name = event_names[index]
             applicable_selections = self._parse_gameline_selections_given_filters(
-                event_id, data['markets'], data['selections'], None, filter_market, None)
+                event_id, category_index, None, filter_market, None)
             gamelines.append(
                 {
                     "event": event_name,
@@ -660,6 +1358,264 @@ class DkSportsbook():
         
         return gamelines
     
+    def _run_concurrently(self, func, args_list):
+        if len(args_list) == 0:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(args_list))) as executor:
+            return list(executor.map(lambda args: func(*args), args_list))
+        
+    async def _run_concurrently_async(self, func, args_list):
+        if len(args_list) == 0:
+            return []
+        
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(args_list))) as executor:
+            tasks = [loop.run_in_executor(executor, func, *args) for args in args_list]
+            return await asyncio.gather(*tasks)
+        
+    def _get_league_sport_pairs(self, leagues):
+        pairs = []
+        for league in leagues:
+            league = league.lower()
+            sport = self._major_league_to_sport_mapping(league)
+            if sport is None:
+                self._print_major_league_not_supported_message(league)
+            pairs.append((sport, league))
+        
+        return pairs
+    
+    @staticmethod
+    def _drop_unresolved_sports(pairs, sports, sport_ids):
+        # leagues whose sport is not in dk's sport list are treated like unsupported leagues
+        resolved = {sport: sport_id for sport, sport_id in zip(sports, sport_ids) if sport_id is not None}
+        pairs = [(sport if sport in resolved else None, league) for sport, league in pairs]
+        supported = [x for x in pairs if x[0] is not None]
+        return pairs, supported, [(x,) for x in set(resolved.values())]
+    
+    @staticmethod
+    def _drop_unresolved_leagues(pairs, supported, league_ids):
+        # leagues missing from dk's league list for their sport are treated like unsupported leagues
+        unresolved = set([x[1] for x, league_id in zip(supported, league_ids) if league_id is None])
+        pairs = [(None if league in unresolved else sport, league) for sport, league in pairs]
+        return pairs, [x for x in pairs if x[0] is not None]
+
+    def _fetch_gamelines_for_league_data(self, sport, league):
+        """
+        Final stage of the multi league fetch. League json is cached by the time this is called, so the only 
+        network call is the game lines category call.
+        """
+        if self._get_league_id(sport, league) is None:
+            return {}
+        
+        url = self._build_league_url_for_category(sport, league, 'game lines')
+        return self._call_category_api(url, f'get game lines for {league}')
+    
+    def _compile_multi_league_gamelines(self, pairs, category_data, filter_market):
+        gamelines = {}
+        data_index = 0
+        for sport, league in pairs:
+            if sport is None:
+                gamelines[league] = []
+                continue
+            
+            data = category_data[data_index]
+            data_index = data_index + 1
+            if data == {}:
+                gamelines[league] = []
+            else:
+                gamelines[league] = self._parse_gamelines_for_league(sport, league, data, filter_market)
+        
+        return gamelines
+
+    def get_gamelines_for_leagues(self, leagues, filter_market=None):
+        """
+        Use this method to retrieve gamelines for several leagues at once. The league json and game line 
+        requests for every league are made concurrently (up to max_workers) while sharing the rate limit, 
+        so fetching all major leagues takes a fraction of the time of calling get_gamelines_for_league() for each.
+
+        Parameters
+        ----------
+        leagues : list()
+            The major sports leagues you want lines for. For example: ['nfl', 'nba', 'college football']. 
+            Use api.get_supported_major_sport_leagues() for a complete list.
+        filter_market : str(), optional
+            Use this parameter to return only certain gamelines, by default None. Valid options are: 'spread', 
+            'total', and 'moneyline'.
+
+        Returns
+        -------
+        dict()
+            Keyed by league, each value is the same output as get_gamelines_for_league(). Unsupported leagues 
+            return an empty list.
+        """
+        pairs = self._get_league_sport_pairs(leagues)
+        sports = lC.return_unique_values([x[0] for x in pairs if x[0] is not None])
+
+        # Sport ids, sport level league data, league ids then league json (all cached after first use), then the 
+        # game line categories
+        sport_ids = self._run_concurrently(self._get_sport_id, [(x,) for x in sports])
+        pairs, supported, sport_id_args = self._drop_unresolved_sports(pairs, sports, sport_ids)
+        self._run_concurrently(self._get_league_data_for_sport, sport_id_args)
+        league_ids = self._run_concurrently(self._get_league_id, supported)
+        pairs, supported = self._drop_unresolved_leagues(pairs, supported, league_ids)
+        self._run_concurrently(self._get_json_for_league, supported)
+        category_data = self._run_concurrently(self._fetch_gamelines_for_league_data, supported)
+
+        return self._compile_multi_league_gamelines(pairs, category_data, filter_market)
+    
+    async def get_gamelines_for_leagues_async(self, leagues, filter_market=None):
+        """
+        Asyncio version of get_gamelines_for_leagues(). The api calls run in a thread pool so they do not block 
+        the event loop.
+
+        Parameters
+        ----------
+        leagues : list()
+            The major sports leagues you want lines for. For example: ['nfl', 'nba', 'college football']. 
+        filter_market : str(), optional
+            Use this parameter to return only certain gamelines, by default None. Valid options are: 'spread', 
+            'total', and 'moneyline'.
+
+        Returns
+        -------
+        dict()
+            Keyed by league, each value is the same output as get_gamelines_for_league(). Unsupported leagues 
+            return an empty list.
+        """
+        pairs = self._get_league_sport_pairs(leagues)
+        sports = lC.return_unique_values([x[0] for x in pairs if x[0] is not None])
+
+        # the sport list may need to be fetched, so sport ids are resolved in the thread pool as well
+        sport_ids = await self._run_concurrently_async(self._get_sport_id, [(x,) for x in sports])
+        pairs, supported, sport_id_args = self._drop_unresolved_sports(pairs, sports, sport_ids)
+        await self._run_concurrently_async(self._get_league_data_for_sport, sport_id_args)
+        league_ids = await self._run_concurrently_async(self._get_league_id, supported)
+        pairs, supported = self._drop_unresolved_leagues(pairs, supported, league_ids)
+        await self._run_concurrently_async(self._get_json_for_league, supported)
+        category_data = await self._run_concurrently_async(self._fetch_gamelines_for_league_data, supported)
+
+        return self._compile_multi_league_gamelines(pairs, category_data, filter_market)
+    
+    def _call_book_category_api(self, sportsbook, endpoint, purpose):
+        # line history is only recorded for the default sportsbook, so books do not overwrite each other's lines
+        if sportsbook == self.sportsbook:
+            return self._call_category_api(endpoint, purpose)
+        return self._call_api(endpoint, purpose, decoder=self._get_category_decoder())
+    
+    def _fetch_category_data_by_book(self, sport, league, category_string, sportsbooks):
+        """
+        Resolves the category url once (with the default sportsbook's nav data) then retrieves it from every book 
+        concurrently. Returns {sportsbook: category data}.
+        """
+        sportsbooks = self.sportsbooks if sportsbooks is None else sportsbooks
+        args_list = [(x, self._build_league_url_for_category(sport, league, category_string, sportsbook=x), 
+                      f'get {category_string} for {league} from {x}') for x in sportsbooks]
+        category_data = self._run_concurrently(self._call_book_category_api, args_list)
+        
+        return dict(zip(sportsbooks, category_data))
+    
+    def get_betting_selections_by_category_for_books(self, sport, league, category, sportsbooks=None):
+        """
+        Multi book version of get_betting_selections_by_category(). The category is retrieved from every 
+        sportsbook concurrently.
+
+        Parameters
+        ----------
+        sport : str()
+        league : str()
+        category : str()
+            Use get_available_betting_categories() for valid input
+        sportsbooks : list(), optional
+            State sportsbook codes, by default None and the books provided at instantiation are used
+
+        Returns
+        -------
+        dict()
+            {sportsbook: list of selections}. A book that does not offer the category has an empty list.
+        """
+        category = category.lower()
+        if category not in self.get_available_betting_categories(sport, league):
+            print(f"""ERROR: '{category}' is not available for '{league}'. Use function 
+                  get_available_betting_categories() to get valid input.""")
+            return {}
+        
+        data_by_book = self._fetch_category_data_by_book(sport, league, category, sportsbooks)
+        return {book: data.get('selections', []) for book, data in data_by_book.items()}
+    
+    def get_gamelines_for_league_by_book(self, league, filter_market=None, sportsbooks=None):
+        """
+        Multi book version of get_gamelines_for_league(). The game lines are retrieved from every sportsbook 
+        concurrently, use dkLineTracking.get_price_differences_across_books() to compare them.
+
+        Parameters
+        ----------
+        league : str()
+            The major sports league you want lines for. Use api.get_supported_major_sport_leagues() for a complete 
+            list.
+        filter_market : str(), optional
+            'spread', 'total', or 'moneyline', by default None (all gamelines)
+        sportsbooks : list(), optional
+            State sportsbook codes, by default None and the books provided at instantiation are used
+
+        Returns
+        -------
+        dict()
+            {sportsbook: output of get_gamelines_for_league()}
+        """
+        sport = self._major_league_to_sport_mapping(league)
+        if sport is None:
+            self._print_major_league_not_supported_message(league)
+            return {}
+        
+        data_by_book = self._fetch_category_data_by_book(sport, league, 'game lines', sportsbooks)
+        gamelines = {}
+        for book, data in data_by_book.items():
+            gamelines[book] = [] if data == {} else self._parse_gamelines_for_league(sport, league, data, 
+                                                                                     filter_market)
+        
+        return gamelines
+    
+    def get_gamelines_for_league_changes(self, league, filter_market=None):
+        """
+        Stateful version of get_gamelines_for_league() for polling. The previous result for the league (and 
+        filter_market) is kept in memory, and only selections that were added, removed, or had their odds or 
+        points change since the previous call are returned. The first call returns every selection as added.
+
+        Parameters
+        ----------
+        league : str()
+            The major sports league you want lines for. ('nfl', 'college football', 'college basketball (m), etc.). 
+        filter_market : str(), optional
+            Use this parameter to return only certain gamelines, by default None. Valid options are: 'spread', 
+            'total', and 'moneyline'.
+
+        Returns
+        -------
+        dict()
+            {'added': [selections], 'removed': [selections], 'changed': [{'id', 'selection', 'oldOdds', 'newOdds', 
+            'oldPoints', 'newPoints'}]}. Each selection has an added 'event' key with the event name. No changes are 
+            reported if the game lines could not be retrieved.
+        """
+        sport = self._major_league_to_sport_mapping(league)
+        if sport is None:
+            self._print_major_league_not_supported_message(league)
+            return {"added": [], "removed": [], "changed": []}
+        
+        data = self._fetch_gamelines_for_league_data(sport, league)
+        if 'selections' not in data:
+            return self._get_changes_for_failed_fetch(f'retrieve game lines for {league}')
+        
+        gamelines = self._parse_gamelines_for_league(sport, league, data, filter_market)
+        selections = []
+        for gameline in gamelines:
+            for selection in gameline['selections']:
+                selection['event'] = gameline['event']
+                selections.append(selection)
+
+        differ = self._get_selection_differ(('gamelines', league.lower(), str(filter_market).lower()))
+        return differ.diff(selections)
+    
     def get_gamelines_for_game(self, league, team, filter_market=None, filter_team=False):
         """
         Use this method to retrieve all gamelines (spread, total, and moneylines) for a given game.
@@ -700,12 +1656,12 @@ class DkSportsbook():
 
         # call the api
         url = self._build_league_url_for_category(sport, league, 'game lines')
-        game_lines = self._call_api(url, f'retrieve {league} game lines')
+        game_lines = self._call_category_api(url, f'retrieve {league} game lines')
 
         # parse the result
         event_id = found_game[0]['id']
-        gameline_data = self._parse_gameline_selections_given_filters(event_id, game_lines['markets'], 
-                                                                      game_lines['selections'], 
+        gameline_data = self._parse_gameline_selections_given_filters(event_id, 
+                                                                      self._index_category_data(game_lines), 
                                                                       team, filter_market, filter_team)
 
         return gameline_data
@@ -748,12 +1704,12 @@ class DkSportsbook():
         
         # call the api
         url = self._build_league_url_for_category(sport, league, 'halves')
-        half_lines = self._call_api(url, f'retrieve {league} half lines')
+        half_lines = self._call_category_api(url, f'retrieve {league} half lines')
         
         # parse the result
         event_id = found_game[0]['id']
-        half_line_data = self._parse_gameline_selections_given_filters(event_id, half_lines['markets'], 
-                                                                       half_lines['selections'], 
+        half_line_data = self._parse_gameline_selections_given_filters(event_id, 
+                                                                       self._index_category_data(half_lines), 
                                                                        team, filter_market, filter_team)
 
         return half_line_data
@@ -770,9 +1726,10 @@ class DkSportsbook():
         prop_type_filter : str(), optional
             Use this filter to return only the type of touchdown prop you want, by default None and all available 
             selections are returned. Options are '2 or more', 'first', 'anytime'.
-        game_filter : str(), optional
+        game_filter : str() or list(), optional
             Use this filter to return only touchdown props for a given game, by default None and all available 
-            selections are returned. Input is one team name, for example: 'redskins'
+            selections are returned. Input is one team name, for example: 'redskins', or a list of team names 
+            to return props for several games.
 
         Returns
         -------
@@ -791,26 +1748,19 @@ class DkSportsbook():
                 print(f"ERROR: {prop_type_filter} is not a valid input. Must be '2 or more', 'first', or 'anytime'")
                 return []
         
-        selections = self.get_betting_selections_by_category('football', league, 'td scorers')
+        data = self._get_category_data('football', league, 'td scorers')
+        if data == {}:
+            return []
 
-        game_filtered_selections = []
         if game_filter is not None:
-            game = self._find_game_by_team_from_events('football', league, game_filter)
-            if game is None:
+            event_ids = self._get_event_ids_for_game_filter('football', league, game_filter)
+            if event_ids is None:
                 return []
-            event_name = game[0]['name']
-            players = self.get_player_data_by_event('football', league, event_name)
-            player_ids = [x['id'] for x in players]
-            
-            for selection in selections:
-                try:
-                    test_id = selection['participants'][0]['id']
-                    if test_id in player_ids:
-                        game_filtered_selections.append(selection.copy())
-                except KeyError:
-                    pass
+            participant_events = self._index_category_data(data)['participantEvents']
+            game_filtered_selections = self._filter_selections_by_events(data['selections'], participant_events, 
+                                                                         event_ids)
         else:
-            game_filtered_selections = selections
+            game_filtered_selections = data['selections']
         
         if prop_type_filter is not None:
             final_selections = [x for x in game_filtered_selections if prop_type_filter.lower() in 
@@ -850,22 +1800,56 @@ class DkSportsbook():
             return []
         cat_id = self._get_category_id_for_named_category('football', league, 'td scorers')
         url = self._build_sub_category_event_url(game[0]['id'], cat_id)
-        data = self._call_api(url, f"getting td scorers for event: {game[0]['id']}")
+        data = self._call_category_api(url, f"getting td scorers for event: {game[0]['id']}")
 
-        market_ids = [x['id'] for x in data['markets']]
-        market_names = [x['name'] for x in data['markets']]
+        markets = self._index_category_data(data)['markets']
         
         props = []
         for selection in data['selections']:
-            market_index = market_ids.index(selection['marketId'])
-            market_name = market_names[market_index]
+            market_name = markets[selection['marketId']]['name']
             props.append({
                 "name": market_name,
-                "selection": selection.copy()
+                "selection": selection
             })
         
         return props
     
+    def get_all_touchdown_props_for_slate(self, league, game_filters=None):
+        """
+        Slate version of get_all_touchdown_props_for_game(). Every event's td scorer props are retrieved 
+        concurrently in one call.
+
+        Parameters
+        ----------
+        league : str()
+            'nfl' or 'college football'
+        game_filters : list(), optional
+            Team names to limit the slate to, by default None and every event is retrieved.
+
+        Returns
+        -------
+        dict()
+            {event name: list of td selection dicts with key 'name' and the corresponding 'selection'}. The 
+            per event lists match the output of get_all_touchdown_props_for_game().
+        """
+        league = league.lower()
+        if league != 'nfl' and league != 'college football':
+            print("ERROR: league parameter must be 'college football' or 'nfl'")
+            return {}
+        
+        slate = self.get_event_category_data_for_slate('football', league, category='td scorers', 
+                                                       game_filters=game_filters)
+        props = {}
+        for event in slate['events']:
+            props[event['name']] = [
+                {
+                    "name": slate['marketsById'][x['marketId']]['name'],
+                    "selection": x
+                } for x in slate['selectionsByEvent'].get(event['id'], [])
+            ]
+        
+        return props
+    
     def get_spread_for_team(self, league, team):
         """
         Use this method to return a simple dict containing the spread and the spread odds.
@@ -901,98 +1885,103 @@ class DkSportsbook():
         else:
             return {}
 
-    def get_player_three_props(self, league='college basketball (m)', game_filter=None):
-        if league.lower() != 'college basketball (m)' and league != "nba":
-            print("ERROR: league parameter must be 'college basketball (m)', NBA not supported yet")
+    def get_player_props(self, league, categories, game_filter=None):
+        """
+        Use this method to build a prop board for several player prop categories at once. Shared ids (league, 
+        categories, and the game filter's events) are resolved once and the categories are retrieved 
+        concurrently. Game filtering uses a participant to event index built from each category response.
+
+        Parameters
+        ----------
+        league : str()
+            A major sports league, for example 'nba' or 'college basketball (m)'. Use 
+            api.get_supported_major_sport_leagues() for a complete list.
+        categories : list()
+            Prop categories as listed in get_available_betting_categories(), for example 
+            ['player points', 'player rebounds', 'player assists', 'player threes']
+        game_filter : str() or list(), optional
+            Use this filter to return only props for a given game, by default None and all available 
+            selections are returned. Input is one team name, for example: 'celtics', or a list of team names to 
+            return props for several games.
+
+        Returns
+        -------
+        list()
+            One row per selection with keys 'category', 'player', 'playerId', 'line', 'points', 'outcomeType', 
+            and 'odds'.
+        """
+        sport = self._major_league_to_sport_mapping(league)
+        if sport is None:
+            self._print_major_league_not_supported_message(league)
             return []
         
-        filtered_selections = self._parse_league_prop_selections_given_filters(league, 
-                                                                               'player threes', 
-                                                                               prop_type_filter=None, 
-                                                                               game_filter=game_filter)
-        final_selections = []
-        for prop in filtered_selections:
-            player = prop['participants'][0]['name']
-            threes = prop['label']
-            odds = prop['displayOdds'].copy()
-            final_selections.append(
-                {
-                    "player": player,
-                    "line": threes,
-                    "odds": odds
-                }
-            )
+        categories = [x.lower() for x in categories]
+        league_categories = self._get_data_from_league_json(sport, league, 'categories', return_full=True)
+        league_id = self._get_league_id(sport, league)
+        api_version = self._api_versions['groupVersion']
         
-        return final_selections
+        valid_categories = []
+        args_list = []
+        for category in categories:
+            cat_id = self._get_category_id(league_categories, category)
+            if cat_id is None:
+                print(f"""ERROR: '{category}' is not available for '{league}'. Use function 
+                  get_available_betting_categories() to get valid input.""")
+                continue
+            valid_categories.append(category)
+            url = f"{self._base_url}/sportscontent/{self.sportsbook}/{api_version}/leagues/{league_id}/categories/{cat_id}"
+            args_list.append((url, f'retrieve selections for {league} {category}'))
+
+        event_ids = None
+        if game_filter is not None:
+            event_ids = self._get_event_ids_for_game_filter(sport, league, game_filter)
+            if event_ids is None:
+                return []
+
+        category_data = self._run_concurrently(self._call_category_api, args_list)
+
+        rows = []
+        for index, category in enumerate(valid_categories):
+            selections = category_data[index].get('selections', [])
+            if event_ids is not None:
+                participant_events = self._index_category_data(category_data[index])['participantEvents']
+                selections = self._filter_selections_by_events(selections, participant_events, event_ids)
+            
+            for selection in selections:
+                try:
+                    participant = selection['participants'][0]
+                except (KeyError, IndexError):
+                    continue
+                rows.append(
+                    {
+                        "category": category,
+                        "player": participant['name'],
+                        "playerId": participant['id'],
+                        "line": selection['label'],
+                        "points": selection.get('points'),
+                        "outcomeType": selection.get('outcomeType'),
+                        "odds": selection['displayOdds']
+                    }
+                )
+        
+        return rows
     
-    def get_player_points_props(self, league='college basketball (m)', game_filter=None):
+    def _get_single_player_prop_category(self, league, category, game_filter):
         if league.lower() != 'college basketball (m)' and league != "nba":
             print("ERROR: league parameter must be 'college basketball (m)', NBA not supported yet")
             return []
         
-        filtered_selections = self._parse_league_prop_selections_given_filters(league, 
-                                                                               'player points', 
-                                                                               prop_type_filter=None, 
-                                                                               game_filter=game_filter)
-        final_selections = []
-        for prop in filtered_selections:
-            player = prop['participants'][0]['name']
-            threes = prop['label']
-            odds = prop['displayOdds'].copy()
-            final_selections.append(
-                {
-                    "player": player,
-                    "line": threes,
-                    "odds": odds
-                }
-            )
-        
-        return final_selections
+        rows = self.get_player_props(league, [category], game_filter=game_filter)
+        return [{"player": x['player'], "line": x['line'], "odds": x['odds']} for x in rows]
+
+    def get_player_three_props(self, league='college basketball (m)', game_filter=None):
+        return self._get_single_player_prop_category(league, 'player threes', game_filter)
+    
+    def get_player_points_props(self, league='college basketball (m)', game_filter=None):
+        return self._get_single_player_prop_category(league, 'player points', game_filter)
 
     def get_player_assists_props(self, league='college basketball (m)', game_filter=None):
-        if league.lower() != 'college basketball (m)' and league != "nba":
-            print("ERROR: league parameter must be 'college basketball (m)', NBA not supported yet")
-            return []
-        
-        filtered_selections = self._parse_league_prop_selections_given_filters(league, 
-                                                                               'player assists', 
-                                                                               prop_type_filter=None, 
-                                                                               game_filter=game_filter)
-        final_selections = []
-        for prop in filtered_selections:
-            player = prop['participants'][0]['name']
-            threes = prop['label']
-            odds = prop['displayOdds'].copy()
-            final_selections.append(
-                {
-                    "player": player,
-                    "line": threes,
-                    "odds": odds
-                }
-            )
-        
-        return final_selections
+        return self._get_single_player_prop_category(league, 'player assists', game_filter)
     
     def get_player_rebound_props(self, league='college basketball (m)', game_filter=None):
-        if league.lower() != 'college basketball (m)' and league != "nba":
-            print("ERROR: league parameter must be 'college basketball (m)', NBA not supported yet")
-            return []
-        
-        filtered_selections = self._parse_league_prop_selections_given_filters(league, 
-                                                                               'player rebounds', 
-                                                                               prop_type_filter=None, 
-                                                                               game_filter=game_filter)
-        final_selections = []
-        for prop in filtered_selections:
-            player = prop['participants'][0]['name']
-            threes = prop['label']
-            odds = prop['displayOdds'].copy()
-            final_selections.append(
-                {
-                    "player": player,
-                    "line": threes,
-                    "odds": odds
-                }
-            )
-        
-        return final_selections
+        return self._get_single_player_prop_category(league, 'player rebounds', game_filter)
@@ -7,8 +7,8 @@ from lukhed_basic_utils import fileCommon as fC
 from lukhed_basic_utils import stringCommon as sC
 from lukhed_basic_utils import listWorkCommon as lC
 from lukhed_sports.leagueData import TeamConversion, advanced_player_search
+from lukhed_sports import apiTools
 import re
-import json
 
 
 class EspnNflStats():
@@ -137,7 +137,7 @@ class EspnNflStats():
         script_content = str(script_tag.string)
         # Use regular expressions to extract the dictionary inside window['__espnfitt__']
         match = re.search(r'window\[\'__espnfitt__\'\]\s*=\s*(\{.*?\});', script_content)
-        return json.loads(match.group(1))
+        return apiTools.loads_json(match.group(1))
 
     ################################
     # General Helpers
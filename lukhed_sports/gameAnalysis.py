@@ -1,4 +1,5 @@
 from lukhed_basic_utils import mathCommon as mC
+import numpy as np
 
 
 def grade_wager_side(pick_score, opp_score, pick_spread):
@@ -57,6 +58,137 @@ def grade_wager_moneyline(pick_score, opp_score):
         return "push"
 
 
+###############################
+# Batch grading
+###############################
+def _parse_float_or_nan(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError, OverflowError):
+        return np.nan
+
+
+def _parse_int_or_nan(value):
+    try:
+        return float(int(value))
+    except (ValueError, TypeError, OverflowError):
+        return np.nan
+
+
+def _parse_spread_or_nan(value):
+    return _parse_float_or_nan(convert_spread_to_float(value))
+
+
+def _parse_column(values, parse_element):
+    # numeric arrays are converted directly, anything else (strings, None, mixed) is parsed element by element
+    array = np.asarray(values)
+    if array.dtype.kind in 'biuf':
+        return array.astype(np.float64)
+    if not isinstance(values, np.ndarray):
+        # mixed lists would otherwise be coerced to strings by numpy
+        array = np.asarray(values, dtype=object)
+    parsed = [parse_element(x) for x in array.ravel().tolist()]
+    return np.array(parsed, dtype=np.float64).reshape(array.shape)
+
+
+def _parse_int_column(values):
+    array = np.asarray(values)
+    if array.dtype.kind in 'biuf':
+        array = array.astype(np.float64)
+        with np.errstate(invalid='ignore'):
+            return np.where(np.isfinite(array), np.trunc(array), np.nan)
+    return _parse_column(values, _parse_int_or_nan)
+
+
+def _parse_total_side(value):
+    if not isinstance(value, str):
+        return np.nan
+    value = value.lower()
+    if value == 'over':
+        return 1
+    elif value == 'under':
+        return -1
+    return 0
+
+
+def grade_wager_side_batch(pick_scores, opp_scores, pick_spreads):
+    """
+    Array version of grade_wager_side().
+
+    Parameters
+    ----------
+    pick_scores : list or np.ndarray
+    opp_scores : list or np.ndarray
+    pick_spreads : list or np.ndarray
+        Spreads for the picked side, strings like 'pk' or 'ev' are accepted (see convert_spread_to_float())
+
+    Returns
+    -------
+    tuple
+        (grades, margins) as float arrays. Grades are 1 (win), -1 (loss), 0 (push) like convert_result_to_int(). 
+        Both are nan where grade_wager_side() returns "error".
+    """
+    pick_scores = _parse_column(pick_scores, _parse_float_or_nan)
+    opp_scores = _parse_column(opp_scores, _parse_float_or_nan)
+    pick_spreads = _parse_column(pick_spreads, _parse_spread_or_nan)
+
+    with np.errstate(invalid='ignore'):
+        margins = pick_scores + pick_spreads - opp_scores
+        return np.sign(margins), margins
+
+
+def grade_wager_total_batch(away_scores, home_scores, total_lines, total_bets):
+    """
+    Array version of grade_wager_total().
+
+    Parameters
+    ----------
+    away_scores : list or np.ndarray
+    home_scores : list or np.ndarray
+    total_lines : list or np.ndarray
+    total_bets : list, np.ndarray, or str
+        'over' or 'under' for each bet (or one value for every bet)
+
+    Returns
+    -------
+    tuple
+        (grades, margins) as float arrays. Grades are 1 (win), -1 (loss), 0 (push). Margins are the total minus the 
+        line. Both are nan for scores or lines that can not be parsed, grades are nan for bets that are not 
+        strings.
+    """
+    away_scores = _parse_column(away_scores, _parse_float_or_nan)
+    home_scores = _parse_column(home_scores, _parse_float_or_nan)
+    total_lines = _parse_column(total_lines, _parse_float_or_nan)
+    sides = _parse_column(np.asarray(total_bets, dtype=object), _parse_total_side)
+
+    margins = away_scores + home_scores - total_lines
+    margins, sides = np.broadcast_arrays(margins, sides)
+    with np.errstate(invalid='ignore'):
+        wins = ((sides == -1) & (margins < 0)) | ((sides == 1) & (margins > 0))
+        grades = np.where(wins, 1.0, -1.0)
+        grades = np.where(np.isnan(sides), np.nan, grades)
+        grades = np.where(margins == 0, 0.0, grades)
+        grades = np.where(np.isnan(margins), np.nan, grades)
+        margins = np.where(margins == 0, 0.0, margins)
+
+    return grades, margins
+
+
+def grade_wager_moneyline_batch(pick_scores, opp_scores):
+    """
+    Array version of grade_wager_moneyline(). Scores are parsed like int(), so float scores are truncated and 
+    strings must be whole numbers.
+
+    Returns
+    -------
+    tuple
+        (grades, margins) as float arrays. Grades are 1 (win), -1 (loss), 0 (push), margins are pick score minus 
+        opponent score. Both are nan where grade_wager_moneyline() returns "n/a".
+    """
+    margins = _parse_int_column(pick_scores) - _parse_int_column(opp_scores)
+    return np.sign(margins), margins
+
+
 def calculate_unit_profit(odds, units, grade):
     # odds is -110 or 200, integer
     # units is number of units wagered, float
@@ -83,20 +215,74 @@ def calculate_unit_profit_given_record(record_string, odds=-110, units=1, round_
     total_wins = get_wins_given_record(record_string)
     total_losses = get_losses_given_record(record_string)
 
-    i = 0
     sum_units = 0
-    while i < total_wins:
-        sum_units = sum_units + calculate_unit_profit(odds, units, "w")
-        i = i + 1
-
-    i = 0
-    while i < total_losses:
-        sum_units = sum_units + calculate_unit_profit(odds, units, "l")
-        i = i + 1
+    if total_wins > 0:
+        sum_units = sum_units + total_wins * calculate_unit_profit(odds, units, "w")
+    if total_losses > 0:
+        sum_units = sum_units + total_losses * calculate_unit_profit(odds, units, "l")
 
     return mC.pretty_round_function(sum_units, round_num)
 
 
+def _parse_record_or_nan(record):
+    try:
+        return [get_wins_given_record(record), get_losses_given_record(record)]
+    except (ValueError, TypeError, IndexError, AttributeError):
+        return [np.nan, np.nan]
+
+
+def calculate_unit_profit_given_records(records, odds=-110, units=1, round_num=2):
+    """
+    Batch version of calculate_unit_profit_given_record() for many records at once (e.g. a leaderboard of 
+    handicappers).
+
+    Parameters
+    ----------
+    records : list or np.ndarray
+        Record strings in the format "wins-losses-pushes", or counts of shape (n, 2) or (n, 3) as a numeric array 
+        or nested lists (e.g. [[10, 5, 0], [3, 7, 1]])
+    odds : int or list, optional
+        Odds for every record or one value per record, by default -110
+    units : float or list, optional
+        Units wagered per bet for every record or one value per record, by default 1
+    round_num : int, optional
+        The number of decimal places to round to, by default 2
+
+    Returns
+    -------
+    np.ndarray
+        Unit profit for each record, nan for records or odds that could not be parsed
+
+    Raises
+    ------
+    ValueError
+        If records are counts that are not of shape (n, 2) or (n, 3)
+    """
+    record_values = np.asarray(records, dtype=object).ravel().tolist()
+    if len(record_values) > 0 and not any([isinstance(x, str) or x is None for x in record_values]):
+        # counts, either as an array or nested lists
+        try:
+            counts = np.asarray(records, dtype=np.float64)
+        except (ValueError, TypeError):
+            counts = None
+        if counts is None or counts.ndim != 2 or counts.shape[1] not in (2, 3):
+            raise ValueError("Invalid records. Use record strings or counts of shape (n, 2) or (n, 3).")
+    else:
+        counts = np.array([_parse_record_or_nan(x) for x in record_values], dtype=np.float64).reshape(-1, 2)
+    wins = counts[:, 0]
+    losses = counts[:, 1]
+
+    # scalar odds and units apply to every record
+    odds = np.broadcast_to(np.atleast_1d(_parse_int_column(odds)), wins.shape)
+    units = np.broadcast_to(np.atleast_1d(_parse_column(units, _parse_float_or_nan)), wins.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_units = _round_array(np.where(odds < 0, np.abs(100 / odds) * units, odds / 100 * units), 2)
+        # like calculate_unit_profit_given_record(), the odds only matter if there are wins or losses
+        win_units = np.where(wins > 0, win_units, 0)
+        loss_units = np.where(losses > 0, units, 0)
+        return _round_array(wins * win_units - losses * loss_units, round_num)
+
+
 def calculate_odd_move(start_odd, end_odd, odd_type="spread"):
     """
     Calculates and returns the odd move
@@ -256,6 +442,65 @@ def calculate_ats_data_for_game(away_score, home_score, home_spread, total):
     return op_dict
 
 
+def _label_signs(values, labels):
+    # labels are for negative, zero, positive and nan values
+    labels = np.array(labels)
+    with np.errstate(invalid='ignore'):
+        codes = np.sign(values) + 1
+    codes = np.where(np.isnan(codes), 3, codes).astype(np.intp)
+    return labels[codes]
+
+
+def calculate_ats_data_for_games(away_scores, home_scores, home_spreads, totals):
+    """
+    Columnar version of calculate_ats_data_for_game() for many games at once (e.g. full schedules).
+
+    Parameters
+    ----------
+    away_scores : list or np.ndarray
+    home_scores : list or np.ndarray
+    home_spreads : list or np.ndarray
+    totals : list or np.ndarray
+
+    Returns
+    -------
+    dict()
+        Same keys as calculate_ats_data_for_game(), each an array with one value per game. Numeric columns are 
+        floats with nan where the single game function returns "n/a". winner, atsWinner, awayAtsGrade, 
+        homeAtsGrade and totalGrade are string arrays with the same values as the single game function. Can be 
+        passed to pandas.DataFrame() directly.
+    """
+    away_scores = _parse_int_column(away_scores)
+    home_scores = _parse_int_column(home_scores)
+    home_spreads = _parse_column(home_spreads, _parse_float_or_nan)
+    totals = _parse_column(totals, _parse_float_or_nan)
+    away_scores, home_scores, home_spreads, totals = np.broadcast_arrays(away_scores, home_scores, home_spreads, 
+                                                                         totals)
+
+    home_win_by = home_scores - away_scores
+    home_cover_by = home_win_by + home_spreads
+    total_cover_by = home_scores + away_scores - totals
+
+    return {
+        "awayScore": away_scores,
+        "homeScore": home_scores,
+        "homeSpread": home_spreads,
+        "total": totals,
+        "winner": _label_signs(home_win_by, ["away", "tie", "home", "n/a"]),
+        "atsWinner": _label_signs(home_cover_by, ["away", "tie", "home", "n/a"]),
+        "homeWinBy": home_win_by,
+        "awayWinBy": -home_win_by,
+        "awayAtsGrade": _label_signs(home_cover_by, ["win", "push", "loss", "n/a"]),
+        "homeAtsGrade": _label_signs(home_cover_by, ["loss", "push", "win", "n/a"]),
+        "awayCoverBy": -home_cover_by,
+        "homeCoverBy": home_cover_by,
+        "totalGrade": _label_signs(total_cover_by, ["under", "push", "over", "n/a"]),
+        "overCoverBy": total_cover_by,
+        "underCoverBy": -total_cover_by,
+        "totalCoverBy": total_cover_by
+    }
+
+
 def add_to_record(result, record="0-0-0"):
     """
     Creates a record based on input
@@ -427,12 +672,113 @@ def convert_result_list_into_int_result_list(result_list):
 
 
 def convert_result_list_into_streak_list(result_list):
+    """
+    Takes a result list where the most recent results are at the end of the list, and returns the streak going into 
+    each result (the first value is always 0).
+    :param result_list: list(), list of outcomes [loss, win, push, win, loss] etc.
+    :return: list(), streak before each result, e.g. [0, -1, 1, 0, 1]
+    """
+
+    streak_list = calculate_streak_data(result_list)["streakList"]
+    if len(streak_list) == 0:
+        return streak_list
+    elif isinstance(streak_list, np.ndarray):
+        return np.concatenate(([0], streak_list[:-1]))
+    else:
+        return [0] + streak_list[:-1]
+
+
+def _get_streak_data_for_codes(codes):
+    # runs of equal codes, each value is its position in the run times the code
+    n = len(codes)
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = codes[1:] != codes[:-1]
+    start_index = np.flatnonzero(starts)
+    run_lengths = np.diff(np.append(start_index, n))
+    run_codes = codes[start_index]
+    positions = np.arange(n) - np.repeat(start_index, run_lengths) + 1
+    wins = run_lengths[run_codes > 0]
+    losses = run_lengths[run_codes < 0]
+
+    return {
+        "streakList": positions * codes,
+        "longestWinStreak": int(wins.max()) if len(wins) > 0 else 0,
+        "longestLossStreak": int(losses.max()) if len(losses) > 0 else 0,
+        "currentStreak": int(run_lengths[-1] * run_codes[-1]),
+        "currentStreakLength": int(run_lengths[-1]),
+        "currentStreakStart": int(start_index[-1])
+    }
+
+
+def calculate_streak_data(results):
+    """
+    Single pass streak calculation for a result history where the most recent results are at the end.
+
+    Parameters
+    ----------
+    results : list, np.ndarray, or iterable
+        Results as strings (win, loss, push, w, l, p, etc.) or ints (1 win, -1 loss, 0 push). Any iterable works, 
+        so results can be streamed from a generator. NumPy int arrays are handled with array operations.
+
+    Returns
+    -------
+    dict()
+        streakList: streak after each result, like convert_result_list_into_streak() for each prefix (np.ndarray 
+        for NumPy input, list otherwise)
+        longestWinStreak: int(), games in the longest winning streak
+        longestLossStreak: int(), games in the longest losing streak
+        currentStreak: int(), same as convert_result_list_into_streak() for all results
+        currentStreakLength: int(), games in the current streak (counts pushes for a push streak)
+        currentStreakStart: int() or None, index of the first result in the current streak
+    """
+    if isinstance(results, np.ndarray) and results.dtype.kind in 'biu':
+        if len(results) == 0:
+            return {"streakList": np.zeros(0, dtype=np.int64), "longestWinStreak": 0, "longestLossStreak": 0, 
+                    "currentStreak": 0, "currentStreakLength": 0, "currentStreakStart": None}
+        return _get_streak_data_for_codes(results.astype(np.int64))
+
     streak_list = []
-    i = 0
-    while i < len(result_list):
-        streak_list.append(convert_result_list_into_streak(result_list[0:i]))
-        i = i + 1
-    return streak_list
+    longest_win = 0
+    longest_loss = 0
+    run_key = None
+    run_length = 0
+    run_start = None
+    streak = 0
+    for i, result in enumerate(results):
+        # like convert_result_list_into_streak(), a streak continues while the same result string repeats
+        if isinstance(result, str):
+            key = result.lower()
+        else:
+            key = int(result)
+
+        if run_length > 0 and key == run_key:
+            run_length = run_length + 1
+        else:
+            run_key = key
+            run_length = 1
+            run_start = i
+
+        code = convert_result_to_int(key) if isinstance(key, str) else key
+        if isinstance(code, str):
+            # invalid result, keep the error message
+            streak = code
+        else:
+            streak = code * run_length
+            if code > 0:
+                longest_win = max(longest_win, run_length)
+            elif code < 0:
+                longest_loss = max(longest_loss, run_length)
+
+        streak_list.append(streak)
+
+    return {
+        "streakList": streak_list,
+        "longestWinStreak": longest_win,
+        "longestLossStreak": longest_loss,
+        "currentStreak": streak,
+        "currentStreakLength": run_length,
+        "currentStreakStart": run_start
+    }
 
 
 def count_outcomes_in_result_list(result_list, outcome_type):
@@ -769,6 +1115,244 @@ def convert_odds_format(odds, input_format, output_format):
     else:
         return "Invalid output format"
 
+def _convert_decimal_odds_to_american_array(decimal_odds):
+    decimal_odds = np.asarray(decimal_odds, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(decimal_odds >= 2.0, (decimal_odds - 1) * 100, -100 / (decimal_odds - 1))
+
+
+# Integer american odds covered by the lookup tables in convert_odds_format_batch()
+_american_odds_table_range = (-20000, 20000)
+_american_odds_tables = {}
+
+
+def _round_array(values, digits):
+    # np.round can differ from round() for values close to a half, those are rounded with round()
+    values = np.asarray(values, dtype=np.float64)
+    flat_values = values.reshape(-1)
+    rounded = np.round(flat_values, digits)
+    with np.errstate(invalid='ignore'):
+        scaled = flat_values * 10.0 ** digits
+        near_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = [round(x, digits) for x in flat_values[near_half].tolist()]
+    return rounded.reshape(values.shape)
+
+
+def _normalize_odds_format(odds_format):
+    odds_format = odds_format.lower().replace('_', ' ')
+    if odds_format not in ['american', 'decimal', 'fractional', 'implied probability']:
+        raise ValueError(f"Invalid odds format '{odds_format}'")
+    return odds_format
+
+
+def _parse_american_odds_or_nan(value):
+    # dk american odds use a unicode minus
+    return _parse_float_or_nan(str(value).replace('−', '-'))
+
+
+def _parse_fractional_odds_or_nan(value):
+    try:
+        num, denom = map(int, str(value).split('/'))
+        return num / denom + 1
+    except (ValueError, ZeroDivisionError):
+        return np.nan
+
+
+def _convert_american_odds_to_decimal_array(american_odds):
+    # 0 is not a valid american price, mask it so it does not come out as inf
+    american_odds = np.where(american_odds == 0, np.nan, american_odds)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _round_array(np.where(american_odds > 0, american_odds / 100 + 1, 100 / np.abs(american_odds) + 1), 6)
+
+
+def _convert_odds_to_decimal_array(odds, input_format):
+    if input_format == 'american':
+        return _convert_american_odds_to_decimal_array(_parse_column(odds, _parse_american_odds_or_nan))
+    elif input_format == 'decimal':
+        return _round_array(_parse_column(odds, _parse_float_or_nan), 6)
+    elif input_format == 'fractional':
+        return _round_array(_parse_column(np.asarray(odds, dtype=object), _parse_fractional_odds_or_nan), 6)
+    else:
+        probabilities = _parse_column(odds, _parse_float_or_nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where((probabilities > 0) & (probabilities < 1), 1 / probabilities, np.nan)
+
+
+def _convert_decimal_odds_array(decimal_odds, output_format):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if output_format == 'decimal':
+            return _round_array(decimal_odds, 3)
+        elif output_format == 'american':
+            american = np.rint(_convert_decimal_odds_to_american_array(decimal_odds))
+            return np.where(np.isfinite(american), american, np.nan)
+        elif output_format == 'implied probability':
+            return _round_array(1 / decimal_odds, 4)
+
+        # fractional, profit per 1000 reduced by the gcd
+        valid = np.isfinite(decimal_odds)
+        numerators = np.rint(np.where(valid, decimal_odds - 1, 0) * 1000).astype(np.int64)
+        divisors = np.gcd(numerators, 1000)
+        numerators = numerators // divisors
+        denominators = 1000 // divisors
+        numerators = np.where(numerators == 0, 0, numerators)
+        denominators = np.where(numerators == 0, 1, denominators)
+        fractions = np.empty(decimal_odds.shape, dtype=object)
+        fractions.ravel()[:] = [f"{h}/{k}" if v else None for h, k, v in 
+                                zip(numerators.ravel().tolist(), denominators.ravel().tolist(), valid.ravel().tolist())]
+        return fractions
+
+
+def _get_american_odds_table(output_format):
+    # built on first use for each output format
+    if output_format not in _american_odds_tables:
+        low, high = _american_odds_table_range
+        decimal_odds = _convert_american_odds_to_decimal_array(np.arange(low, high + 1, dtype=np.float64))
+        _american_odds_tables[output_format] = _convert_decimal_odds_array(decimal_odds, output_format)
+    return _american_odds_tables[output_format]
+
+
+def convert_odds_format_batch(odds, input_format, output_format):
+    """
+    Array version of convert_odds_format(). Integer american odds between -20000 and +20000 are converted with a 
+    precomputed lookup table, other values are converted with array operations.
+
+    Parameters
+    ----------
+    odds : list or np.ndarray
+        The odds values to convert. American odds can be numbers or strings ('+150', '-110', dk '−110')
+    input_format : str
+        'american', 'decimal', 'fractional', or 'implied probability' ('implied_probability' also works)
+    output_format : str
+        Same options as input_format
+
+    Returns
+    -------
+    np.ndarray
+        Float array for american, decimal, and implied probability output (american odds are numbers, 150.0 for 
+        '+150'), with nan for odds that could not be converted. Object array of 'h/k' strings for fractional output, 
+        with None for odds that could not be converted. Values are rounded like convert_odds_format().
+
+    Raises
+    ------
+    ValueError
+        If input_format or output_format is not a supported format
+    """
+    input_format = _normalize_odds_format(input_format)
+    output_format = _normalize_odds_format(output_format)
+
+    if input_format == output_format == 'fractional':
+        return np.array(odds, dtype=object)
+    elif input_format == output_format:
+        parse_element = _parse_american_odds_or_nan if input_format == 'american' else _parse_float_or_nan
+        return _parse_column(odds, parse_element)
+
+    if input_format != 'american':
+        return _convert_decimal_odds_array(_convert_odds_to_decimal_array(odds, input_format), output_format)
+
+    american_odds = _parse_column(odds, _parse_american_odds_or_nan)
+    low, high = _american_odds_table_range
+    with np.errstate(invalid='ignore'):
+        in_table = (american_odds >= low) & (american_odds <= high) & (american_odds == np.trunc(american_odds))
+    
+    table = _get_american_odds_table(output_format)
+    if in_table.all():
+        return table[american_odds.astype(np.intp) - low]
+
+    converted = np.empty(american_odds.shape, dtype=table.dtype)
+    converted[in_table] = table[american_odds[in_table].astype(np.intp) - low]
+    other = ~in_table
+    converted[other] = _convert_decimal_odds_array(_convert_american_odds_to_decimal_array(american_odds[other]), 
+                                                   output_format)
+    return converted
+
+
+def _solve_power_method_exponents(implied, market_codes, valid_markets, max_iterations, tolerance):
+    # Newton's method for k in sum(p ** k) = 1, solved for every market at once
+    market_count = len(valid_markets)
+    log_implied = np.log(implied)
+    k = np.ones(market_count)
+    for _ in range(max_iterations):
+        powered = implied ** k[market_codes]
+        f = np.bincount(market_codes, weights=powered, minlength=market_count) - 1
+        df = np.bincount(market_codes, weights=powered * log_implied, minlength=market_count)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = np.where(df != 0, f / df, 0)
+        step = np.where(valid_markets, np.nan_to_num(step), 0)
+        k = k - step
+        if np.all(np.abs(step) < tolerance):
+            break
+
+    return k
+
+
+def calculate_no_vig_probabilities(decimal_odds, market_ids, method="multiplicative", max_iterations=50, 
+                                   tolerance=1e-10):
+    """
+    Removes the vig from many markets at once. Selections are grouped by market id and every calculation is done 
+    on numpy arrays, so thousands of selections are handled in one pass.
+
+    Parameters
+    ----------
+    decimal_odds : list or np.ndarray
+        Decimal odds for each selection. Use np.nan (or None) for missing odds, which makes the selection's whole 
+        market nan.
+    market_ids : list or np.ndarray
+        Market id for each selection (same length as decimal_odds). Selections with the same id are the outcomes 
+        of one market.
+    method : str, optional
+        'multiplicative' (implied probabilities are divided by the market overround) or 'power' (implied 
+        probabilities are raised to the power k that makes the market sum to 1, which moves more of the vig onto 
+        longshots), by default "multiplicative"
+    max_iterations : int, optional
+        Max iterations used to solve the power method, by default 50
+    tolerance : float, optional
+        Convergence tolerance for the power method, by default 1e-10
+
+    Returns
+    -------
+    dict
+        Arrays aligned with the input: 'impliedProbability', 'overround' (sum of implied probabilities in the 
+        selection's market), 'hold' (1 - 1/overround), 'noVigProbability', 'fairDecimalOdds', and 
+        'fairAmericanOdds'. No-vig values are nan for markets with less than two selections.
+    """
+    method = method.lower()
+    if method not in ["multiplicative", "power"]:
+        raise ValueError(f"Invalid method '{method}'. Use 'multiplicative' or 'power'.")
+
+    decimal_odds = np.array(decimal_odds, dtype=np.float64)
+    unique_markets, market_codes = np.unique(np.asarray(market_ids), return_inverse=True)
+    market_codes = market_codes.reshape(-1)
+    market_count = len(unique_markets)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        implied = np.where(decimal_odds > 1, 1 / decimal_odds, np.nan)
+    market_overround = np.bincount(market_codes, weights=implied, minlength=market_count)
+    market_sizes = np.bincount(market_codes, minlength=market_count)
+    market_overround[market_sizes < 2] = np.nan
+    overround = market_overround[market_codes]
+
+    if method == "multiplicative":
+        no_vig = implied / overround
+    else:
+        k = _solve_power_method_exponents(implied, market_codes, ~np.isnan(market_overround), max_iterations, 
+                                          tolerance)
+        no_vig = np.where(np.isnan(overround), np.nan, implied ** k[market_codes])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fair_decimal = 1 / no_vig
+        hold = 1 - 1 / overround
+
+    return {
+        "impliedProbability": implied,
+        "overround": overround,
+        "hold": hold,
+        "noVigProbability": no_vig,
+        "fairDecimalOdds": fair_decimal,
+        "fairAmericanOdds": _convert_decimal_odds_to_american_array(fair_decimal)
+    }
+
+
 def make_spread_pretty(spread):
     """
     Takes in a spread as an int() or str(). Returns the spread as a str() that is pretty for printing.
@@ -3,6 +3,7 @@ from urllib.parse import urlencode
 from lukhed_basic_utils import classCommon
 from lukhed_basic_utils import requestsCommon as rC
 from lukhed_basic_utils import timeCommon as tC
+from lukhed_sports import apiTools
 
 """
 Documentation:
@@ -225,7 +226,7 @@ class OpenGolfApi(classCommon.LukhedAuth):
         if return_text:
             return r.text
         try:
-            return r.json()
+            return apiTools.loads_json(r.content)
         except ValueError:
             return r.text
 
@@ -6,7 +6,7 @@ from lukhed_basic_utils import timeCommon as tC
 from lukhed_sports.calibrations import endpoint_valid_inputs
 from lukhed_sports import gameAnalysis
 from lukhed_basic_utils.githubCommon import GithubHelper
-import json
+from lukhed_sports import apiTools
 
 """
 Documentation:
@@ -381,7 +381,7 @@ class SportsPage(GithubHelper):
             rapid_response = rC.make_request(endpoint_url, headers=self.headers, params=querystring)
             if self.limit_restrict:
                 self._update_limit_tracker(rapid_response, call_time)
-            schedule = json.loads(rapid_response.text)
+            schedule = apiTools.loads_json(rapid_response.content)
             self.working_schedule = schedule
             return schedule
 
@@ -418,7 +418,7 @@ class SportsPage(GithubHelper):
             rapid_response = rC.make_request(endpoint_url, headers=self.headers, params=querystring)
             if self.limit_restrict:
                 self._update_limit_tracker(rapid_response, call_time)
-            result = json.loads(rapid_response.text)
+            result = apiTools.loads_json(rapid_response.content)
             return result
 
     def get_teams(self, league, division=None, conference=None):
@@ -458,7 +458,7 @@ class SportsPage(GithubHelper):
             rapid_response = rC.make_request(endpoint_url, headers=self.headers, params=querystring)
             if self.limit_restrict:
                 self._update_limit_tracker(rapid_response, call_time)
-            result = json.loads(rapid_response.text)
+            result = apiTools.loads_json(rapid_response.content)
             return result
     
     def get_conferences(self, league):
@@ -494,7 +494,7 @@ class SportsPage(GithubHelper):
             rapid_response = rC.make_request(endpoint_url, headers=self.headers, params=querystring)
             if self.limit_restrict:
                 self._update_limit_tracker(rapid_response, call_time)
-            result = json.loads(rapid_response.text)
+            result = apiTools.loads_json(rapid_response.content)
             return result
         
     def get_game_by_id(self, game_id):
@@ -523,7 +523,7 @@ class SportsPage(GithubHelper):
             rapid_response = rC.make_request(endpoint_url, headers=self.headers, params=querystring)
             if self.limit_restrict:
                 self._update_limit_tracker(rapid_response, call_time)
-            result = json.loads(rapid_response.text)
+            result = apiTools.loads_json(rapid_response.content)
             return result
     
     def get_odds(self, game_id, odds_type_filter=None):
@@ -555,7 +555,7 @@ class SportsPage(GithubHelper):
             rapid_response = rC.make_request(endpoint_url, headers=self.headers, params=querystring)
             if self.limit_restrict:
                 self._update_limit_tracker(rapid_response, call_time)
-            result = json.loads(rapid_response.text)
+            result = apiTools.loads_json(rapid_response.content)
             return result
         
     
@@ -21,6 +21,10 @@ setup(
         "lukhed-basic-utils>=1.6.11",
         "nameparser>=1.1.3",
         "fuzzywuzzy>=0.18.0",
-        "Levenshtein>=0.27.1"
+        "Levenshtein>=0.27.1",
+        "numpy"
     ],
+    extras_require={
+        "fast": ["orjson"],
+    },
 )
\ No newline at end of file
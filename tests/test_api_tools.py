@@ -0,0 +1,202 @@
+import unittest
+import tempfile
+import os
+import json
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from unittest import mock
+from lukhed_sports.apiTools import (
+    create_pooled_session,
+    get_session_connection_stats,
+    TtlLruCache,
+    TokenBucketRateLimiter,
+    get_shared_rate_limiter,
+    calculate_backoff_delay,
+    TransportResponse,
+    RecordTransport,
+    ReplayTransport,
+    dump_json_atomic,
+    load_json_if_exists,
+    loads_json,
+    get_json_backend,
+    set_json_backend
+)
+
+
+class TestTtlLruCache(unittest.TestCase):
+    def test_lru_eviction_by_entries(self):
+        cache = TtlLruCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)     # a is now most recently used
+        cache.set('c', 3)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+    def test_eviction_by_bytes(self):
+        cache = TtlLruCache(max_bytes=10)
+        cache.set('a', 'x', size=6)
+        cache.set('b', 'y', size=6)
+        self.assertNotIn('a', cache)
+        self.assertIn('b', cache)
+        self.assertEqual(cache.get_stats()['bytes'], 6)
+
+    def test_per_key_ttl(self):
+        cache = TtlLruCache(default_ttl=100)
+        with mock.patch('lukhed_sports.apiTools.time.monotonic', return_value=0):
+            cache.set('short', 1, ttl=5)
+            cache.set('long', 2)
+        with mock.patch('lukhed_sports.apiTools.time.monotonic', return_value=10):
+            self.assertIsNone(cache.get('short'))
+            self.assertEqual(cache.get('long'), 2)
+
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['expirations']), (1, 1, 1))
+        self.assertEqual(stats['entries'], 1)
+
+
+class TestRateLimiting(unittest.TestCase):
+    def test_token_bucket_burst_then_wait(self):
+        with mock.patch('lukhed_sports.apiTools.time.monotonic', return_value=0), \
+                mock.patch('lukhed_sports.apiTools.time.sleep') as sleep:
+            limiter = TokenBucketRateLimiter(rate=2, burst=3)
+            waits = [limiter.acquire() for _ in range(5)]
+
+        self.assertEqual(waits, [0, 0, 0, 0.5, 1.0])
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_token_bucket_refills(self):
+        with mock.patch('lukhed_sports.apiTools.time.monotonic', return_value=0):
+            limiter = TokenBucketRateLimiter(rate=1, burst=2)
+            limiter.acquire()
+            limiter.acquire()
+        with mock.patch('lukhed_sports.apiTools.time.monotonic', return_value=10):
+            self.assertEqual(limiter.acquire(), 0)
+
+    def test_shared_rate_limiter(self):
+        first = get_shared_rate_limiter('test budget', rate=1)
+        self.assertIs(get_shared_rate_limiter('test budget', rate=5), first)
+        self.assertIsNot(get_shared_rate_limiter('other test budget', rate=1), first)
+
+    def test_backoff_delay(self):
+        for attempt in range(6):
+            delay = calculate_backoff_delay(attempt, 1.5, max_delay=10)
+            expected = min(10, 1.5 * 2 ** attempt)
+            self.assertGreaterEqual(delay, expected / 2)
+            self.assertLessEqual(delay, expected)
+
+
+class _FakeTransport:
+    offline = False
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, headers=None):
+        self.calls = self.calls + 1
+        return TransportResponse(200, {'ETag': '"abc"', 'X-Other': '1'}, '{"url": "%s"}' % url)
+
+
+class TestRecordReplayTransport(unittest.TestCase):
+    def test_record_then_replay(self):
+        with tempfile.TemporaryDirectory() as fixture_dir:
+            live = _FakeTransport()
+            recorder = RecordTransport(live, fixture_dir)
+            recorded = recorder.get('https://example.com/a?x=1')
+            self.assertEqual(live.calls, 1)
+
+            replay = ReplayTransport(fixture_dir)
+            self.assertTrue(replay.offline)
+            replayed = replay.get('https://example.com/a?x=1')
+            self.assertEqual(replayed.status_code, 200)
+            self.assertEqual(replayed.text, recorded.text)
+            self.assertEqual(replayed.json(), {'url': 'https://example.com/a?x=1'})
+            self.assertEqual(replayed.headers, {'ETag': '"abc"'})
+
+            missing = replay.get('https://example.com/b')
+            self.assertEqual((missing.status_code, missing.text), (404, ''))
+            self.assertEqual(replay.missing_urls, ['https://example.com/b'])
+            self.assertEqual(live.calls, 1)
+
+
+class TestAtomicJson(unittest.TestCase):
+    def test_dump_json_atomic(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'cache', '1.json')
+            dump_json_atomic(file_path, {'a': 1})
+            dump_json_atomic(file_path, {'a': 2})
+
+            self.assertEqual(load_json_if_exists(file_path), {'a': 2})
+            self.assertEqual(os.listdir(os.path.dirname(file_path)), ['1.json'])
+
+    def test_load_json_if_exists(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertIsNone(load_json_if_exists(os.path.join(temp_dir, 'missing.json')))
+            bad_file = os.path.join(temp_dir, 'bad.json')
+            with open(bad_file, 'w') as f:
+                f.write('{"a":')
+            self.assertIsNone(load_json_if_exists(bad_file))
+
+
+class TestJsonBackends(unittest.TestCase):
+    def tearDown(self):
+        set_json_backend()
+
+    def test_backends_decode_the_same(self):
+        raw = '{"a": [1, 2.5, "−110", null, true], "b": {"c": "d"}}'
+        for backend in ['orjson', 'msgspec', 'json']:
+            with self.subTest(backend):
+                try:
+                    set_json_backend(backend)
+                except ValueError:
+                    self.skipTest(f'{backend} is not installed')
+                self.assertEqual(get_json_backend(), backend)
+                self.assertEqual(loads_json(raw), json.loads(raw))
+                self.assertEqual(loads_json(raw.encode('utf-8')), json.loads(raw))
+                self.assertRaises(ValueError, loads_json, '{"a":')
+
+    def test_invalid_backend(self):
+        self.assertRaises(ValueError, set_json_backend, 'simplejson')
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _LocalServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestPooledSession(_LocalServerTestCase):
+    def test_connections_are_reused(self):
+        session = create_pooled_session(pool_connections=2, pool_maxsize=2)
+        for i in range(5):
+            self.assertEqual(session.get(f"{self.url}/{i}", timeout=5).json(), {'ok': True})
+
+        stats = get_session_connection_stats(session)
+        session.close()
+        self.assertEqual((stats['requests'], stats['newConnections'], stats['reusedConnections']), (5, 1, 4))
+        self.assertEqual(stats['hosts'], {'127.0.0.1': {'requests': 5, 'newConnections': 1, 'reusedConnections': 4}})
@@ -0,0 +1,259 @@
+import unittest
+import threading
+import tempfile
+import asyncio
+import time
+from unittest import mock
+from lukhed_sports.dkLineTracking import (
+    DkLineHistoryRecorder,
+    DkSelectionDiffer,
+    get_selection_american_odds,
+    get_no_vig_lines,
+    get_price_differences_across_books,
+    DkLineWatcher
+)
+
+
+def _selection(selection_id, market_id, american, decimal, points=None):
+    selection = {
+        'id': selection_id,
+        'marketId': market_id,
+        'displayOdds': {'american': american, 'decimal': str(decimal)},
+        'trueOdds': decimal
+    }
+    if points is not None:
+        selection['points'] = points
+    return selection
+
+
+def _category_data(home_odds=1.91, home_points=-3.5):
+    return {
+        'markets': [{'id': 'm1', 'eventId': 'e1'}, {'id': 'm2', 'eventId': 'e2'}],
+        'selections': [
+            _selection('s1', 'm1', '−110', home_odds, home_points),
+            _selection('s2', 'm1', '−110', 1.91, 3.5),
+            _selection('s3', 'm2', '+150', 2.5)
+        ]
+    }
+
+
+class TestDkLineHistoryRecorder(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self._temp_dir.name
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_american_odds_parsing(self):
+        self.assertEqual(get_selection_american_odds(_selection('s', 'm', '−110', 1.91)), -110)
+        self.assertEqual(get_selection_american_odds(_selection('s', 'm', '+150', 2.5)), 150)
+        self.assertIsNone(get_selection_american_odds({'id': 's'}))
+
+    def test_only_changes_are_written(self):
+        with DkLineHistoryRecorder(self.directory) as recorder:
+            self.assertEqual(recorder.record_category_data(_category_data(), timestamp=1), 3)
+            self.assertEqual(recorder.record_category_data(_category_data(), timestamp=2), 0)
+            self.assertEqual(recorder.record_category_data(_category_data(home_points=-4), timestamp=3), 1)
+            self.assertEqual(recorder.record_category_data(_category_data(home_points=-4, home_odds=1.87),
+                                                           timestamp=4), 1)
+
+            history = recorder.get_selection_history('s1')
+            self.assertEqual([x['timestamp'] for x in history], [1, 3, 4])
+            self.assertEqual([x['points'] for x in history], [-3.5, -4, -4])
+            self.assertEqual(history[-1]['odds'], 1.87)
+            self.assertEqual(history[0]['american'], -110)
+
+            event_history = recorder.get_event_history('e1')
+            self.assertEqual(len(event_history), 4)
+            self.assertEqual({x['eventId'] for x in event_history}, {'e1'})
+            self.assertEqual(recorder.get_event_history('e2')[0]['points'], None)
+            self.assertEqual(recorder.get_event_history('unknown'), [])
+
+    def test_reopen_appends_and_keeps_state(self):
+        with DkLineHistoryRecorder(self.directory) as recorder:
+            recorder.record_category_data(_category_data(), timestamp=1)
+
+        with DkLineHistoryRecorder(self.directory) as recorder:
+            self.assertEqual(recorder.get_row_count(), 3)
+            # unchanged selections are still skipped after reopening, even without eventId available
+            self.assertEqual(recorder.record_selections(_category_data()['selections'], timestamp=2), 0)
+            self.assertEqual(recorder.record_selections([_selection('s3', 'm2', '+160', 2.6)], timestamp=3), 1)
+            self.assertEqual([x['american'] for x in recorder.get_event_history('e2')], [150, 160])
+
+
+class TestDkSelectionDiffer(unittest.TestCase):
+    def test_diff(self):
+        differ = DkSelectionDiffer()
+        first = differ.diff(_category_data()['selections'])
+        self.assertEqual(len(first['added']), 3)
+        self.assertEqual((first['removed'], first['changed']), ([], []))
+
+        self.assertEqual(differ.diff(_category_data()['selections']), {'added': [], 'removed': [], 'changed': []})
+
+        selections = _category_data(home_odds=1.87, home_points=-4)['selections'][0:2]
+        selections.append(_selection('s4', 'm2', '+200', 3.0))
+        result = differ.diff(selections)
+        self.assertEqual([x['id'] for x in result['added']], ['s4'])
+        self.assertEqual([x['id'] for x in result['removed']], ['s3'])
+        self.assertEqual(len(result['changed']), 1)
+        change = result['changed'][0]
+        self.assertEqual((change['id'], change['oldPoints'], change['newPoints']), ('s1', -3.5, -4))
+        self.assertEqual(change['newOdds']['decimal'], '1.87')
+        self.assertEqual(differ.get_snapshot_size(), 3)
+
+
+class TestNoVigLines(unittest.TestCase):
+    def test_get_no_vig_lines(self):
+        lines = get_no_vig_lines(_category_data()['selections'])
+        self.assertEqual([x['selectionId'] for x in lines], ['s1', 's2', 's3'])
+        self.assertAlmostEqual(lines[0]['noVigProbability'], 0.5)
+        self.assertAlmostEqual(lines[0]['hold'], 1 - 1.91 / 2)
+        self.assertEqual(lines[0]['fairAmericanOdds'], 100)
+        self.assertEqual(lines[0]['points'], -3.5)
+        # one selection market has no no-vig line
+        self.assertIsNone(lines[2]['noVigProbability'])
+        self.assertIsNone(lines[2]['fairAmericanOdds'])
+        self.assertAlmostEqual(lines[2]['impliedProbability'], 0.4)
+
+
+class TestPriceDifferencesAcrossBooks(unittest.TestCase):
+    def test_get_price_differences_across_books(self):
+        selections_by_book = {
+            'dkusmi': _category_data()['selections'],
+            'dkusnj': [{'event': 'game', 'selections': _category_data(home_odds=1.95, home_points=-3)['selections']}],
+            'dkusny': [_selection('s1', 'm1', '−110', 1.91, -3.5)]
+        }
+        differences = get_price_differences_across_books(selections_by_book)
+
+        self.assertEqual([x['selectionId'] for x in differences], ['s1', 's2', 's3'])
+        self.assertEqual(differences[0]['bestBook'], 'dkusnj')
+        self.assertAlmostEqual(differences[0]['difference'], 0.04)
+        self.assertTrue(differences[0]['pointsDiffer'])
+        self.assertEqual(differences[1]['odds'], {'dkusmi': 1.91, 'dkusnj': 1.91})
+        self.assertFalse(differences[1]['pointsDiffer'])
+
+
+def _gamelines(spread, moneyline):
+    return {'nfl': [{'event': 'DET Lions @ CHI Bears', 'selections': [
+        {'id': 's1', 'marketId': 'm1', 'label': 'DET Lions', 'marketType': 'Spread', 'points': spread, 
+         'displayOdds': {'american': '−110'}},
+        {'id': 's3', 'marketId': 'm1', 'label': 'CHI Bears', 'marketType': 'Spread', 'points': -spread, 
+         'displayOdds': {'american': '−110'}},
+        {'id': 's2', 'marketId': 'm2', 'label': 'DET Lions', 'marketType': 'Moneyline', 
+         'displayOdds': {'american': moneyline}}
+    ]}]}
+
+
+class _FakeApi:
+    def __init__(self, snapshots):
+        self.snapshots = snapshots
+        self.calls = 0
+
+    async def get_gamelines_for_leagues_async(self, leagues):
+        snapshot = self.snapshots[min(self.calls, len(self.snapshots) - 1)]
+        self.calls = self.calls + 1
+        return snapshot
+
+
+class TestDkLineWatcher(unittest.TestCase):
+    def test_rules_share_one_snapshot(self):
+        api = _FakeApi([_gamelines(-3, '−105'), _gamelines(-4, '+102'), _gamelines(-4.5, '+105'), 
+                        _gamelines(-5.5, '−101')])
+        watcher = DkLineWatcher(api, interval=0)
+        alerts = []
+        for _ in range(100):
+            watcher.add_line_move_rule('NFL', 1, alerts.append, team='lions')
+        watcher.add_line_move_rule('nfl', 1, alerts.append, team='packers')
+        bears_alerts = []
+        watcher.add_line_move_rule('nfl', 1, bears_alerts.append, team='bears')
+        watcher.add_line_move_rule('nfl', 1, alerts.append, market='total')
+        received = []
+
+        async def on_cross(alert):
+            received.append(alert)
+
+        watcher.add_odds_cross_rule('nfl', 100, on_cross, name='crossed +100')
+
+        asyncio.run(watcher.run(max_ticks=4))
+        self.assertEqual(api.calls, 4)
+
+        # baseline moves to the line that fired: -3 -> -4 fires, -4.5 does not, -5.5 fires
+        # team rules only match their own side of the game
+        self.assertEqual(len(alerts), 200)
+        self.assertEqual(set([x['selection']['id'] for x in alerts]), {'s1'})
+        self.assertEqual([x['selection']['id'] for x in bears_alerts], ['s3', 's3'])
+        self.assertEqual(sorted(set([(x['baseline']['points'], x['selection']['points']) for x in alerts])), 
+                         [(-4, -5.5), (-3, -4)])
+        self.assertEqual([x['selection']['displayOdds']['american'] for x in received], ['+102', '−101'])
+        self.assertEqual(received[0]['name'], 'crossed +100')
+
+    def test_remove_rule_and_stop(self):
+        watcher = DkLineWatcher(_FakeApi([_gamelines(-3, '−105'), _gamelines(-5, '−105')]), interval=60)
+        alerts = []
+        rule_id = watcher.add_line_move_rule('nfl', 1, alerts.append)
+        watcher.evaluate_snapshot(_gamelines(-3, '−105'))
+        watcher.remove_rule(rule_id)
+        self.assertEqual(watcher.evaluate_snapshot(_gamelines(-5, '−105')), [])
+
+        watcher.add_line_move_rule('nfl', 1, alerts.append)
+        thread = watcher.start()
+        while watcher.tick_count < 1:
+            time.sleep(0.01)
+        watcher.stop()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+
+    def test_concurrent_remove_and_evaluate(self):
+        watcher = DkLineWatcher(_FakeApi([]), interval=60)
+        errors = []
+
+        def evaluate():
+            try:
+                for points in range(300):
+                    watcher.evaluate_snapshot(_gamelines(points % 3, '−105'))
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=evaluate)
+        thread.start()
+        removed = []
+        for _ in range(300):
+            removed.append(watcher.add_line_move_rule('nfl', 1, lambda alert: None))
+            watcher.remove_rule(removed[-1])
+        thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual([x for x in watcher._baselines if x[0] in removed], [])
+
+    def test_team_rule_matches_participants(self):
+        watcher = DkLineWatcher(_FakeApi([]), interval=60)
+        alerts = []
+        watcher.add_line_move_rule('nfl', 1, lambda alert: None, team='bears')
+        for spread in [-3, -5]:
+            gamelines = _gamelines(spread, '−105')
+            for selection in gamelines['nfl'][0]['selections']:
+                selection['label'] = 'Home' if selection['id'] == 's3' else 'Away'
+                selection['participants'] = [{'name': 'CHI Bears' if selection['id'] == 's3' else 'DET Lions'}]
+            alerts.extend(watcher.evaluate_snapshot(gamelines))
+
+        self.assertEqual([x['selection']['id'] for x in alerts], ['s3'])
+
+    def test_stop_while_run_is_starting(self):
+        watcher = DkLineWatcher(_FakeApi([_gamelines(-3, '−105')]), interval=60)
+        get_running_loop = asyncio.get_running_loop
+
+        def stop_then_get_loop():
+            # stop() lands after the stop event exists but before the loop is published
+            watcher.stop()
+            return get_running_loop()
+
+        with mock.patch('lukhed_sports.dkLineTracking.asyncio.get_running_loop', side_effect=stop_then_get_loop):
+            asyncio.run(asyncio.wait_for(watcher.run(), timeout=5))
+        self.assertEqual(watcher.tick_count, 0)
+
+        for _ in range(50):
+            thread = watcher.start()
+            watcher.stop()
+            thread.join(timeout=5)
+            self.assertFalse(thread.is_alive())
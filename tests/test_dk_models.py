@@ -0,0 +1,87 @@
+import unittest
+import json
+from unittest import mock
+from lukhed_sports import dkModels
+from lukhed_sports.dkModels import DkSelection, compact_category_data, expand_category_data, decode_category_data
+from lukhed_sports.dkLineTracking import get_selection_american_odds, get_no_vig_lines
+from lukhed_sports.dkWrapper import DkSportsbook
+
+
+def _selection(selection_id, market_id, american, decimal, points):
+    return {
+        'id': selection_id,
+        'marketId': market_id,
+        'label': 'WAS Commanders',
+        'displayOdds': {'american': american, 'decimal': str(decimal), 'fractional': '25/27'},
+        'trueOdds': decimal,
+        'points': points,
+        'outcomeType': 'Away',
+        'participants': [{'id': '18480', 'name': 'WAS Commanders', 'type': 'Team'}],
+        'sortOrder': 5499,
+        'tags': ['MainPointLine', 'SGP'],
+        'main': True,
+        'metadata': {}
+    }
+
+
+def _category_data():
+    return {
+        'markets': [{'id': 'm1', 'eventId': 'e1', 'name': 'Spread', 'marketType': {'id': 1, 'name': 'Spread'}}],
+        'selections': [_selection('s1', 'm1', '−108', 1.92, 5.5), _selection('s2', 'm1', '−112', 1.89, -5.5)]
+    }
+
+
+class TestDkModels(unittest.TestCase):
+    def test_round_trip(self):
+        data = _category_data()
+        expanded = expand_category_data(compact_category_data(data))
+        self.assertEqual(expanded['markets'], data['markets'])
+        for selection in data['selections']:
+            # empty values are not kept
+            del selection['metadata']
+        self.assertEqual(expanded['selections'], data['selections'])
+
+    def test_dict_access_and_interning(self):
+        first, second = compact_category_data(_category_data())['selections']
+        self.assertIs(first.label, second.label)
+        self.assertIs(first.participants[0].name, second.participants[0].name)
+        self.assertEqual(first['participants'][0]['id'], '18480')
+        self.assertEqual(first.get('metadata', 'missing'), 'missing')
+        self.assertNotIn('metadata', first)
+        self.assertRaises(KeyError, lambda: first['eventId'])
+        self.assertFalse(hasattr(first, '__dict__'))
+
+    def test_compact_objects_work_with_dict_functions(self):
+        compact = compact_category_data(_category_data())
+        self.assertEqual(get_selection_american_odds(compact['selections'][1]), -112)
+        self.assertAlmostEqual(get_no_vig_lines(compact['selections'])[0]['noVigProbability'], 
+                               (1 / 1.92) / (1 / 1.92 + 1 / 1.89))
+
+        index = DkSportsbook._index_category_data(compact)
+        self.assertEqual([x.id for x in index['selectionsByEvent']['e1']], ['s1', 's2'])
+        self.assertEqual(index['participantEvents'], {'18480': 'e1'})
+
+    def test_missing_values(self):
+        selection = DkSelection.from_dict({'id': 's', 'marketId': 'm'})
+        self.assertEqual(selection.to_dict(), {'id': 's', 'marketId': 'm'})
+        self.assertIsNone(get_selection_american_odds(selection))
+
+    def test_decode_category_data(self):
+        data = _category_data()
+        data['events'] = [{'id': 'e1', 'name': 'WAS Commanders @ NY Giants', 'eventMetadata': {'x': 1}}]
+        data['subscriptionPartials'] = {'x': 1}
+        raw = json.dumps(data)
+
+        decoded = decode_category_data(raw)
+        self.assertEqual(sorted(decoded.keys()), ['events', 'markets', 'selections'])
+        self.assertEqual(decoded['events'], [{'id': 'e1', 'name': 'WAS Commanders @ NY Giants'}])
+        self.assertEqual(decoded['markets'], data['markets'])
+        self.assertEqual(sorted(decoded['selections'][0].keys()), 
+                         ['displayOdds', 'id', 'label', 'main', 'marketId', 'outcomeType', 'participants', 'points', 
+                          'trueOdds'])
+
+        # the stdlib fallback returns the same output
+        with mock.patch.object(dkModels, 'msgspec', None):
+            self.assertEqual(decode_category_data(raw.encode('utf-8')), decoded)
+            self.assertRaises(ValueError, decode_category_data, '{"markets": [')
+        self.assertRaises(ValueError, decode_category_data, '{"markets": [')
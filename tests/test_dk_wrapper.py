@@ -0,0 +1,632 @@
+import unittest
+import tempfile
+import time
+import os
+import json
+import hashlib
+import asyncio
+from unittest import mock
+from lukhed_sports.dkWrapper import DkSportsbook
+from lukhed_sports.apiTools import dump_json_atomic, load_json_if_exists, TransportResponse
+from tests.test_api_tools import _LocalServerTestCase
+
+
+def _build_category_data():
+    markets = []
+    selections = []
+    for event_id in ['e1', 'e2']:
+        for market_name in ['Spread', 'Total', 'Moneyline']:
+            market_id = f"{event_id}-{market_name}"
+            markets.append({'id': market_id, 'eventId': event_id, 'name': market_name})
+            labels = ['Over', 'Under'] if market_name == 'Total' else [f'{event_id} away', f'{event_id} home']
+            for label in labels:
+                selections.append({'id': f"{market_id}-{label}", 'marketId': market_id, 'label': label})
+
+    # selection for a market that is not in the response should be ignored
+    selections.append({'id': 'orphan', 'marketId': 'missing', 'label': 'orphan'})
+    return {'markets': markets, 'selections': selections}
+
+
+def _write_fixture(fixture_dir, url, data):
+    fixture_file = os.path.join(fixture_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+    dump_json_atomic(fixture_file, {"url": url, "statusCode": 200, "headers": {}, "text": json.dumps(data)})
+
+
+def _build_metadata():
+    return {
+        "sports": {"validators": {}, "checked": time.time(), 
+                   "data": [{"id": "1", "name": "Football"}, {"id": "2", "name": "Basketball"}]},
+        "leagues": {"1": {"validators": {}, "checked": time.time(), 
+                          "data": {"leagues": [{"id": "88808", "name": "NFL"}]}}}
+    }
+
+
+class _FakeDkTransport:
+    offline = True
+
+    def __init__(self, responses=None):
+        """
+        Serves responses by url and records every request. Values are json data (200 response), a 
+        TransportResponse, a function of the request headers that returns a TransportResponse, or a list of 
+        TransportResponses served in order (the last one repeats).
+        """
+        self.responses = {} if responses is None else responses
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append((url, headers))
+        response = self.responses.get(url)
+        if response is None:
+            return TransportResponse(404, {}, '')
+        elif isinstance(response, TransportResponse):
+            return response
+        elif callable(response):
+            return response(headers)
+        elif isinstance(response, list):
+            return response.pop(0) if len(response) > 1 else response[0]
+        return TransportResponse(200, {}, json.dumps(response))
+
+    def get_requested_urls(self):
+        return [x[0] for x in self.requests]
+
+
+def _get_league_url(api, league_id, category_id=None):
+    url = f"{api._base_url}/sportscontent/{api.sportsbook}/{api._api_versions['groupVersion']}/leagues/{league_id}"
+    return url if category_id is None else f"{url}/categories/{category_id}"
+
+
+class _DkTempDirTestCase(unittest.TestCase):
+    def setUp(self):
+        # The class creates its local cache folder in the working directory
+        self._cwd = os.getcwd()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self._temp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._temp_dir.cleanup()
+
+    def _create_api(self, metadata=None, use_local_cache=False, **kwargs):
+        return DkSportsbook(use_local_cache=use_local_cache, transport_mode='replay', 
+                            fixture_dir=self._temp_dir.name, metadata=metadata, **kwargs)
+
+    def _create_api_with_fake_transport(self, responses=None, metadata=None, **kwargs):
+        api = self._create_api(metadata=metadata, **kwargs)
+        api._transport = _FakeDkTransport(responses)
+        return api
+
+
+class TestDkCategoryParsing(unittest.TestCase):
+    def setUp(self):
+        # Parsing methods do not need network access, so skip instantiation
+        self.api = DkSportsbook.__new__(DkSportsbook)
+
+    def test_index_category_data(self):
+        data = _build_category_data()
+        index = DkSportsbook._index_category_data(data)
+        self.assertEqual(len(index['markets']), 6)
+        self.assertEqual(sorted(index['selectionsByEvent'].keys()), ['e1', 'e2'])
+        self.assertEqual(len(index['selectionsByEvent']['e1']), 6)
+        self.assertEqual([x['id'] for x in index['selectionsByEvent']['e2']],
+                         [x['id'] for x in data['selections'] if x['id'].startswith('e2')])
+
+    def test_parse_gameline_selections_given_filters(self):
+        index = DkSportsbook._index_category_data(_build_category_data())
+
+        all_lines = self.api._parse_gameline_selections_given_filters('e1', index, None, None, None)
+        self.assertEqual(len(all_lines), 6)
+        self.assertEqual([x['marketType'] for x in all_lines], ['Spread'] * 2 + ['Total'] * 2 + ['Moneyline'] * 2)
+
+        totals = self.api._parse_gameline_selections_given_filters('e2', index, None, 'total', None)
+        self.assertEqual([x['label'] for x in totals], ['Over', 'Under'])
+
+        team_spread = self.api._parse_gameline_selections_given_filters('e1', index, 'e1 HOME', 'Spread', True)
+        self.assertEqual([x['id'] for x in team_spread], ['e1-Spread-e1 home'])
+
+        self.assertEqual(self.api._parse_gameline_selections_given_filters('e3', index, None, None, None), [])
+
+    def test_filter_selections_by_events(self):
+        data = {
+            'markets': [{'id': 'm1', 'eventId': 'e1', 'name': 'TD'}, {'id': 'm2', 'eventId': 'e2', 'name': 'TD'}],
+            'selections': [
+                {'id': 's1', 'marketId': 'm1', 'participants': [{'id': 'p1'}]},
+                {'id': 's2', 'marketId': 'm2', 'participants': [{'id': 'p2'}]},
+                {'id': 's3', 'marketId': 'm2', 'participants': []},
+            ]
+        }
+        participant_events = DkSportsbook._index_category_data(data)['participantEvents']
+        self.assertEqual(participant_events, {'p1': 'e1', 'p2': 'e2'})
+
+        filtered = DkSportsbook._filter_selections_by_events(data['selections'], participant_events, {'e2'})
+        self.assertEqual([x['id'] for x in filtered], ['s2'])
+        self.assertIs(filtered[0], data['selections'][1])
+
+        both = DkSportsbook._filter_selections_by_events(data['selections'], participant_events, {'e1', 'e2'})
+        self.assertEqual([x['id'] for x in both], ['s1', 's2'])
+
+
+class TestDkLazyMetadata(_DkTempDirTestCase):
+    def test_construction_makes_no_calls(self):
+        api = self._create_api()
+        self.assertEqual(api._transport.missing_urls, [])
+
+        self.assertEqual(api.available_sports, [])
+        self.assertEqual(len(api._transport.missing_urls), 1)
+
+    def test_failed_sports_fetch_is_retried(self):
+        api = self._create_api()
+        self.assertEqual(api.available_sports, [])
+
+        url = (f"{api._base_url}/sportscontent/navigation/{api.sportsbook}/{api._api_versions['navVersion']}"
+               f"/nav/sports?format=json")
+        _write_fixture(self._temp_dir.name, url, {"sports": [{"id": "1", "name": "Football"}]})
+        self.assertEqual(api.available_sports, ['football'])
+        self.assertEqual(api._get_sport_id('football'), '1')
+        self.assertEqual(len(api._transport.missing_urls), 1)
+
+    def test_preloaded_metadata(self):
+        api = self._create_api(metadata=_build_metadata())
+        self.assertEqual(api.available_sports, ['football', 'basketball'])
+        self.assertEqual(api._get_league_id('football', 'nfl'), '88808')
+        self.assertEqual(api._transport.missing_urls, [])
+
+        shared = self._create_api(metadata=api.get_metadata())
+        self.assertEqual(shared._get_sport_id('basketball'), '2')
+        self.assertEqual(shared._transport.missing_urls, [])
+
+
+class TestDkShardedLeagueCache(_DkTempDirTestCase):
+    def test_sharded_league_cache(self):
+        api = self._create_api(use_local_cache=True)
+        fresh_entry = {"validators": {}, "checked": time.time(), "data": {"leagues": [{"id": "1", "name": "NFL"}]}}
+        dump_json_atomic(api._get_league_cache_file('1'), fresh_entry)
+        dump_json_atomic(api._leagues_cache_file, {'2': {"leagues": [{"id": "2", "name": "NBA"}]}})
+
+        # fresh shard entries are used as is
+        self.assertEqual(api._get_league_data_for_sport('1'), fresh_entry['data'])
+        self.assertEqual(api._transport.missing_urls, [])
+
+        # legacy single file entries are read then revalidated (no check time), updates go to a shard
+        nba = {"leagues": [{"id": "2", "name": "NBA"}, {"id": "3", "name": "WNBA"}]}
+        url = (f"{api._base_url}/sportscontent/navigation/{api.sportsbook}/{api._api_versions['navVersion']}"
+               f"/nav/sports/2?format=json")
+        _write_fixture(self._temp_dir.name, url, nba)
+
+        self.assertEqual(api._get_league_data_for_sport('2'), nba)
+        self.assertEqual(load_json_if_exists(api._get_league_cache_file('2'))['data'], nba)
+        self.assertEqual(sorted(api._get_locally_cached_sport_ids()), ['1', '2'])
+
+
+    def test_reset_cache_removes_shards(self):
+        api = self._create_api(use_local_cache=True)
+        for sport_id in ['1', '2']:
+            dump_json_atomic(api._get_league_cache_file(sport_id), 
+                             {"validators": {}, "checked": time.time(), "data": {"leagues": []}})
+        self.assertEqual(sorted(api._get_locally_cached_sport_ids()), ['1', '2'])
+
+        nfl = {"leagues": [{"id": "88808", "name": "NFL"}]}
+        url = (f"{api._base_url}/sportscontent/navigation/{api.sportsbook}/{api._api_versions['navVersion']}"
+               f"/nav/sports/1?format=json")
+        reset_api = self._create_api_with_fake_transport({url: nfl}, use_local_cache=True, reset_cache=True)
+        self.assertEqual(reset_api._get_locally_cached_sport_ids(), [])
+
+        # the next lookup goes to dk and writes a new shard
+        self.assertEqual(reset_api._get_league_data_for_sport('1'), nfl)
+        self.assertEqual(reset_api._transport.get_requested_urls(), [url])
+        self.assertEqual(load_json_if_exists(reset_api._get_league_cache_file('1'))['data'], nfl)
+
+
+class TestDkSportsbookFanOut(_DkTempDirTestCase):
+    def test_category_fan_out_by_book(self):
+        api = self._create_api(metadata=_build_metadata(), sportsbooks=['dkusmi', 'dkusnj', 'dkusny'])
+        api._json_cache.set(('league', '88808'), {'categories': [{'id': 492, 'name': 'Game Lines'}]})
+        for book, odds in [('dkusmi', 1.91), ('dkusnj', 1.95)]:
+            url = api._build_league_url_for_category('football', 'nfl', 'game lines', sportsbook=book)
+            _write_fixture(self._temp_dir.name, url, 
+                           {'selections': [{'id': 's1', 'marketId': 'm1', 'trueOdds': odds}]})
+
+        by_book = api.get_betting_selections_by_category_for_books('football', 'nfl', 'game lines')
+        self.assertEqual(list(by_book.keys()), ['dkusmi', 'dkusnj', 'dkusny'])
+        self.assertEqual([by_book[x][0]['trueOdds'] for x in ['dkusmi', 'dkusnj']], [1.91, 1.95])
+        self.assertEqual(by_book['dkusny'], [])
+
+
+class TestDkEventTokenIndex(_DkTempDirTestCase):
+    def test_event_token_index(self):
+        api = self._create_api(metadata=_build_metadata())
+        api.add_team_aliases({'Washington': 'Commanders'})
+        events = [{'id': '1', 'name': 'DET Lions @ CHI Bears'}, {'id': '2', 'name': 'WAS Commanders @ NY Giants'}, 
+                  {'id': '3', 'name': 'NY Jets @ NE Patriots'}]
+        api._json_cache.set(('league', '88808'), {'events': events})
+
+        found = api.get_events_for_teams('football', 'nfl', ['bears', 'DET lions', 'washington', 'ny', 'giant', 
+                                                             'packers'])
+        self.assertEqual({team: [x['id'] for x in games] for team, games in found.items()}, 
+                         {'bears': ['1'], 'DET lions': ['1'], 'washington': ['2'], 'ny': ['2', '3'], 
+                          'giant': ['2'], 'packers': []})
+
+        # index is built once per league fetch
+        index = api._get_event_token_index('football', 'nfl')[1]
+        self.assertIs(api._get_event_token_index('football', 'nfl')[1], index)
+        self.assertEqual(api._get_slate_events('football', 'nfl', ['jets', 'lions']), [events[0], events[2]])
+
+
+class TestDkMultiLeagueGamelines(_DkTempDirTestCase):
+    def _create_multi_league_api(self):
+        # basketball is not in the sport list, so nba can not be resolved to a sport id
+        metadata = _build_metadata()
+        metadata['sports']['data'] = [{"id": "1", "name": "Football"}]
+        metadata['leagues']['1']['data']['leagues'].append({"id": "88809", "name": "College Football"})
+
+        api = self._create_api_with_fake_transport(metadata=metadata)
+        category_data = _build_category_data()
+        for league_id, category_id in [('88808', 492), ('88809', 493)]:
+            api._transport.responses[_get_league_url(api, league_id)] = {
+                'events': [{'id': 'e1', 'name': 'A @ B'}, {'id': 'e2', 'name': 'C @ D'}],
+                'categories': [{'id': category_id, 'name': 'Game Lines'}]
+            }
+            api._transport.responses[_get_league_url(api, league_id, category_id)] = category_data
+
+        return api
+
+    def _check_multi_league_gamelines(self, api, gamelines):
+        self.assertEqual(list(gamelines.keys()), ['nfl', 'college football', 'nba', 'xfl'])
+        for league in ['nfl', 'college football']:
+            self.assertEqual([x['event'] for x in gamelines[league]], ['A @ B', 'C @ D'])
+            self.assertEqual([len(x['selections']) for x in gamelines[league]], [6, 6])
+        self.assertEqual(gamelines['nba'], [])
+        self.assertEqual(gamelines['xfl'], [])
+
+        # league json and game lines once per league, nothing requested for the unresolved sport
+        self.assertEqual(sorted(api._transport.get_requested_urls()), 
+                         sorted([_get_league_url(api, '88808'), _get_league_url(api, '88808', 492), 
+                                 _get_league_url(api, '88809'), _get_league_url(api, '88809', 493)]))
+
+    def test_get_gamelines_for_leagues(self):
+        api = self._create_multi_league_api()
+        gamelines = api.get_gamelines_for_leagues(['nfl', 'college football', 'nba', 'xfl'])
+        self._check_multi_league_gamelines(api, gamelines)
+
+    def test_league_missing_from_league_list(self):
+        api = self._create_api_with_fake_transport(metadata=_build_metadata())
+        api._transport.responses[_get_league_url(api, '88808')] = {
+            'events': [{'id': 'e1', 'name': 'A @ B'}], 'categories': [{'id': 492, 'name': 'Game Lines'}]
+        }
+        api._transport.responses[_get_league_url(api, '88808', 492)] = _build_category_data()
+
+        for gamelines in [api.get_gamelines_for_leagues(['nfl', 'college football']), 
+                          asyncio.run(api.get_gamelines_for_leagues_async(['nfl', 'college football']))]:
+            self.assertEqual(len(gamelines['nfl']), 1)
+            self.assertEqual(gamelines['college football'], [])
+        self.assertEqual([x for x in api._transport.get_requested_urls() if '/leagues/None' in x], [])
+
+    def test_get_gamelines_for_leagues_async(self):
+        api = self._create_multi_league_api()
+        gamelines = asyncio.run(api.get_gamelines_for_leagues_async(['nfl', 'college football', 'nba', 'xfl']))
+        self._check_multi_league_gamelines(api, gamelines)
+
+
+class TestDkConditionalNavRequests(_DkTempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = 'https://example.com/nav/sports/1?format=json'
+        self.stale_entry = {"validators": {"etag": '"v1"', "lastModified": "Mon, 01 Jan 2024 00:00:00 GMT"}, 
+                            "checked": 0, "data": {"leagues": [{"id": "88808", "name": "NFL"}]}}
+
+    def test_not_modified_keeps_cached_data(self):
+        api = self._create_api_with_fake_transport({self.url: TransportResponse(304, {}, '')})
+        entry = api._get_validated_nav_entry(self.url, 'test', self.stale_entry)
+
+        self.assertEqual(api._transport.requests, [(self.url, {'If-None-Match': '"v1"', 
+                                                               'If-Modified-Since': "Mon, 01 Jan 2024 00:00:00 GMT"})])
+        self.assertEqual(entry['data'], self.stale_entry['data'])
+        self.assertEqual(entry['validators'], self.stale_entry['validators'])
+        self.assertGreater(entry['checked'], 0)
+
+    def test_modified_replaces_entry(self):
+        new_data = {"leagues": [{"id": "88808", "name": "NFL"}, {"id": "88809", "name": "UFL"}]}
+        api = self._create_api_with_fake_transport(
+            {self.url: TransportResponse(200, {'ETag': '"v2"'}, json.dumps(new_data))})
+        entry = api._get_validated_nav_entry(self.url, 'test', self.stale_entry)
+
+        self.assertEqual(api._transport.requests[0][1]['If-None-Match'], '"v1"')
+        self.assertEqual(entry['data'], new_data)
+        self.assertEqual(entry['validators'], {'etag': '"v2"'})
+
+    def test_fresh_and_uncached_entries(self):
+        api = self._create_api_with_fake_transport({self.url: {"leagues": []}})
+        fresh_entry = dict(self.stale_entry, checked=time.time())
+        self.assertIs(api._get_validated_nav_entry(self.url, 'test', fresh_entry), fresh_entry)
+        self.assertEqual(api._transport.requests, [])
+
+        # nothing cached, so no conditional headers
+        entry = api._get_validated_nav_entry(self.url, 'test', None)
+        self.assertEqual(api._transport.requests, [(self.url, {})])
+        self.assertEqual(entry['data'], {"leagues": []})
+
+
+    def test_refresh_reference_cache(self):
+        metadata = _build_metadata()
+        metadata['sports']['validators'] = {'etag': '"s1"'}
+        metadata['leagues']['1']['validators'] = {'etag': '"l1"'}
+        api = self._create_api_with_fake_transport(metadata=metadata)
+        self.assertEqual(api._get_league_id('football', 'nfl'), '88808')
+        self.assertEqual(api._transport.requests, [])
+
+        nav_url = f"{api._base_url}/sportscontent/navigation/{api.sportsbook}/{api._api_versions['navVersion']}"
+        sports_url = f"{nav_url}/nav/sports?format=json"
+        league_url = f"{nav_url}/nav/sports/1?format=json"
+        new_leagues = {"leagues": [{"id": "88808", "name": "NFL"}, {"id": "88809", "name": "College Football"}]}
+        api._transport.responses[sports_url] = TransportResponse(304, {}, '')
+        api._transport.responses[league_url] = TransportResponse(200, {'ETag': '"l2"'}, json.dumps(new_leagues))
+
+        # fresh entries are revalidated anyway
+        api.refresh_reference_cache()
+        self.assertEqual(api._transport.requests, [(sports_url, {'If-None-Match': '"s1"'}), 
+                                                   (league_url, {'If-None-Match': '"l1"'})])
+        self.assertEqual(api.available_sports, ['football', 'basketball'])
+        self.assertEqual(api._get_league_id('football', 'college football'), '88809')
+        self.assertEqual(api.get_metadata()['leagues']['1']['validators'], {'etag': '"l2"'})
+        self.assertEqual(len(api._transport.requests), 2)
+
+
+class TestDkSelectionChanges(_DkTempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.api = self._create_api_with_fake_transport(metadata=_build_metadata())
+        self.api._transport.responses[_get_league_url(self.api, '88808')] = {
+            'events': [{'id': 'e1', 'name': 'A @ B'}, {'id': 'e2', 'name': 'C @ D'}],
+            'categories': [{'id': 492, 'name': 'Game Lines'}]
+        }
+        self.category_url = _get_league_url(self.api, '88808', 492)
+
+    def _check_failed_poll_keeps_snapshot(self, get_changes, selection_count):
+        self.api._transport.responses[self.category_url] = _build_category_data()
+        self.assertEqual(len(get_changes()['added']), selection_count)
+
+        del self.api._transport.responses[self.category_url]
+        self.assertEqual(get_changes(), {'added': [], 'removed': [], 'changed': []})
+
+        # the snapshot from the first poll is still the baseline
+        self.api._transport.responses[self.category_url] = _build_category_data()
+        self.assertEqual(get_changes(), {'added': [], 'removed': [], 'changed': []})
+
+    def test_gamelines_changes_skip_failed_fetch(self):
+        self._check_failed_poll_keeps_snapshot(lambda: self.api.get_gamelines_for_league_changes('nfl'), 12)
+
+    def test_category_changes_skip_failed_fetch(self):
+        self._check_failed_poll_keeps_snapshot(
+            lambda: self.api.get_betting_selections_by_category_changes('football', 'nfl', 'game lines'), 13)
+
+
+class TestDkSlateHarvesting(_DkTempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.api = self._create_api_with_fake_transport(metadata=_build_metadata())
+        self.events = [{'id': 'e1', 'name': 'DET Lions @ CHI Bears'}, {'id': 'e2', 'name': 'NY Jets @ NE Patriots'}, 
+                       {'id': 'e3', 'name': 'WAS Commanders @ NY Giants'}]
+        self.api._transport.responses[_get_league_url(self.api, '88808')] = {
+            'events': self.events,
+            'categories': [{'id': 492, 'name': 'Game Lines'}, {'id': 1001, 'name': 'TD Scorers'}]
+        }
+        for event in self.events:
+            event_url = self._get_event_url(event['id'])
+            self.api._transport.responses[event_url] = {
+                'markets': [{'id': f"{event['id']}-ml", 'eventId': event['id'], 'name': 'Moneyline'}, 
+                            {'id': f"{event['id']}-sp", 'eventId': event['id'], 'name': 'Spread'}]
+            }
+            self.api._transport.responses[event_url + '/1001'] = {
+                'markets': [{'id': f"{event['id']}-td", 'eventId': event['id'], 'name': 'Anytime TD Scorer'}],
+                'selections': [{'id': f"{event['id']}-s{i}", 'marketId': f"{event['id']}-td"} for i in range(2)]
+            }
+
+    def _get_event_url(self, event_id):
+        return (f"{self.api._base_url}/sportscontent/{self.api.sportsbook}/"
+                f"{self.api._api_versions['groupVersion']}/events/{event_id}/categories")
+
+    def _get_requested_event_urls(self):
+        return sorted([x for x in self.api._transport.get_requested_urls() if '/events/' in x])
+
+    def test_available_markets_for_filtered_slate(self):
+        markets = self.api.get_available_markets_for_slate('football', 'nfl', game_filters=['bears', 'jets'])
+        self.assertEqual(markets, {'DET Lions @ CHI Bears': ['Moneyline', 'Spread'], 
+                                   'NY Jets @ NE Patriots': ['Moneyline', 'Spread']})
+        self.assertEqual(self._get_requested_event_urls(), [self._get_event_url('e1'), self._get_event_url('e2')])
+
+    def test_event_category_data_for_slate(self):
+        slate = self.api.get_event_category_data_for_slate('football', 'nfl', category='td scorers', 
+                                                           game_filters=['giants'])
+        self.assertEqual(slate['events'], [self.events[2]])
+        self.assertEqual(list(slate['selectionsByEvent'].keys()), ['e3'])
+        self.assertEqual(list(slate['marketsById'].keys()), ['e3-td'])
+        self.assertEqual(self._get_requested_event_urls(), [self._get_event_url('e3') + '/1001'])
+
+    def test_all_touchdown_props_for_slate(self):
+        props = self.api.get_all_touchdown_props_for_slate('nfl')
+        self.assertEqual(list(props.keys()), [x['name'] for x in self.events])
+        self.assertEqual([x['name'] for x in props['NY Jets @ NE Patriots']], ['Anytime TD Scorer'] * 2)
+        self.assertEqual([x['selection']['id'] for x in props['NY Jets @ NE Patriots']], ['e2-s0', 'e2-s1'])
+
+        # one request per event for the category, the league json is fetched once
+        self.assertEqual(self._get_requested_event_urls(), 
+                         sorted([self._get_event_url(x['id']) + '/1001' for x in self.events]))
+        self.assertEqual(self.api._transport.get_requested_urls().count(_get_league_url(self.api, '88808')), 1)
+
+
+class TestDkPlayerProps(_DkTempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        metadata = _build_metadata()
+        metadata['leagues']['2'] = {"validators": {}, "checked": time.time(), 
+                                    "data": {"leagues": [{"id": "42648", "name": "NBA"}]}}
+        self.api = self._create_api_with_fake_transport(metadata=metadata)
+        self.api._transport.responses[_get_league_url(self.api, '42648')] = {
+            'events': [{'id': 'e1', 'name': 'BOS Celtics @ NY Knicks'}, 
+                       {'id': 'e2', 'name': 'LA Lakers @ GS Warriors'}],
+            'categories': [{'id': 1215, 'name': 'Player Points'}, {'id': 1216, 'name': 'Player Rebounds'}]
+        }
+        self.category_data = {}
+        for category_id, stat, line in [(1215, 'Points', 20.5), (1216, 'Rebounds', 8.5)]:
+            data = {'markets': [], 'selections': []}
+            for event_id, players in [('e1', ['Tatum', 'Brunson']), ('e2', ['James'])]:
+                market_id = f"{event_id}-{stat}"
+                data['markets'].append({'id': market_id, 'eventId': event_id, 'name': stat})
+                for player in players:
+                    for outcome in ['Over', 'Under']:
+                        data['selections'].append({
+                            'id': f"{market_id}-{player}-{outcome}", 'marketId': market_id, 
+                            'label': f"{outcome} {line}", 'points': line, 'outcomeType': outcome, 
+                            'displayOdds': {'american': '−110', 'decimal': '1.91'}, 
+                            'participants': [{'id': f"p-{player}", 'name': player, 'type': 'Player'}]
+                        })
+            self.category_data[stat] = data
+            self.api._transport.responses[_get_league_url(self.api, '42648', category_id)] = data
+
+    def test_multi_category_prop_table(self):
+        rows = self.api.get_player_props('nba', ['player points', 'player rebounds'])
+        self.assertEqual(len(rows), 12)
+        self.assertEqual([x['category'] for x in rows], ['player points'] * 6 + ['player rebounds'] * 6)
+        self.assertEqual(rows[0], {'category': 'player points', 'player': 'Tatum', 'playerId': 'p-Tatum', 
+                                   'line': 'Over 20.5', 'points': 20.5, 'outcomeType': 'Over', 
+                                   'odds': {'american': '−110', 'decimal': '1.91'}})
+
+    def test_game_filter_resolved_once(self):
+        with mock.patch.object(self.api, '_get_event_ids_for_game_filter', 
+                               wraps=self.api._get_event_ids_for_game_filter) as resolve:
+            rows = self.api.get_player_props('nba', ['player points', 'player rebounds'], game_filter='lakers')
+        
+        self.assertEqual(resolve.call_count, 1)
+        self.assertEqual([(x['category'], x['player']) for x in rows], 
+                         [('player points', 'James')] * 2 + [('player rebounds', 'James')] * 2)
+        self.assertEqual(self.api._transport.get_requested_urls().count(_get_league_url(self.api, '42648')), 1)
+
+    def test_per_stat_wrapper_output(self):
+        # same output as before the per stat methods used get_player_props()
+        expected = [{"player": x['participants'][0]['name'], "line": x['label'], "odds": x['displayOdds']} 
+                    for x in self.category_data['Points']['selections'] if x['marketId'].startswith('e1')]
+        self.assertEqual(self.api.get_player_points_props('nba', game_filter='celtics'), expected)
+        self.assertEqual(len(self.api.get_player_rebound_props('nba')), 6)
+
+
+class TestDkConnectionStats(_DkTempDirTestCase, _LocalServerTestCase):
+    def setUp(self):
+        _DkTempDirTestCase.setUp(self)
+        _LocalServerTestCase.setUp(self)
+
+    def tearDown(self):
+        _LocalServerTestCase.tearDown(self)
+        _DkTempDirTestCase.tearDown(self)
+
+    def test_get_connection_stats(self):
+        api = DkSportsbook(use_local_cache=False, api_delay=None)
+        for i in range(3):
+            self.assertEqual(api._call_api(f"{self.url}/{i}", 'test'), {'ok': True})
+
+        stats = api.get_connection_stats()
+        api.close()
+        self.assertEqual((stats['requests'], stats['newConnections'], stats['reusedConnections']), (3, 1, 2))
+
+
+class TestDkRetries(_DkTempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = 'https://example.com/leagues/1'
+        self.api = self._create_api_with_fake_transport(api_delay=None, retry_delay=1.5)
+        self.api._transport.offline = False
+        self.ok = TransportResponse(200, {}, '{"ok": true}')
+
+    def _call_api(self, responses):
+        self.api._transport.responses[self.url] = responses
+        # jitter returns the full delay so the delays are predictable
+        with mock.patch('lukhed_sports.dkWrapper.tC.sleep') as sleep, \
+                mock.patch('lukhed_sports.apiTools.random.uniform', side_effect=lambda low, high: high):
+            data = self.api._call_api(self.url, 'test')
+        return data, [x.args[0] for x in sleep.call_args_list]
+
+    def test_retry_then_success(self):
+        data, delays = self._call_api([TransportResponse(429, {}, '{}'), self.ok])
+        self.assertEqual(data, {'ok': True})
+        self.assertEqual(len(self.api._transport.requests), 2)
+        self.assertEqual(delays, [1.5])
+
+    def test_retry_after_header(self):
+        data, delays = self._call_api([TransportResponse(503, {'Retry-After': '10'}, ''), 
+                                       TransportResponse(503, {'Retry-After': '120'}, ''), self.ok])
+        self.assertEqual(data, {'ok': True})
+        self.assertEqual(len(self.api._transport.requests), 3)
+        # Retry-After is used when longer than the backoff, capped at 30 seconds
+        self.assertEqual(delays, [10, 30])
+
+    def test_gives_up_after_three_attempts(self):
+        data, delays = self._call_api([TransportResponse(503, {}, '')])
+        self.assertEqual(data, {})
+        self.assertEqual(len(self.api._transport.requests), 3)
+        self.assertEqual(delays, [1.5, 3.0])
+
+    def test_offline_transport_does_not_retry(self):
+        self.api._transport.offline = True
+        data, delays = self._call_api([TransportResponse(503, {}, ''), self.ok])
+        self.assertEqual(data, {})
+        self.assertEqual(len(self.api._transport.requests), 1)
+        self.assertEqual(delays, [])
+
+    def test_replay_transport_does_not_retry(self):
+        api = self._create_api(api_delay=None)
+        with mock.patch('lukhed_sports.dkWrapper.tC.sleep') as sleep:
+            self.assertEqual(api._call_api(self.url, 'test'), {})
+        self.assertEqual(api._transport.missing_urls, [self.url])
+        sleep.assert_not_called()
+
+
+class _FakeLineRecorder:
+    def __init__(self):
+        self.recorded = []
+
+    def record_category_data(self, data, timestamp=None):
+        self.recorded.append(data)
+        return len(data.get('selections', []))
+
+
+class TestDkCategoryDecodeOptions(_DkTempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.selection = {'id': 's1', 'marketId': 'm1', 'label': 'Over', 'trueOdds': 1.91, 'points': 44.5, 
+                          'outcomeType': 'Over', 'tags': ['SGP'], 'sortOrder': 1, 'metadata': {'x': 1}, 
+                          'displayOdds': {'american': '−110', 'decimal': '1.91', 'fractional': '10/11', 'extra': 1}, 
+                          'participants': [{'id': 'p1', 'name': 'A', 'type': 'Team', 'venueRole': 'Home'}]}
+        self.category_data = {'markets': [{'id': 'm1', 'eventId': 'e1', 'name': 'Total', 'tags': ['x']}], 
+                              'selections': [self.selection], 'subcategories': [{'id': 1}]}
+
+    def _create_decode_api(self, **kwargs):
+        api = self._create_api_with_fake_transport(metadata=_build_metadata(), **kwargs)
+        api._transport.responses[_get_league_url(api, '88808')] = {'categories': [{'id': 492, 'name': 'Game Lines'}]}
+        api._transport.responses[_get_league_url(api, '88808', 492)] = self.category_data
+        return api
+
+    def test_typed_decode_projects_category_payload(self):
+        expected = [{
+            'id': 's1', 'marketId': 'm1', 'label': 'Over', 'trueOdds': 1.91, 'points': 44.5, 'outcomeType': 'Over', 
+            'displayOdds': {'american': '−110', 'decimal': '1.91', 'fractional': '10/11'}, 
+            'participants': [{'id': 'p1', 'name': 'A', 'type': 'Team'}]
+        }]
+        api = self._create_decode_api(typed_decode=True)
+        self.assertEqual(api.get_betting_selections_by_category('football', 'nfl', 'game lines'), expected)
+
+        with self.subTest("Without msgspec"), mock.patch('lukhed_sports.dkModels.msgspec', None):
+            api = self._create_decode_api(typed_decode=True)
+            self.assertEqual(api.get_betting_selections_by_category('football', 'nfl', 'game lines'), expected)
+
+        # the default decode returns the full payload
+        api = self._create_decode_api()
+        self.assertEqual(api.get_betting_selections_by_category('football', 'nfl', 'game lines'), [self.selection])
+
+    def test_line_recorder_receives_category_data(self):
+        recorder = _FakeLineRecorder()
+        api = self._create_decode_api(line_recorder=recorder, typed_decode=True)
+        api.get_betting_selections_by_category('football', 'nfl', 'game lines')
+        api.get_gamelines_for_league('nfl')
+
+        # league json is not category data, both category calls are recorded
+        self.assertEqual(len(recorder.recorded), 2)
+        self.assertEqual(recorder.recorded[0]['markets'], [{'id': 'm1', 'eventId': 'e1', 'name': 'Total'}])
+        self.assertNotIn('subcategories', recorder.recorded[0])
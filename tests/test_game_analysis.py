@@ -1,8 +1,26 @@
 import unittest
 from lukhed_sports.gameAnalysis import (
     convert_odds_format,
-    calculate_implied_probability
+    calculate_implied_probability,
+    calculate_no_vig_probabilities,
+    grade_wager_side,
+    grade_wager_total,
+    grade_wager_moneyline,
+    grade_wager_side_batch,
+    grade_wager_total_batch,
+    grade_wager_moneyline_batch,
+    calculate_ats_data_for_game,
+    calculate_ats_data_for_games,
+    convert_odds_format_batch,
+    calculate_unit_profit,
+    calculate_unit_profit_given_record,
+    calculate_unit_profit_given_records,
+    convert_result_list_into_streak,
+    convert_result_list_into_streak_list,
+    calculate_streak_data
 )
+import numpy as np
+import warnings
 
 class TestGameAnalysis(unittest.TestCase):
     def test_convert_odds_format(self):
@@ -178,4 +196,185 @@ class TestGameAnalysis(unittest.TestCase):
             self.assertIsNone(calculate_implied_probability(100, 'invalid'))
 
         with self.subTest("Invalid odds value"):
-            self.assertIsNone(calculate_implied_probability('invalid', 'american'))
\ No newline at end of file
+            self.assertIsNone(calculate_implied_probability('invalid', 'american'))
+
+    def test_calculate_no_vig_probabilities(self):
+        decimal_odds = [1.91, 1.91, 1.5, 3.0, 8.0, 2.0]
+        market_ids = ['spread', 'spread', 'winner', 'winner', 'winner', 'single']
+
+        result = calculate_no_vig_probabilities(decimal_odds, market_ids)
+        with self.subTest("Multiplicative"):
+            overround = 1 / 1.5 + 1 / 3 + 1 / 8
+            np.testing.assert_allclose(result['noVigProbability'][0:5], 
+                                       [0.5, 0.5, (1 / 1.5) / overround, (1 / 3) / overround, (1 / 8) / overround])
+            np.testing.assert_allclose(result['hold'][0:2], 1 - 1 / (2 / 1.91))
+            np.testing.assert_allclose(result['fairAmericanOdds'][0:2], [100, 100])
+            self.assertTrue(np.isnan(result['noVigProbability'][5]))
+
+        result = calculate_no_vig_probabilities(decimal_odds, market_ids, method='power')
+        with self.subTest("Power"):
+            self.assertAlmostEqual(result['noVigProbability'][2:5].sum(), 1)
+            # power method moves more of the vig onto the longshot
+            self.assertLess(result['noVigProbability'][4], 0.125 / 1.125)
+            np.testing.assert_allclose(result['fairDecimalOdds'] * result['noVigProbability'], 
+                                       [1, 1, 1, 1, 1, np.nan])
+
+        with self.subTest("Missing odds"):
+            result = calculate_no_vig_probabilities([1.91, None], ['m', 'm'])
+            self.assertTrue(np.all(np.isnan(result['noVigProbability'])))
+
+        with self.subTest("Invalid method"):
+            self.assertRaises(ValueError, calculate_no_vig_probabilities, decimal_odds, market_ids, 'additive')
+
+    def test_batch_grading_matches_scalar(self):
+        grade_codes = {'w': 1, 'l': -1, 'push': 0}
+
+        pick_scores = [24, 17, 10, '21', 'n/a', 20, 7.9]
+        opp_scores = [20, 20, 10, '21', 14, None, 7]
+        spreads = [-3.5, 3, 'pk', 'EV', -7, 3, 0]
+        with self.subTest("Side"):
+            grades, margins = grade_wager_side_batch(pick_scores, opp_scores, spreads)
+            for i in range(len(pick_scores)):
+                grade, margin = grade_wager_side(pick_scores[i], opp_scores[i], spreads[i])
+                if grade == 'error':
+                    self.assertTrue(np.isnan(grades[i]) and np.isnan(margins[i]))
+                else:
+                    self.assertEqual((grades[i], margins[i]), (grade_codes[grade], margin))
+
+        with self.subTest("Side non-finite scores"):
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                grades, margins = grade_wager_side_batch(np.array([np.inf, 7]), np.array([np.inf, 3]), [0, 0])
+            np.testing.assert_array_equal(grades, [np.nan, 1])
+
+        with self.subTest("Moneyline"):
+            grades, margins = grade_wager_moneyline_batch(pick_scores, opp_scores)
+            for i in range(len(pick_scores)):
+                grade = grade_wager_moneyline(pick_scores[i], opp_scores[i])
+                if grade == 'n/a':
+                    self.assertTrue(np.isnan(grades[i]))
+                else:
+                    self.assertEqual(grades[i], grade_codes[grade])
+            np.testing.assert_array_equal(margins, [4, -3, 0, 0, np.nan, np.nan, 0])
+
+        away_scores = np.array([20, 20, 20, 10, 17])
+        home_scores = np.array([21, 24, 17, 10, 3])
+        lines = [41, 40.5, 40.5, 21, 20.5]
+        bets = ['over', 'Under', 'under', 'OVER', 'pass']
+        with self.subTest("Total"):
+            grades, margins = grade_wager_total_batch(away_scores, home_scores, lines, bets)
+            for i in range(len(bets)):
+                grade, margin = grade_wager_total(int(away_scores[i]), int(home_scores[i]), lines[i], bets[i])
+                self.assertEqual((grades[i], margins[i]), (grade_codes[grade], margin))
+
+        with self.subTest("Total unparseable"):
+            grades, margins = grade_wager_total_batch([20, 'n/a', 20], [21, 3, 24], 41, ['over', 'over', None])
+            np.testing.assert_array_equal(grades, [0, np.nan, np.nan])
+            np.testing.assert_array_equal(margins, [0, np.nan, 3])
+
+    def test_calculate_ats_data_for_games(self):
+        away_scores = [24, 17, 20, 'n/a', 10]
+        home_scores = [20, 20, 17, 14, 10]
+        home_spreads = [-3.5, -3, 3, -7, 'n/a']
+        totals = [44.5, 37, 'n/a', 41, 20]
+
+        result = calculate_ats_data_for_games(away_scores, home_scores, home_spreads, totals)
+        for i in range(len(away_scores)):
+            expected = calculate_ats_data_for_game(away_scores[i], home_scores[i], home_spreads[i], totals[i])
+            for key, value in expected.items():
+                with self.subTest(game=i, key=key):
+                    if value == "n/a" and result[key].dtype.kind == 'f':
+                        self.assertTrue(np.isnan(result[key][i]))
+                    else:
+                        self.assertEqual(result[key][i], value)
+
+    def test_convert_odds_format_batch(self):
+        inputs = {
+            'american': [-110, 150, '+250', '-1227', 15900, 25000, 120.5],
+            'decimal': [1.91, 2.5, 1.08, 12.463],
+            'fractional': ['10/11', '3/2', '1/12', '5/1'],
+            'implied probability': [0.5238, 0.4, 0.0802407221664995]
+        }
+        for input_format, odds in inputs.items():
+            for output_format in inputs:
+                if input_format == output_format:
+                    continue
+                with self.subTest(input_format=input_format, output_format=output_format):
+                    result = convert_odds_format_batch(odds, input_format, output_format)
+                    expected = [convert_odds_format(x, input_format, output_format) for x in odds]
+                    if output_format == 'american':
+                        expected = [float(x) for x in expected]
+                    self.assertEqual(list(result), expected)
+
+        with self.subTest("Invalid odds"):
+            np.testing.assert_array_equal(convert_odds_format_batch(['−110', 'n/a'], 'american', 'decimal'), 
+                                          [1.909, np.nan])
+            np.testing.assert_array_equal(convert_odds_format_batch([0, '+0', 0.0], 'american', 'decimal'), 
+                                          [np.nan] * 3)
+            np.testing.assert_array_equal(convert_odds_format_batch([0, 100], 'american', 'implied probability'), 
+                                          [np.nan, 0.5])
+            self.assertEqual(list(convert_odds_format_batch([0, 100], 'american', 'fractional')), [None, '1/1'])
+            self.assertEqual(list(convert_odds_format_batch(['1/2', '2.0'], 'fractional', 'fractional')), 
+                             ['1/2', '2.0'])
+            self.assertEqual(list(convert_odds_format_batch(['x', 0.5], 'implied_probability', 'fractional')), 
+                             [None, '1/1'])
+
+        with self.subTest("Invalid format"):
+            self.assertRaises(ValueError, convert_odds_format_batch, [100], 'american', 'moneyline')
+
+    def test_calculate_unit_profit_given_record(self):
+        cases = [("10-5-0", -110, 1), ("3-7-1", 150, 2), ("1234-1187-40", -105, 1.5), ("0-0-3", -110, 1)]
+        for record, odds, units in cases:
+            with self.subTest(record=record):
+                wins, losses = [int(x) for x in record.split('-')[0:2]]
+                expected = sum([calculate_unit_profit(odds, units, 'w')] * wins + 
+                               [calculate_unit_profit(odds, units, 'l')] * losses)
+                self.assertEqual(calculate_unit_profit_given_record(record, odds, units), round(expected, 2))
+
+        with self.subTest("Batch"):
+            result = calculate_unit_profit_given_records([x[0] for x in cases], [x[1] for x in cases], 
+                                                         [x[2] for x in cases])
+            self.assertEqual(list(result), [calculate_unit_profit_given_record(*x) for x in cases])
+            np.testing.assert_array_equal(calculate_unit_profit_given_records(np.array([[10, 5, 0], [3, 7, 1]])), 
+                                          [4.1, -4.27])
+            np.testing.assert_array_equal(calculate_unit_profit_given_records(['10-5-0', 'n/a']), [4.1, np.nan])
+
+        with self.subTest("Nested list counts"):
+            self.assertEqual(list(calculate_unit_profit_given_records([[3, 2, 0]])), 
+                             [calculate_unit_profit_given_record("3-2-0")])
+            self.assertEqual(list(calculate_unit_profit_given_records([(10, 5), (3, 7)], [-110, 150], 2)), 
+                             [calculate_unit_profit_given_record("10-5-0", -110, 2), 
+                              calculate_unit_profit_given_record("3-7-0", 150, 2)])
+            for records in [[3, 2, 0], [[3, 2, 0, 1]], np.array([10, 5, 0]), [[3, 2], [1]]]:
+                self.assertRaises(ValueError, calculate_unit_profit_given_records, records)
+
+        with self.subTest("Scalar odds with half unit stakes"):
+            records = ['3-1-0', '2-2-0', '1-0-0']
+            for odds, units in [(125, 0.5), (175, 1.5), (101, 0.5)]:
+                self.assertEqual(list(calculate_unit_profit_given_records(records, odds, units)), 
+                                 [calculate_unit_profit_given_record(x, odds, units) for x in records])
+
+
+    def test_calculate_streak_data(self):
+        results = ['win', 'win', 'loss', 'push', 'push', 'loss', 'loss', 'loss', 'W', 'w', 'l']
+        expected_streaks = [1, 2, -1, 0, 0, -1, -2, -3, 1, 2, -1]
+
+        with self.subTest("Streak list"):
+            self.assertEqual(convert_result_list_into_streak_list(results), 
+                             [convert_result_list_into_streak(results[0:i]) for i in range(len(results))])
+            self.assertEqual(convert_result_list_into_streak_list([]), [])
+
+        codes = np.array([1, 1, -1, 0, 0, -1, -1, -1, 1, 1, -1])
+        for name, data in [("List", results), ("NumPy", codes), ("Stream", iter(codes.tolist()))]:
+            with self.subTest(name):
+                streak_data = calculate_streak_data(data)
+                self.assertEqual(list(streak_data['streakList']), expected_streaks)
+                self.assertEqual(streak_data['longestWinStreak'], 2)
+                self.assertEqual(streak_data['longestLossStreak'], 3)
+                self.assertEqual(streak_data['currentStreak'], -1)
+                self.assertEqual(streak_data['currentStreakLength'], 1)
+                self.assertEqual(streak_data['currentStreakStart'], 10)
+
+        with self.subTest("Push streak"):
+            streak_data = calculate_streak_data(['loss', 'push', 'push'])
+            self.assertEqual((streak_data['currentStreak'], streak_data['currentStreakLength']), (0, 2))